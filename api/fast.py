@@ -11,20 +11,24 @@ from http import HTTPStatus
 from logging.config import dictConfig
 from multiprocessing import Process
 from threading import Thread
-from typing import Any, Dict, List, NoReturn, Union
+from typing import Any, Callable, Dict, List, NoReturn, Union
 
 from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
+from fastapi.responses import (FileResponse, HTMLResponse, RedirectResponse,
+                               Response)
 
 from api import authenticator
 from api.models import GetData, GetText, InvestmentFilter
 from api.report_gatherer import Investment
+from api.workers import WorkerPool
 from executors.commander import timed_delay
 from executors.offline import offline_communicator
 from executors.word_match import word_match
 from modules.audio import speaker, tts_stt
 from modules.conditions import conversation, keywords
+from modules.conditions.tracer import tracer
+from modules.conditions.usage import usage
 from modules.exceptions import APIResponse
 from modules.logger import config
 from modules.models import models
@@ -43,6 +47,8 @@ if not os.path.isfile(config.APIConfig().DEFAULT_LOG_FILENAME):
     pathlib.Path(config.APIConfig().DEFAULT_LOG_FILENAME).touch()
 
 offline_compatible = compatibles.offline_compatible()
+workers = WorkerPool(workers=models.env.api_workers, queue_depth=models.env.api_queue_depth,
+                     queue_timeout=models.env.api_queue_timeout)
 
 importlib.reload(module=logging)
 LOGGING = config.APIConfig()
@@ -103,6 +109,35 @@ async def start_robinhood() -> Any:
         Process(target=run_robinhood).start()
 
 
+@app.on_event(event_type='shutdown')
+async def stop_workers() -> NoReturn:
+    """Stops the worker pool that runs the blocking executors."""
+    logger.info(f"Stopping workers: {workers.stats()}")
+    workers.shutdown()
+
+
+@app.middleware(middleware_type="http")
+async def server_timing(request: Request, call_next: Callable) -> Response:
+    """Reports the time taken by each request in the ``Server-Timing`` header.
+
+    Args:
+        request: Takes the ``Request`` class as an argument.
+        call_next: Next handler in the middleware chain.
+
+    Returns:
+        Response:
+        Response with the time spent waiting for a worker and executing each task, along with the total time.
+    """
+    start = time.perf_counter()
+    request.state.timings = []
+    response = await call_next(request)
+    metrics = [f"{timing['name']}-queue;dur={timing['queue'] * 1e3:.1f}, "
+               f"{timing['name']};dur={timing['execution'] * 1e3:.1f}" for timing in request.state.timings]
+    metrics.append(f"total;dur={(time.perf_counter() - start) * 1e3:.1f}")
+    response.headers["Server-Timing"] = ", ".join(metrics)
+    return response
+
+
 @app.get(path="/", response_class=RedirectResponse, include_in_schema=False)
 async def redirect_index() -> str:
     """Redirect to docs in ``read-only`` mode.
@@ -147,11 +182,49 @@ async def _offline_compatible() -> Dict[str, List[str]]:
     return {"compatible": offline_compatible}
 
 
-@app.post(path='/speech-synthesis', response_class=FileResponse, dependencies=OFFLINE_PROTECTOR)
-async def speech_synthesis(input_data: GetText, raise_for_status: bool = True) -> Union[FileResponse, None]:
+@app.post(path='/match-trace', dependencies=OFFLINE_PROTECTOR)
+async def _match_trace() -> Dict[str, Union[float, int, List[Dict[str, Any]]]]:
+    """Returns the keyword matches sampled by the offline communicator.
+
+    Returns:
+        dict:
+        Sampling rate, number of matches sampled so far and the most recent matches.
+    """
+    return {"rate": tracer.rate, "sampled": tracer.sampled, "matches": tracer.recent()}
+
+
+@app.post(path='/usage', dependencies=OFFLINE_PROTECTOR)
+async def _usage() -> Dict[str, Dict[str, Union[int, float]]]:
+    """Returns the number of times each function has responded, along with the first and last time.
+
+    Returns:
+        dict:
+        A dictionary of function names and their usage, ordered by the number of calls.
+    """
+    return usage.counts()
+
+
+def audio_response(content: bytes) -> Response:
+    """Serves a WAV file's content as an attachment, without writing it to disk.
+
+    Args:
+        content: Content of the WAV file.
+
+    Returns:
+        Response:
+        Audio file to be downloaded.
+    """
+    return Response(content=content, media_type='application/octet-stream', status_code=HTTPStatus.OK.real,
+                    headers={'Content-Disposition': 'attachment; filename="synthesized.wav"'})
+
+
+@app.post(path='/speech-synthesis', response_class=Response, dependencies=OFFLINE_PROTECTOR)
+async def speech_synthesis(request: Request, input_data: GetText,
+                           raise_for_status: bool = True) -> Union[Response, None]:
     """Process request to convert text to speech if docker container is running.
 
     Args:
+        - request: Takes the ``Request`` class as an argument.
         - input_data: Takes the following arguments as ``GetText`` class instead of a QueryString.
 
             - text: Text to be processed with speech synthesis.
@@ -160,13 +233,12 @@ async def speech_synthesis(input_data: GetText, raise_for_status: bool = True) -
             - voice: Voice model ot be used.
 
     Returns:
-        FileResponse:
+        Response:
         Audio file to be downloaded.
 
     Raises:
-        - 404: If audio file was not found after successful response.
         - 500: If the connection to speech synthesizer fails.
-        - 204: If speech synthesis file wasn't found.
+        - 204: If the text is empty.
     """
     if not (text := input_data.text.strip()):
         logger.error('Empty requests cannot be processed.')
@@ -174,21 +246,14 @@ async def speech_synthesis(input_data: GetText, raise_for_status: bool = True) -
             raise APIResponse(status_code=HTTPStatus.NO_CONTENT.real, detail=HTTPStatus.NO_CONTENT.__dict__['phrase'])
         else:
             return
-    if not speaker.speech_synthesizer(text=text, timeout=input_data.timeout or len(text), quality=input_data.quality,
-                                      voice=input_data.voice):
-        logger.error("Speech synthesis could not process the request.")
-        if raise_for_status:
-            raise APIResponse(status_code=HTTPStatus.INTERNAL_SERVER_ERROR.real,
-                              detail=HTTPStatus.INTERNAL_SERVER_ERROR.__dict__['phrase'])
-        else:
-            return
-    if os.path.isfile(path=models.fileio.speech_synthesis_wav):
-        Thread(target=support.remove_file, kwargs={'delay': 2, 'filepath': models.fileio.speech_synthesis_wav}).start()
-        return FileResponse(path=models.fileio.speech_synthesis_wav, media_type='application/octet-stream',
-                            filename="synthesized.wav", status_code=HTTPStatus.OK.real)
-    logger.error(f'File Not Found: {models.fileio.speech_synthesis_wav}')
+    if content := await workers.run(request=request, func=speaker.synthesize, text=text,
+                                    timeout=input_data.timeout or len(text), quality=input_data.quality,
+                                    voice=input_data.voice):
+        return audio_response(content=content)
+    logger.error("Speech synthesis could not process the request.")
     if raise_for_status:
-        raise APIResponse(status_code=HTTPStatus.NOT_FOUND.real, detail=HTTPStatus.NOT_FOUND.__dict__['phrase'])
+        raise APIResponse(status_code=HTTPStatus.INTERNAL_SERVER_ERROR.real,
+                          detail=HTTPStatus.INTERNAL_SERVER_ERROR.__dict__['phrase'])
 
 
 @app.get(path="/health", include_in_schema=False)
@@ -237,7 +302,7 @@ async def offline_communicator_api(request: Request, input_data: GetData) -> Uni
                 and_response += f'"{each}" is not a part of off-line communicator compatible request.\n\n' \
                                 'Please try an instruction that does not require an user interaction.'
             else:
-                and_response += f"{offline_communicator(command=each)}\n"
+                and_response += f"{await workers.run(request=request, func=offline_communicator, command=each)}\n"
         logger.info(f"Response: {and_response}")
         raise APIResponse(status_code=HTTPStatus.OK.real, detail=and_response)
     elif ' also ' in command and not word_match(phrase=command, match_list=keywords.avoid):
@@ -248,7 +313,7 @@ async def offline_communicator_api(request: Request, input_data: GetData) -> Uni
                 also_response += f'"{each}" is not a part of off-line communicator compatible request.\n\n' \
                                  'Please try an instruction that does not require an user interaction.'
             else:
-                also_response = f"{offline_communicator(command=each)}\n"
+                also_response = f"{await workers.run(request=request, func=offline_communicator, command=each)}\n"
         logger.info(f"Response: {also_response}")
         raise APIResponse(status_code=HTTPStatus.OK.real, detail=also_response)
     if not word_match(phrase=command, match_list=offline_compatible):
@@ -257,12 +322,12 @@ async def offline_communicator_api(request: Request, input_data: GetData) -> Uni
                           detail=f'"{command}" is not a part of off-line communicator compatible request.\n\n'
                                  'Please try an instruction that does not require an user interaction.')
     if ' after ' in command.lower():
-        if delay_info := timed_delay(phrase=command):
+        if delay_info := await workers.run(request=request, func=timed_delay, phrase=command):
             logger.info(f"'{delay_info[0]}' will be executed after {support.time_converter(seconds=delay_info[1])}")
             raise APIResponse(status_code=HTTPStatus.OK.real,
                               detail=f'I will execute it after {support.time_converter(seconds=delay_info[1])} '
                                      f'{models.env.title}!')
-    response = offline_communicator(command=command)
+    response = await workers.run(request=request, func=offline_communicator, command=command)
     logger.info(f"Response: {response}")
     if os.path.isfile(response):
         logger.info("Response received as a file.")
@@ -270,15 +335,14 @@ async def offline_communicator_api(request: Request, input_data: GetData) -> Uni
         return FileResponse(path=response, media_type=f'image/{imghdr.what(file=response)}',
                             filename=os.path.split(response)[-1], status_code=HTTPStatus.OK.real)
     if input_data.native_audio:
-        native_audio_wav = tts_stt.text_to_audio(text=response)
-        logger.info(f"Storing response as {native_audio_wav} in native audio.")
-        Thread(target=support.remove_file, kwargs={'delay': 2, 'filepath': native_audio_wav}).start()
-        return FileResponse(path=native_audio_wav, media_type='application/octet-stream',
-                            filename="synthesized.wav", status_code=HTTPStatus.OK.real)
+        logger.info("Converting response to native audio.")
+        if content := await workers.run(request=request, func=tts_stt.text_to_audio, text=response):
+            return audio_response(content=content)
     if input_data.speech_timeout:
-        logger.info(f"Storing response as {models.fileio.speech_synthesis_wav}")
-        if binary := await speech_synthesis(input_data=GetText(text=response, timeout=input_data.speech_timeout,
-                                                               quality="low"), raise_for_status=False):
+        logger.info("Converting response with speech synthesis.")
+        if binary := await speech_synthesis(request=request, raise_for_status=False,
+                                            input_data=GetText(text=response, timeout=input_data.speech_timeout,
+                                                               quality="low")):
             return binary
     raise APIResponse(status_code=HTTPStatus.OK.real, detail=response)
 
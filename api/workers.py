@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http import HTTPStatus
+from threading import Lock
+from typing import Any, Callable, Dict, NoReturn, Union
+
+from fastapi import Request
+
+from modules.exceptions import APIResponse
+
+logger = logging.getLogger('uvicorn.default')
+
+
+class WorkerPool:
+    """Runs blocking executors in a bounded pool of threads, so that the event loop stays responsive.
+
+    >>> WorkerPool
+
+    See Also:
+        - At most ``workers`` tasks run at once, and at most ``queue_depth`` more can wait for a worker.
+        - Requests beyond that are rejected right away with ``429: Too Many Requests``.
+        - | Tasks that wait longer than ``queue_timeout`` seconds for a worker are cancelled before they start, and
+          | rejected with ``503: Service Unavailable``. Tasks that have started are never interrupted.
+        - Time spent waiting for a worker and running are stored in ``request.state.timings`` for each task.
+    """
+
+    def __init__(self, workers: int, queue_depth: int, queue_timeout: Union[int, float]):
+        """Instantiates the thread pool.
+
+        Args:
+            workers: Number of tasks that can run concurrently.
+            queue_depth: Number of tasks that can wait for a worker.
+            queue_timeout: Seconds a task can wait for a worker before it is rejected.
+        """
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.queue_timeout = queue_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api-worker')
+        self.lock = Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.expired = 0
+
+    def _release(self, future: Future) -> NoReturn:
+        """Releases the slot held by a task once it is finished or cancelled.
+
+        Args:
+            future: Future of the task.
+        """
+        with self.lock:
+            self.pending -= 1
+            if not future.cancelled():
+                self.completed += 1
+
+    async def run(self, request: Request, func: Callable, **kwargs) -> Any:
+        """Runs a blocking function in the pool and waits for it without blocking the event loop.
+
+        Args:
+            request: Request on behalf of which the function is run.
+            func: Blocking function to be run.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            Any:
+            Return value of the function.
+
+        Raises:
+            - 429: If the queue is full.
+            - 503: If no worker became available within the queue timeout.
+        """
+        with self.lock:
+            if self.pending >= self.workers + self.queue_depth:
+                self.rejected += 1
+                logger.warning(f"Rejected {func.__name__}: {self.pending} tasks are running or queued")
+                raise APIResponse(status_code=HTTPStatus.TOO_MANY_REQUESTS.real,
+                                  detail=HTTPStatus.TOO_MANY_REQUESTS.__dict__['phrase'])
+            self.pending += 1
+        timing = {"submitted": time.perf_counter()}
+
+        def task() -> Any:
+            """Records the start and end time of the function."""
+            timing["started"] = time.perf_counter()
+            try:
+                return func(**kwargs)
+            finally:
+                timing["finished"] = time.perf_counter()
+
+        future = self.executor.submit(task)
+        future.add_done_callback(self._release)
+        awaitable = asyncio.wrap_future(future)
+        await asyncio.wait({awaitable}, timeout=self.queue_timeout)
+        if not awaitable.done() and future.cancel():
+            with self.lock:
+                self.expired += 1
+            logger.warning(f"Cancelled {func.__name__} after waiting {self.queue_timeout}s for a worker")
+            raise APIResponse(status_code=HTTPStatus.SERVICE_UNAVAILABLE.real,
+                              detail=HTTPStatus.SERVICE_UNAVAILABLE.__dict__['phrase'])
+        try:
+            return await awaitable
+        finally:
+            now = time.perf_counter()  # request may be cancelled (client disconnect) before the task is complete
+            queued = timing.get("started", now) - timing["submitted"]
+            execution = timing.get("finished", now) - timing.get("started", now)
+            logger.info(f"{func.__name__} waited {queued:.3f}s for a worker and ran for {execution:.3f}s")
+            if hasattr(request.state, 'timings'):
+                request.state.timings.append({"name": func.__name__, "queue": queued, "execution": execution})
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for the tasks that are pending, completed, rejected and expired.
+
+        Returns:
+            dict:
+            A dictionary of task counters.
+        """
+        with self.lock:
+            return {"workers": self.workers, "pending": self.pending, "completed": self.completed,
+                    "rejected": self.rejected, "expired": self.expired}
+
+    def shutdown(self) -> NoReturn:
+        """Stops accepting tasks, the workers exit once the submitted tasks are complete."""
+        self.executor.shutdown(wait=False)
@@ -1,5 +1,4 @@
 import os
-import pathlib
 import random
 import subprocess
 import time
@@ -10,14 +9,19 @@ from executors.volume import volume
 from executors.word_match import word_match
 from modules.audio import listener, speaker
 from modules.conditions import conversation
+from modules.control import channel
 from modules.logger.custom_logger import logger
 from modules.models import models
-from modules.utils import shared, support
+from modules.offline import responder
+from modules.timer import alarms
+from modules.utils import support
+
+alarm_db = alarms.AlarmStore(database_file=models.fileio.alarm_db)
 
 
 def create_alarm(hour: str, minute: str, am_pm: str, phrase: str, timer: str = None,
                  repeat: bool = False, day: str = None) -> NoReturn:
-    """Creates the lock file necessary to set an alarm/timer.
+    """Adds an alarm/timer to the store and wakes up the automator.
 
     Args:
         hour: Hour of alarm time.
@@ -28,14 +32,8 @@ def create_alarm(hour: str, minute: str, am_pm: str, phrase: str, timer: str = N
         repeat: Boolean flag if the alarm should be repeated every day.
         day: Day of week when the alarm should be repeated.
     """
-    if not os.path.isdir('alarm'):
-        os.mkdir('alarm')
-    if repeat:
-        pathlib.Path(f'alarm/{hour}_{minute}_{am_pm}_repeat.lock').touch()
-    elif day:
-        pathlib.Path(f'alarm/{day}_{hour}_{minute}_{am_pm}_repeat.lock').touch()
-    else:
-        pathlib.Path(f'alarm/{hour}_{minute}_{am_pm}.lock').touch()
+    fire_at = alarm_db.add(kind=alarms.ALARM, at=f"{hour}:{minute} {am_pm}", recurrence=alarms.DAILY if repeat else day)
+    channel.send_signal(signal="wake", caller="create_alarm", port=models.env.automator_port)
     if 'wake' in phrase:
         speaker.speak(text=f"{random.choice(conversation.acknowledgement)}! "
                            f"I will wake you up at {hour}:{minute} {am_pm}.")
@@ -49,8 +47,7 @@ def create_alarm(hour: str, minute: str, am_pm: str, phrase: str, timer: str = N
             add = " every day."
         elif day:
             add = f" every {day}."
-        elif datetime.strptime(datetime.today().strftime("%I:%M %p"), "%I:%M %p") >= \
-                datetime.strptime(f"{hour}:{minute} {am_pm}", "%I:%M %p"):
+        elif fire_at.date() > datetime.today().date():
             add = " tomorrow."
         else:
             add = "."
@@ -65,6 +62,15 @@ def set_alarm(phrase: str) -> None:
     Args:
         phrase: Takes the voice recognized statement as argument and extracts time from it.
     """
+    if 'snooze' in phrase:
+        minutes = support.extract_nos(input_=phrase, method=int) or 10
+        if alarm_db.snooze(kind=alarms.ALARM, minutes=minutes):
+            channel.send_signal(signal="wake", caller="set_alarm", port=models.env.automator_port)
+            speaker.speak(text=f"{random.choice(conversation.acknowledgement)}! "
+                               f"I will wake you up again in {minutes} minutes.")
+        else:
+            speaker.speak(text=f"There is no alarm to snooze {models.env.title}!")
+        return
     if 'minute' in phrase:
         if minutes := support.extract_nos(input_=phrase, method=int):
             hour, minute, am_pm = (datetime.now() + timedelta(minutes=minutes)).strftime("%I %M %p").split()
@@ -101,7 +107,7 @@ def set_alarm(phrase: str) -> None:
                                f"I don't think a time like that exists on Earth.")
     else:
         speaker.speak(text=f"Please tell me a time {models.env.title}!")
-        if shared.called_by_offline:
+        if responder.called_by_offline():
             return
         speaker.speak(run=True)
         if converted := listener.listen(timeout=3, phrase_limit=4):
@@ -112,21 +118,20 @@ def set_alarm(phrase: str) -> None:
 
 
 def kill_alarm(phrase: str) -> None:
-    """Removes lock file to stop the alarm which rings only when the certain lock file is present.
+    """Removes an alarm from the store.
 
     Args:
         phrase: Takes the voice recognized statement as argument and extracts time from it.
     """
     word = 'timer' if 'timer' in phrase else 'alarm'
-    alarm_state = support.lock_files(alarm_files=True)
+    alarm_state = [entry.at for entry in alarm_db.entries(kind=alarms.ALARM)]
     if not alarm_state:
         speaker.speak(text=f"You have no {word}s set {models.env.title}!")
     elif len(alarm_state) == 1:
-        hour, minute, am_pm = alarm_state[0][0:2], alarm_state[0][3:5], alarm_state[0][6:8]
-        os.remove(f"alarm/{alarm_state[0]}")
-        speaker.speak(text=f"Your {word} at {hour}:{minute} {am_pm} has been silenced {models.env.title}!")
+        alarm_db.remove(kind=alarms.ALARM, at=alarm_state[0])
+        speaker.speak(text=f"Your {word} at {alarm_state[0]} has been silenced {models.env.title}!")
     else:
-        speaker.speak(text=f"Your {word}s are at {', and '.join(alarm_state).replace('.lock', '')}. "
+        speaker.speak(text=f"Your {word}s are at {', and '.join(alarm_state)}. "
                            f"Please let me know which {word} you want to remove.", run=True)
         if not (converted := listener.listen(timeout=3, phrase_limit=4)):
             return
@@ -140,8 +145,7 @@ def kill_alarm(phrase: str) -> None:
             minute = 0
         hour, minute = f"{hour:02}", f"{minute:02}"
         am_pm = str(am_pm).replace('a.m.', 'AM').replace('p.m.', 'PM')
-        if os.path.exists(f'alarm/{hour}_{minute}_{am_pm}.lock'):
-            os.remove(f"alarm/{hour}_{minute}_{am_pm}.lock")
+        if alarm_db.remove(kind=alarms.ALARM, at=f"{hour}:{minute} {am_pm}"):
             speaker.speak(text=f"Your {word} at {hour}:{minute} {am_pm} has been silenced {models.env.title}!")
         else:
             speaker.speak(text=f"I wasn't able to find your {word} at {hour}:{minute} {am_pm}. Try again.")
@@ -2,10 +2,10 @@ import os
 import warnings
 from datetime import datetime
 from string import punctuation
-from typing import Union
+from typing import Dict, List, Tuple, Union
 
 import yaml
-from deepdiff import DeepDiff
+from pydantic import FilePath
 
 from executors.word_match import word_match
 from modules.audio import speaker
@@ -37,94 +37,130 @@ def automation_handler(phrase: str) -> None:
             speaker.speak(text=f"I couldn't not find the source file to disable automation {models.env.title}!")
 
 
-def rewrite_automator(write_data: dict) -> None:
-    """Rewrites the automation file with the updated dictionary.
+WEEKDAYS = ("MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY")
+WEEKEND = ("SATURDAY", "SUNDAY")
 
-    Args:
-        write_data: Takes the new dictionary as an argument.
-    """
-    logger.info("Data has been modified. Rewriting automation data into YAML file.")
-    with open(models.fileio.automation) as file:
-        try:
-            read_data = yaml.load(stream=file, Loader=yaml.FullLoader) or {}
-        except yaml.YAMLError as error:
-            logger.error(error)
-            read_data = {}
-    logger.info(DeepDiff(read_data, write_data, ignore_order=True))
-    with open(models.fileio.automation, 'w') as file:
-        yaml.dump(data=write_data, stream=file, indent=2, sort_keys=False)
 
+class AutomationTable:
+    """In-memory table of automation entries, that is loaded from the automation file only when it changes.
 
-def auto_helper(offline_list: list) -> Union[str, None]:
-    """Runs in a thread to help the automator function in the main module.
+    >>> AutomationTable
 
-    Args:
-        offline_list: List of offline compatible keywords.
-
-    Returns:
-        str:
-        Task to be executed.
+    See Also:
+        - The file's modification time is checked before each lookup, and the file is parsed only if it has changed.
+        - Invalid entries are logged and skipped, the automation file is never rewritten.
+        - Entries that were executed are tracked in memory, so that each entry runs only once within its minute.
     """
-    try:
-        with open(models.fileio.automation) as read_file:
-            automation_data = yaml.load(stream=read_file, Loader=yaml.FullLoader) or {}
-    except yaml.YAMLError as error:
-        logger.error(error)
-        warnings.warn(
-            "AUTOMATION FILE :: Invalid file format."
-        )
-        logger.error(f"Invalid file format. "
-                     f"Logging automation data and removing the file to avoid endless errors.\n"
-                     f"{''.join(['*' for _ in range(120)])}"
-                     f"\n\n{read_file.read()}\n\n"
-                     f"{''.join(['*' for _ in range(120)])}")
-        os.remove(models.fileio.automation)
-        return
-
-    for automation_time, automation_info in automation_data.items():
-        if not (exec_task := automation_info.get("task")) or \
-                not word_match(phrase=exec_task, match_list=offline_list):
-            logger.error("Following entry doesn't have a task or the task is not a part of offline compatible.")
-            logger.error(f"{automation_time} - {automation_info}")
-            automation_data.pop(automation_time)
-            rewrite_automator(write_data=automation_data)
-            break  # Using break instead of continue as python doesn't like dict size change in-between a loop
+
+    def __init__(self, offline_list: List[str], filepath: Union[FilePath, str] = models.fileio.automation):
+        """Instantiates an empty table.
+
+        Args:
+            offline_list: List of offline compatible keywords.
+            filepath: Automation file to load the entries from.
+        """
+        self.offline_list = offline_list
+        self.filepath = filepath
+        self.modified = None
+        self.entries: Dict[str, List[Tuple[Union[Tuple[str, ...], None], str]]] = {}
+        self.fired: Dict[Tuple[str, str], str] = {}
+
+    def reload(self) -> bool:
+        """Loads the automation file if it was created, modified or removed since the last load.
+
+        Returns:
+            bool:
+            A boolean flag to indicate whether the table was reloaded.
+        """
         try:
-            datetime.strptime(automation_time, "%I:%M %p")
-        except ValueError:
-            logger.error(f"Incorrect Datetime format: {automation_time}. "
-                         "Datetime string should be in the format: 6:00 AM. "
-                         f"Removing the key-value from {models.fileio.automation}")
-            automation_data.pop(automation_time)
-            rewrite_automator(write_data=automation_data)
-            break  # Using break instead of continue as python doesn't like dict size change in-between a loop
-
-        if day := automation_info.get("day"):
-            today = datetime.today().strftime("%A").upper()
-            if isinstance(day, list):
-                if today not in [d.upper() for d in day]:
-                    continue
-            elif isinstance(day, str):
-                day = day.upper()
-                if day == "WEEKEND" and today in ["SATURDAY", "SUNDAY"]:
-                    pass
-                elif day == "WEEKDAY" and today in ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY"]:
-                    pass
-                elif today == day:
-                    pass
-                else:
-                    continue
-
-        if automation_time != datetime.now().strftime("%I:%M %p"):
-            if automation_info.get("status"):
-                logger.info(f"Reverting execution status flag for task: {exec_task} runs at {automation_time}")
-                del automation_data[automation_time]["status"]
-                rewrite_automator(write_data=automation_data)
-            continue
-
-        if automation_info.get("status"):
-            continue
-        exec_task = exec_task.translate(str.maketrans("", "", punctuation))  # Remove punctuations from the str
-        automation_data[automation_time]["status"] = True
-        rewrite_automator(write_data=automation_data)
-        return exec_task
+            modified = os.stat(self.filepath).st_mtime_ns
+        except FileNotFoundError:
+            modified = None
+        if modified == self.modified:
+            return False
+        self.modified = modified
+        self.entries = self.parse() if modified else {}
+        return True
+
+    def parse(self) -> Dict[str, List[Tuple[Union[Tuple[str, ...], None], str]]]:
+        """Parses and validates the automation file.
+
+        Returns:
+            dict:
+            Entries grouped by their time of execution, as a list of days and task.
+        """
+        with open(self.filepath) as file:
+            try:
+                automation_data = yaml.load(stream=file, Loader=yaml.FullLoader) or {}
+            except yaml.YAMLError as error:
+                logger.error(error)
+                warnings.warn("AUTOMATION FILE :: Invalid file format.")
+                return {}
+        if not isinstance(automation_data, dict):
+            logger.error(f"Invalid file format. {self.filepath} should be a dictionary within a dictionary.")
+            return {}
+        entries = {}
+        for automation_time, automation_info in automation_data.items():
+            if not isinstance(automation_info, dict) or not (exec_task := automation_info.get("task")) or \
+                    not word_match(phrase=exec_task, match_list=self.offline_list):
+                logger.error("Following entry doesn't have a task or the task is not a part of offline compatible.")
+                logger.error(f"{automation_time} - {automation_info}")
+                continue
+            try:
+                automation_time = datetime.strptime(str(automation_time), "%I:%M %p").strftime("%I:%M %p")
+            except ValueError:
+                logger.error(f"Incorrect Datetime format: {automation_time}. "
+                             "Datetime string should be in the format: 6:00 AM. Skipping the entry.")
+                continue
+            if (days := self.parse_days(day=automation_info.get("day"))) is False:
+                logger.error(f"Invalid day: {automation_info.get('day')} for {automation_time}. Skipping the entry.")
+                continue
+            task = exec_task.translate(str.maketrans("", "", punctuation))  # Remove punctuations from the str
+            entries.setdefault(automation_time, []).append((days, task))
+        logger.info(f"Loaded {sum(len(v) for v in entries.values())} automation entries from {self.filepath}")
+        return entries
+
+    @staticmethod
+    def parse_days(day: Union[str, List[str], None]) -> Union[Tuple[str, ...], None, bool]:
+        """Converts the ``day`` value of an entry into the names of the days it should run.
+
+        Args:
+            day: A day, list of days, ``weekday`` or ``weekend``.
+
+        Returns:
+            tuple:
+            Names of the days in uppercase, ``None`` to run daily, or ``False`` if the value is invalid.
+        """
+        if not day:
+            return
+        if isinstance(day, str):
+            day = day.upper()
+            if day == "WEEKDAY":
+                return WEEKDAYS
+            if day == "WEEKEND":
+                return WEEKEND
+            day = [day]
+        if isinstance(day, list) and all(isinstance(d, str) and d.upper() in WEEKDAYS + WEEKEND for d in day):
+            return tuple(d.upper() for d in day)
+        return False
+
+    def due(self, now: datetime = None) -> List[str]:
+        """Gets the tasks scheduled for the current minute, that haven't been executed yet.
+
+        Args:
+            now: Datetime to look up. Defaults to current time.
+
+        Returns:
+            list:
+            Tasks to be executed.
+        """
+        self.reload()
+        now = now or datetime.now()
+        automation_time, today, minute = now.strftime("%I:%M %p"), now.strftime("%A").upper(), now.strftime("%c")
+        tasks = []
+        for days, task in self.entries.get(automation_time, []):
+            if (days and today not in days) or self.fired.get((automation_time, task)) == minute:
+                continue
+            self.fired[(automation_time, task)] = minute
+            tasks.append(task)
+        return tasks
@@ -12,8 +12,9 @@ from modules.audio import speaker
 from modules.car import connector, controller
 from modules.logger.custom_logger import logger
 from modules.models import models
+from modules.offline import responder
 from modules.temperature import temperature
-from modules.utils import shared, support
+from modules.utils import support
 
 
 def get_current_temp(location: dict) -> Tuple[Union[int, str], int]:
@@ -56,7 +57,7 @@ def car(phrase: str) -> None:
     disconnected = f"I wasn't able to connect your car {models.env.title}! Please check the logs for more information."
 
     if "start" in phrase or "set" in phrase or "turn on" in phrase:
-        if not shared.called_by_offline:
+        if not responder.called_by_offline():
             playsound(sound=models.indicators.exhaust, block=False)
         extras = ""
         if target_temp := support.extract_nos(input_=phrase, method=int):
@@ -89,42 +90,42 @@ def car(phrase: str) -> None:
         else:
             speaker.speak(text=disconnected)
     elif "turn off" in phrase or "stop" in phrase:
-        if not shared.called_by_offline:
+        if not responder.called_by_offline():
             playsound(sound=models.indicators.exhaust, block=False)
         if car_name := vehicle(operation="STOP"):
             speaker.speak(text=f"Your {car_name} has been turned off {models.env.title}!")
         else:
             speaker.speak(text=disconnected)
     elif "secure" in phrase or "guardian" in phrase or "security" in phrase:
-        if not shared.called_by_offline:
+        if not responder.called_by_offline():
             playsound(sound=models.indicators.exhaust, block=False)
         if car_name := vehicle(operation="SECURE"):
             speaker.speak(text=f"Guardian mode has been enabled {models.env.title}! Your {car_name} is now secure.")
         else:
             speaker.speak(text=disconnected)
     elif "unlock" in phrase:
-        if not shared.called_by_offline:
+        if not responder.called_by_offline():
             playsound(sound=models.indicators.exhaust, block=False)
         if car_name := vehicle(operation="UNLOCK"):
             speaker.speak(text=f"Your {car_name} has been unlocked {models.env.title}!")
         else:
             speaker.speak(text=disconnected)
     elif "lock" in phrase:
-        if not shared.called_by_offline:
+        if not responder.called_by_offline():
             playsound(sound=models.indicators.exhaust, block=False)
         if car_name := vehicle(operation="LOCK"):
             speaker.speak(text=f"Your {car_name} has been locked {models.env.title}!")
         else:
             speaker.speak(text=disconnected)
     elif "honk" in phrase or "blink" in phrase or "horn" in phrase:
-        if not shared.called_by_offline:
+        if not responder.called_by_offline():
             playsound(sound=models.indicators.exhaust, block=False)
         if car_name := vehicle(operation="HONK"):
             speaker.speak(text=f"I've made your {car_name} honk and blink {models.env.title}!")
         else:
             speaker.speak(text=disconnected)
     elif "locate" in phrase or "where" in phrase:
-        if not shared.called_by_offline:
+        if not responder.called_by_offline():
             playsound(sound=models.indicators.exhaust, block=False)
         if location := vehicle(operation="LOCATE"):
             speaker.speak(text=location)
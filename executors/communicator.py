@@ -9,7 +9,8 @@ from modules.audio import listener, speaker
 from modules.conditions import keywords
 from modules.logger.custom_logger import logger
 from modules.models import models
-from modules.utils import shared, support
+from modules.offline import responder
+from modules.utils import support
 
 
 def read_gmail() -> None:
@@ -23,7 +24,7 @@ def read_gmail() -> None:
     reader = ReadEmail(gmail_user=models.env.gmail_user, gmail_pass=models.env.gmail_pass)
     response = reader.instantiate()
     if response.ok:
-        if shared.called_by_offline:
+        if responder.called_by_offline():
             speaker.speak(text=f'You have {response.count} unread email {models.env.title}.') if response.count == 1 \
                 else speaker.speak(text=f'You have {response.count} unread emails {models.env.title}.')
             return
@@ -55,14 +56,14 @@ def send_sms(phrase: str) -> None:
     body = message.group(1) if message else None
     if number := support.extract_nos(input_=phrase, method=int):
         number = str(number)
-    if number and body and shared.called_by_offline:
+    if number and body and responder.called_by_offline():
         if len(number) != 10:
             speaker.speak(text=f"I don't think that's a right number {models.env.title}! Phone numbers are 10 digits.")
             return
         notify(user=models.env.gmail_user, password=models.env.gmail_pass, number=number, body=body)
         speaker.speak(text=f"Message has been sent {models.env.title}!")
         return
-    elif shared.called_by_offline:
+    elif responder.called_by_offline():
         speaker.speak(text="Messenger format should be::send some message to some number.")
         return
     speaker.speak(text=f"Please tell me a number {models.env.title}!", run=True)
@@ -32,10 +32,11 @@ from executors.volume import volume
 from executors.vpn_server import vpn_server
 from executors.weather import weather
 from executors.wiki import wikipedia_
-from executors.word_match import word_match
 from modules.audio.speaker import speak
 from modules.audio.voices import voice_changer
 from modules.conditions import conversation, keywords
+from modules.conditions.matcher import KeywordMatcher, module_groups
+from modules.conditions.tracer import tracer
 from modules.exceptions import StopSignal
 from modules.logger.custom_logger import logger
 from modules.meetings.events import events
@@ -43,6 +44,11 @@ from modules.meetings.icalendar import meetings
 from modules.models.models import settings
 from modules.utils import support
 
+MATCHER = KeywordMatcher(groups=dict(**module_groups(keywords, conversation),
+                                     todo_checks=['to do', 'to-do', 'todo'],
+                                     todo_items=['items'],
+                                     speed_test_context=['internet', 'connection', 'run']))
+
 
 def conditions(phrase: str, should_return: bool = False) -> bool:
     """Conditions function is used to check the message processed.
@@ -57,200 +63,195 @@ def conditions(phrase: str, should_return: bool = False) -> bool:
         bool:
         Boolean True only when asked to sleep for conditioned sleep message.
     """
-    todo_checks = ['to do', 'to-do', 'todo']
+    matched = MATCHER.match(phrase=phrase)
+    if tracer.rate and matched:
+        tracer.record(phrase=phrase, match=matched, source='conditions')
 
     if "*" in phrase:
         abusive(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.lights):
+    elif 'lights' in matched:
         lights(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.television):
+    elif 'television' in matched:
         television(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.volume):
+    elif 'volume' in matched:
         volume(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.car):
+    elif 'car' in matched:
         car(phrase.lower())
 
-    elif word_match(phrase=phrase, match_list=keywords.garage):
+    elif 'garage' in matched:
         garage(phrase.lower())
 
-    elif word_match(phrase=phrase, match_list=keywords.weather):
+    elif 'weather' in matched:
         weather(phrase)
 
     # ORDER OF THE ABOVE SHOULD BE RETAINED
 
-    elif word_match(phrase=phrase, match_list=keywords.meetings):
+    elif 'meetings' in matched:
         meetings()
 
-    elif word_match(phrase=phrase, match_list=keywords.current_date) and \
-            not word_match(phrase=phrase, match_list=keywords.avoid):
+    elif 'current_date' in matched and 'avoid' not in matched:
         current_date()
 
-    elif word_match(phrase=phrase, match_list=keywords.current_time) and \
-            not word_match(phrase=phrase, match_list=keywords.avoid):
+    elif 'current_time' in matched and 'avoid' not in matched:
         current_time(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.system_info):
+    elif 'system_info' in matched:
         system_info()
 
-    elif word_match(phrase=phrase, match_list=keywords.ip_info) or 'IP' in phrase.split():
+    elif 'ip_info' in matched or 'IP' in phrase.split():
         ip_info(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.wikipedia_):
+    elif 'wikipedia_' in matched:
         wikipedia_()
 
-    elif word_match(phrase=phrase, match_list=keywords.news):
+    elif 'news' in matched:
         news()
 
-    elif word_match(phrase=phrase, match_list=keywords.report):
+    elif 'report' in matched:
         report()
 
-    elif word_match(phrase=phrase, match_list=keywords.robinhood):
+    elif 'robinhood' in matched:
         robinhood()
 
-    elif word_match(phrase=phrase, match_list=keywords.repeat):
+    elif 'repeat' in matched:
         repeat()
 
-    elif word_match(phrase=phrase, match_list=keywords.location):
+    elif 'location' in matched:
         location()
 
-    elif word_match(phrase=phrase, match_list=keywords.locate):
+    elif 'locate' in matched:
         locate(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.read_gmail):
+    elif 'read_gmail' in matched:
         read_gmail()
 
-    elif word_match(phrase=phrase, match_list=keywords.meaning):
+    elif 'meaning' in matched:
         meaning(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.delete_todo) and 'items' in phrase.lower() and \
-            word_match(phrase=phrase, match_list=todo_checks):
+    elif 'delete_todo' in matched and 'todo_items' in matched and 'todo_checks' in matched:
         delete_todo_items()
 
-    elif word_match(phrase=phrase, match_list=keywords.todo):
+    elif 'todo' in matched:
         todo()
 
-    elif word_match(phrase=phrase, match_list=keywords.add_todo) and \
-            word_match(phrase=phrase, match_list=todo_checks):
+    elif 'add_todo' in matched and 'todo_checks' in matched:
         add_todo()
 
-    elif word_match(phrase=phrase, match_list=keywords.delete_todo) and \
-            word_match(phrase=phrase, match_list=todo_checks):
+    elif 'delete_todo' in matched and 'todo_checks' in matched:
         delete_todo()
 
-    elif word_match(phrase=phrase, match_list=keywords.distance) and \
-            not word_match(phrase=phrase, match_list=keywords.avoid):
+    elif 'distance' in matched and 'avoid' not in matched:
         distance(phrase)
 
-    elif word_match(phrase=phrase, match_list=conversation.form):
+    elif 'form' in matched:
         speak(text="I am a program, I'm without form.")
 
-    elif word_match(phrase=phrase, match_list=keywords.locate_places):
+    elif 'locate_places' in matched:
         locate_places(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.directions):
+    elif 'directions' in matched:
         directions(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.kill_alarm):
+    elif 'kill_alarm' in matched:
         kill_alarm(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.set_alarm):
+    elif 'set_alarm' in matched:
         set_alarm(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.google_home):
+    elif 'google_home' in matched:
         google_home()
 
-    elif word_match(phrase=phrase, match_list=keywords.jokes):
+    elif 'jokes' in matched:
         jokes()
 
-    elif word_match(phrase=phrase, match_list=keywords.reminder):
+    elif 'reminder' in matched:
         reminder(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.notes):
+    elif 'notes' in matched:
         notes()
 
-    elif word_match(phrase=phrase, match_list=keywords.github):
+    elif 'github' in matched:
         github(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.send_sms):
+    elif 'send_sms' in matched:
         send_sms(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.apps):
+    elif 'apps' in matched:
         apps(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.music):
+    elif 'music' in matched:
         music(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.faces):
+    elif 'faces' in matched:
         faces(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.speed_test) and \
-            ('internet' in phrase.lower() or 'connection' in phrase.lower() or 'run' in phrase.lower()):
+    elif 'speed_test' in matched and 'speed_test_context' in matched:
         speed_test()
 
-    elif word_match(phrase=phrase, match_list=keywords.brightness):
+    elif 'brightness' in matched:
         brightness(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.guard_enable):
+    elif 'guard_enable' in matched:
         guard_enable()
 
-    elif word_match(phrase=phrase, match_list=keywords.guard_disable):
+    elif 'guard_disable' in matched:
         guard_disable()
 
-    elif word_match(phrase=phrase, match_list=keywords.flip_a_coin):
+    elif 'flip_a_coin' in matched:
         flip_a_coin()
 
-    elif word_match(phrase=phrase, match_list=keywords.facts):
+    elif 'facts' in matched:
         facts()
 
-    elif word_match(phrase=phrase, match_list=keywords.events):
+    elif 'events' in matched:
         events()
 
-    elif word_match(phrase=phrase, match_list=keywords.voice_changer):
+    elif 'voice_changer' in matched:
         voice_changer(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.system_vitals):
+    elif 'system_vitals' in matched:
         system_vitals()
 
-    elif word_match(phrase=phrase, match_list=keywords.vpn_server):
+    elif 'vpn_server' in matched:
         vpn_server(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.automation):
+    elif 'automation' in matched:
         automation_handler(phrase.lower())
 
-    elif word_match(phrase=phrase, match_list=keywords.sprint):
+    elif 'sprint' in matched:
         sprint_name()
 
-    elif word_match(phrase=phrase, match_list=keywords.photo):
+    elif 'photo' in matched:
         photo()
 
-    elif word_match(phrase=phrase, match_list=conversation.greeting):
+    elif 'greeting' in matched:
         speak(text=random.choice(['I am spectacular. I hope you are doing fine too.', 'I am doing well. Thank you.',
                                   'I am great. Thank you.']))
 
-    elif word_match(phrase=phrase, match_list=conversation.capabilities):
+    elif 'capabilities' in matched:
         speak(text='There is a lot I can do. For example: I can get you the weather at any location, news around '
                    'you, meanings of words, launch applications, create a to-do list, check your emails, get your '
                    'system configuration, tell your investment details, locate your phone, find distance between '
                    'places, set an alarm, play music on smart devices around you, control your TV, tell a joke, send'
                    ' a message, set reminders, scan and clone your GitHub repositories, and much more. Time to ask,.')
 
-    elif word_match(phrase=phrase, match_list=conversation.languages):
+    elif 'languages' in matched:
         speak(text="Tricky question!. I'm configured in python, and I can speak English.")
 
-    elif word_match(phrase=phrase, match_list=conversation.whats_up):
+    elif 'whats_up' in matched:
         speak(text="My listeners are up. There is nothing I cannot process. So ask me anything..")
 
-    elif word_match(phrase=phrase, match_list=conversation.what):
+    elif 'what' in matched:
         speak(text=f"The name is {settings.bot}. I'm just a pre-programmed virtual assistant.")
 
-    elif word_match(phrase=phrase, match_list=conversation.who):
+    elif 'who' in matched:
         speak(text=f"I am {settings.bot}. A virtual assistant designed by Mr.Raauv.")
 
-    elif word_match(phrase=phrase, match_list=conversation.age):
+    elif 'age' in matched:
         relative_date = relativedelta(dt1=datetime.strptime(datetime.strftime(datetime.now(), "%Y-%m-%d"), "%Y-%m-%d"),
                                       dt2=datetime.strptime("2020-09-06", "%Y-%m-%d"))
         statement = f"{relative_date.years} years, {relative_date.months} months and {relative_date.days} days."
@@ -268,25 +269,24 @@ def conditions(phrase: str, should_return: bool = False) -> bool:
             statement = statement.replace("days", "day")
         speak(text=f"I'm {statement} old.")
 
-    elif word_match(phrase=phrase, match_list=conversation.about_me):
+    elif 'about_me' in matched:
         speak(text=f"I am {settings.bot}. A virtual assistant designed by Mr.Raauv. "
                    "I'm just a pre-programmed virtual assistant, trying to become a natural language UI. "
                    "I can seamlessly take care of your daily tasks, and also help with most of your work!")
 
-    elif word_match(phrase=phrase, match_list=keywords.sleep_control):
+    elif 'sleep_control' in matched:
         return controls.sleep_control()
 
-    elif word_match(phrase=phrase, match_list=keywords.sentry):
+    elif 'sentry' in matched:
         return controls.sentry()
 
-    elif word_match(phrase=phrase, match_list=keywords.restart_control):
+    elif 'restart_control' in matched:
         controls.restart_control(phrase)
 
-    elif word_match(phrase=phrase, match_list=keywords.kill) and \
-            not word_match(phrase=phrase, match_list=keywords.avoid):
+    elif 'kill' in matched and 'avoid' not in matched:
         raise StopSignal
 
-    elif word_match(phrase=phrase, match_list=keywords.shutdown):
+    elif 'shutdown' in matched:
         controls.shutdown()
 
     elif should_return:
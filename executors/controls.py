@@ -11,18 +11,20 @@ from typing import NoReturn
 
 import psutil
 
+from executors.alarm import alarm_db
 from executors.display_functions import decrease_brightness
 from executors.volume import volume
 from executors.word_match import word_match
 from modules.audio import listener, speaker, voices
 from modules.conditions import conversation, keywords
-from modules.database import database
+from modules.control import channel
 from modules.exceptions import StopSignal
 from modules.logger.custom_logger import logger
 from modules.models import models
+from modules.offline import responder
+from modules.timer import alarms
 from modules.utils import shared, support
 
-db = database.Database(database=models.fileio.base_db)
 ram = support.size_converter(byte_size=models.settings.ram).replace('.0', '')
 
 
@@ -60,25 +62,19 @@ def restart(ask: bool = True) -> NoReturn:
 
 def exit_process() -> NoReturn:
     """Function that holds the list of operations done upon exit."""
-    reminders = {}
-    alarms = support.lock_files(alarm_files=True)
-    if reminder_files := support.lock_files(reminder_files=True):
-        for file in reminder_files:
-            split_val = file.replace('.lock', '').split('|')
-            reminders.update({split_val[0]: split_val[-1]})
+    reminders = alarm_db.entries(kind=alarms.REMINDER)
+    alarm_times = [entry.at for entry in alarm_db.entries(kind=alarms.ALARM)]
     if reminders:
-        logger.info(f'JARVIS::Deleting Reminders - {reminders}')
+        logger.info(f'JARVIS::Pending Reminders - {reminders}')
         if len(reminders) == 1:
             speaker.speak(text=f'You have a pending reminder {models.env.title}!')
         else:
             speaker.speak(text=f'You have {len(reminders)} pending reminders {models.env.title}!')
-        for key, value in reminders.items():
-            speaker.speak(text=f"{value.replace('_', ' ')} at {key.lstrip('0').replace('00', '').replace('_', ' ')}")
-    if alarms:
-        alarms = ', and '.join(alarms) if len(alarms) != 1 else ''.join(alarms)
-        alarms = alarms.replace('.lock', '').replace('_', ':').replace(':PM', ' PM').replace(':AM', ' AM')
-        speaker.speak(text=f"You have a pending alarm at {alarms} {models.env.title}!")
-    if reminders or alarms:
+        for entry in reminders:
+            speaker.speak(text=f"{entry.message} at {entry.at.lstrip('0').replace(':00', '')}")
+    if alarm_times:
+        speaker.speak(text=f"You have a pending alarm at {', and '.join(alarm_times)} {models.env.title}!")
+    if reminders or alarm_times:
         speaker.speak(text="This will not be executed while I'm asleep!")
     speaker.speak(text=f"Shutting down now {models.env.title}!")
     try:
@@ -118,10 +114,7 @@ def check_memory_leak() -> NoReturn:
                 percent = support.size_converter(byte_size=percent_raw).replace(' B', ' %')
                 ram_used = support.size_converter(byte_size=proc.memory_info().rss)
                 logger.info(f"{process.pid}: {ram_used}/{ram} :: {percent}")
-                with db.connection:
-                    cursor = db.connection.cursor()
-                    cursor.execute("INSERT or REPLACE INTO restart (flag, caller) VALUES (?,?);", (True, func))
-                    cursor.connection.commit()
+                channel.send_signal(signal="restart", caller=func)
         except psutil.NoSuchProcess:
             logger.warning(f"{func}[{process.pid}] is not running anymore.")
             return func
@@ -150,16 +143,13 @@ def restart_control(phrase: str = None, quiet: bool = False) -> NoReturn:
         logger.info(f'Called by {caller}')
         if quiet:  # restarted due internal errors
             logger.info(f"Restarting {caller}")
-        elif shared.called_by_offline:  # restarted via automator
+        elif responder.called_by_offline():  # restarted via automator
             logger.info("Restarting all background processes!")
             caller = "OFFLINE"
         else:
             speaker.speak(text="I didn't quite get that. Did you mean restart your computer?")
             return
-        with db.connection:
-            cursor = db.connection.cursor()
-            cursor.execute("INSERT or REPLACE INTO restart (flag, caller) VALUES (?,?);", (True, caller))
-            cursor.connection.commit()
+        channel.send_signal(signal="restart", caller=caller)
 
 
 def stop_terminals(apps: tuple = ("iterm", "terminal")) -> NoReturn:
@@ -1,22 +1,150 @@
 import os
 import subprocess
-from typing import NoReturn
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Lock, Timer
+from typing import Dict, NoReturn
 
-from modules.logger import config
+import psutil
+
+from modules.database import database
+from modules.logger.custom_logger import logger
+from modules.models import models
+from modules.models.classes import CronPolicy
 
 LOG_FILE = os.path.join('logs', 'cron_%d-%m-%Y.log')
 
+db = database.Database(database=models.fileio.base_db)
+
 
-def crontab_executor(statement: str) -> NoReturn:
-    """Executes a cron statement.
+def kill_tree(process: subprocess.Popen) -> NoReturn:
+    """Kills a process along with all the processes it started.
 
     Args:
-        statement: Cron statement to be executed.
+        process: Process to be killed.
+    """
+    try:
+        parent = psutil.Process(pid=process.pid)
+        for child in parent.children(recursive=True):
+            child.kill()
+        parent.kill()
+    except psutil.NoSuchProcess as error:
+        logger.debug(error)
+
+
+class CronRunner:
+    """Runs cron jobs in a bounded pool of threads, instead of a new process for every run.
+
+    >>> CronRunner
+
+    See Also:
+        - At most ``workers`` commands run at once, the rest wait for a free worker.
+        - | The policy decides what happens when a job is triggered while its previous run is still going.
+          | ``skip`` drops the new run, ``queue`` holds at most one run until the previous one is complete, and
+          | ``parallel`` runs it anyway.
+        - Commands that run longer than their timeout are killed along with the processes they started.
+        - Output is written to the cron log as the command writes it, instead of when it is complete.
     """
-    filename = config.multiprocessing_logger(filename=LOG_FILE)
-    with open(filename, 'a') as file:
-        file.write('\n')
+
+    def __init__(self, workers: int, policy: CronPolicy, timeout: int):
+        """Instantiates the thread pool.
+
+        Args:
+            workers: Number of commands that can run concurrently.
+            policy: Default policy for jobs that are triggered while still running.
+            timeout: Default number of seconds after which a command is killed.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cron')
+        self.policy = policy
+        self.timeout = timeout
+        self.lock = Lock()
+        self.running: Dict[str, int] = {}
+        self.queued: Dict[str, int] = {}
+
+    def submit(self, command: str, policy: CronPolicy = None, timeout: int = None) -> bool:
+        """Submits a command to the pool, as per the policy of the job.
+
+        Args:
+            command: Command to be executed.
+            policy: Policy of the job, defaults to the runner's policy.
+            timeout: Timeout of the job in seconds, defaults to the runner's timeout.
+
+        Returns:
+            bool:
+            A boolean flag to indicate whether the command was submitted or queued.
+
+        See Also:
+            A queued run is held here instead of in the pool, so it doesn't occupy a worker while it waits.
+        """
+        policy = policy or self.policy
+        timeout = timeout or self.timeout
+        with self.lock:
+            if running := self.running.get(command, 0):
+                if policy == CronPolicy.SKIP or (policy == CronPolicy.QUEUE and command in self.queued):
+                    logger.warning(f"Skipping '{command}' as {running} run(s) are still in progress")
+                    return False
+                if policy == CronPolicy.QUEUE:
+                    logger.info(f"Queued '{command}' until the previous run is complete")
+                    self.queued[command] = timeout
+                    return True
+            self.running[command] = running + 1
+        self.executor.submit(self.execute, command, timeout)
+        return True
+
+    def execute(self, command: str, timeout: int) -> NoReturn:
+        """Executes a command in a subprocess, and submits its queued run once complete.
+
+        Args:
+            command: Command to be executed.
+            timeout: Number of seconds after which the command is killed.
+        """
         try:
-            subprocess.call(statement, shell=True, stdout=file, stderr=file)
-        except (subprocess.CalledProcessError, subprocess.SubprocessError, Exception) as error:
-            file.write(error)
+            self.run(command=command, timeout=timeout)
+        except Exception as error:
+            logger.error(f"{command}: {error}")
+        with self.lock:
+            if (running := self.running[command] - 1) or command not in self.queued:
+                self.running[command] = running
+                return
+            timeout = self.queued.pop(command)  # running count is carried over to the queued run
+        try:
+            self.executor.submit(self.execute, command, timeout)
+        except RuntimeError as error:  # pool was shut down
+            logger.warning(f"Dropped the queued run of '{command}': {error}")
+            with self.lock:
+                self.running[command] -= 1
+
+    @staticmethod
+    def run(command: str, timeout: int) -> NoReturn:
+        """Runs a command with a timeout, writing its output line by line.
+
+        Args:
+            command: Command to be executed.
+            timeout: Number of seconds after which the command is killed.
+        """
+        with open(datetime.now().strftime(LOG_FILE), 'a') as file:
+            file.write('\n')
+            file.flush()
+            process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                       universal_newlines=True, bufsize=1)
+            with db.connection:
+                cursor = db.connection.cursor()
+                cursor.execute("INSERT or REPLACE INTO children (crontab) VALUES (?);", (process.pid,))
+                db.connection.commit()
+            start = time.monotonic()
+            timer = Timer(interval=timeout, function=kill_tree, args=(process,))
+            timer.start()
+            for line in process.stdout:
+                file.write(line)
+                file.flush()
+            process.wait()
+            timer.cancel()
+        if time.monotonic() - start >= timeout:
+            logger.error(f"'{command}' was killed after {timeout}s")
+        else:
+            logger.info(f"'{command}' exited with code {process.returncode}")
+
+    def shutdown(self) -> NoReturn:
+        """Stops accepting new runs, the runs that are in progress are left to complete."""
+        self.executor.shutdown(wait=False)
@@ -11,7 +11,8 @@ from modules.audio import listener, speaker
 from modules.conditions import keywords
 from modules.logger.custom_logger import logger
 from modules.models import models
-from modules.utils import shared, support
+from modules.offline import responder
+from modules.utils import support
 
 
 def github(phrase: str) -> None:
@@ -48,7 +49,7 @@ def github(phrase: str) -> None:
         speaker.speak(
             text=f'You have {total} repositories {models.env.title}, out of which {forked} are forked, {private} are '
                  f'private, {licensed} are licensed, and {archived} archived.')
-    elif not shared.called_by_offline:
+    elif not responder.called_by_offline():
         [result.append(clone_url) if clone_url not in result and re.search(rf'\b{word}\b', repo.lower()) else None
          for word in phrase.lower().split() for item in repos for repo, clone_url in item.items()]
         if result:
@@ -14,50 +14,41 @@ from executors import communicator
 from executors.word_match import word_match
 from modules.audio import listener, speaker
 from modules.conditions import keywords
+from modules.control.state import state
 from modules.database import database
 from modules.exceptions import CameraError
 from modules.facenet import face
 from modules.logger.custom_logger import logger
 from modules.models import models
+from modules.offline import responder
 from modules.templates import templates
-from modules.utils import shared, support
+from modules.utils import support
 
 db = database.Database(database=models.fileio.base_db)
 
 
-def get_state() -> int:
-    """Reads the state of guard column in the base db.
+def get_state() -> bool:
+    """Reads the state of security mode from the shared state store.
 
     Returns:
-        int:
-        0 or 1 to indicate if the security mode is enabled.
+        bool:
+        A boolean flag to indicate if the security mode is enabled.
     """
-    with db.connection:
-        cursor = db.connection.cursor()
-        state = cursor.execute("SELECT state FROM guard").fetchone()
-    if state:
-        logger.info("Security mode is currently enabled")
-        return state
-    else:
-        logger.info("Security mode is currently disabled")
+    return state.get("guard", False)
 
 
-def put_state(state: bool) -> NoReturn:
-    """Updates the state of guard column in the base db.
+def put_state(enabled: bool) -> NoReturn:
+    """Updates the state of security mode in the shared state store.
 
     Args:
-        state: True or False flag to stop the security mode.
+        enabled: True or False flag to start or stop the security mode.
     """
-    with db.connection:
-        cursor = db.connection.cursor()
-        if state is True:
-            logger.info("Enabling security mode.")
-            cursor.execute("INSERT or REPLACE INTO guard (state) VALUES (?);", (1,))
-        else:
-            logger.info("Disabling security mode.")
-            cursor.execute("DELETE FROM guard WHERE state = 1")
-        db.connection.commit()
-    time.sleep(0.5)
+    if enabled:
+        logger.info("Enabling security mode.")
+        state.set("guard", True)
+    else:
+        logger.info("Disabling security mode.")
+        state.delete("guard")
 
 
 def guard_disable() -> NoReturn:
@@ -67,7 +58,7 @@ def guard_disable() -> NoReturn:
         Informs if a threat was detected during its runtime.
     """
     if get_state():
-        put_state(state=False)
+        put_state(enabled=False)
         text = f'Welcome back {models.env.title}! Good {support.part_of_day()}.'
         if [file for file in os.listdir('threat') if file.endswith('.jpg')]:
             text += f" We had a potential threat {models.env.title}! Please check your email, or the " \
@@ -121,10 +112,10 @@ def guard_enable() -> NoReturn:
     if not os.path.isdir('threat'):
         os.mkdir('threat')
     logger.info('Enabled Security Mode')
-    put_state(state=True)
+    put_state(enabled=True)
     speaker.speak(text=f"Enabled security mode {models.env.title}! I will look out for potential threats and keep you "
                        f"posted. Have a nice {support.part_of_day()}, and enjoy yourself {models.env.title}!")
-    if shared.called_by_offline:
+    if responder.called_by_offline():
         process = Process(target=security_runner)
         process.start()
         with db.connection:
@@ -14,7 +14,8 @@ from executors.location import get_location_from_coordinates
 from modules.audio import speaker
 from modules.logger.custom_logger import logger
 from modules.models import models
-from modules.utils import shared, support
+from modules.offline import responder
+from modules.utils import support
 
 
 def ip_address() -> Union[str, None]:
@@ -152,7 +153,7 @@ def speed_test() -> None:
     download_process = Process(target=st.download, kwargs={"threads": threads_per_core})
     upload_process.start()
     download_process.start()
-    if not shared.called_by_offline:
+    if not responder.called_by_offline():
         speaker.speak(text=f"Starting speed test {models.env.title}! I.S.P: {isp}. Location: {city} {state}", run=True)
     upload_process.join()
     download_process.join()
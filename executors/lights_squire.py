@@ -4,6 +4,7 @@ from multiprocessing import Process
 from typing import List, NoReturn, Union
 
 from modules.audio import speaker
+from modules.control.state import state
 from modules.database import database
 from modules.lights import preset_values, smart_lights
 from modules.models import models
@@ -38,37 +39,31 @@ def runner(host_ip: List[str]) -> NoReturn:
             executor.map(preset, host_ip)
 
 
-def check_status() -> Union[str, int, None]:
-    """Retrieve process ID from the ``party`` table.
+def check_status() -> Union[int, None]:
+    """Retrieve process ID of party mode from the shared state store.
 
     Returns:
-        Process.pid:
+        int:
         Process ID if party mode is enabled.
     """
-    with db.connection:
-        cursor = db.connection.cursor()
-        state = cursor.execute("SELECT pid FROM party").fetchone()
-    return state
+    return state.get("party")
 
 
 def remove_status() -> NoReturn:
-    """Removes all entries from the ``party`` table."""
-    with db.connection:
-        cursor = db.connection.cursor()
-        cursor.execute("DELETE FROM party")
-        db.connection.commit()
+    """Removes the process ID of party mode from the shared state store."""
+    state.delete("party")
 
 
 def update_status(process: Process) -> NoReturn:
-    """Update the ``children`` and ``party`` tables with process ID.
+    """Update the ``children`` table and the shared state store with process ID.
 
     Args:
-        process: Process for which the PID has to be stored in database.
+        process: Process for which the PID has to be stored.
     """
+    state.set("party", process.pid)
     with db.connection:
         cursor = db.connection.cursor()
         cursor.execute("UPDATE children SET party=null")
-        cursor.execute("INSERT or REPLACE INTO party (pid) VALUES (?);", (process.pid,))
         cursor.execute("INSERT or REPLACE INTO children (party) VALUES (?);", (process.pid,))
         db.connection.commit()
 
@@ -96,7 +91,7 @@ def party_mode(host_ip: List[str], phrase: str) -> bool:
     elif 'disable' in phrase:
         if state:
             speaker.speak(text=f'Party mode has been disabled {models.env.title}! Hope you enjoyed it.')
-            support.stop_process(pid=state[0])
+            support.stop_process(pid=state)
             remove_status()
             return True
         else:
@@ -30,6 +30,7 @@ from modules.audio import listener, speaker
 from modules.conditions import keywords
 from modules.logger.custom_logger import logger
 from modules.models import models
+from modules.offline import responder
 from modules.utils import shared, support
 
 # stores necessary values for geolocation to receive the latitude, longitude and address
@@ -220,7 +221,7 @@ def locate_device(target_device: AppleDevice) -> NoReturn:
     if not loc:
         speaker.speak(text=f"I wasn't able to locate your {lookup} {models.env.title}! It is probably offline.")
     else:
-        if shared.called_by_offline:
+        if responder.called_by_offline():
             post_code = loc.get("postcode", "").split("-")[0]
         else:
             post_code = '"'.join(list(loc.get("postcode", "").split("-")[0]))
@@ -243,7 +244,7 @@ def locate(phrase: str) -> None:
     if not (target_device := device_selector(phrase=phrase)):
         support.no_env_vars()
         return
-    if shared.called_by_offline:
+    if responder.called_by_offline():
         locate_device(target_device=target_device)
         return
     sys.stdout.write(f"\rLocating your {target_device}")
@@ -316,7 +317,7 @@ def distance_controller(origin: str = None, destination: str = None) -> None:
     """
     if not destination:
         speaker.speak(text="Destination please?")
-        if shared.called_by_offline:
+        if responder.called_by_offline():
             return
         speaker.speak(run=True)
         if destination := listener.listen(timeout=3, phrase_limit=4):
@@ -391,7 +392,7 @@ def locate_places(phrase: str = None) -> None:
         before_keyword, keyword, after_keyword = phrase.partition(keyword)
         place = after_keyword.replace(" in", "").strip()
     if not place:
-        if shared.called_by_offline:
+        if responder.called_by_offline():
             speaker.speak(text=f"I need a location to get you the details {models.env.title}!")
             return
         speaker.speak(text="Tell me the name of a place!", run=True)
@@ -433,12 +434,12 @@ def locate_places(phrase: str = None) -> None:
                 speaker.speak(text=f"{place} is in {city or county}, {state}")
             else:
                 speaker.speak(text=f"{place} is in {city or county}, {state}, in {country}")
-        if shared.called_by_offline:
+        if responder.called_by_offline():
             return
         shared.called["locate_places"] = True
     except (TypeError, AttributeError):
         speaker.speak(text=f"{place} is not a real place on Earth {models.env.title}! Try again.")
-        if shared.called_by_offline:
+        if responder.called_by_offline():
             return
         locate_places(phrase=None)
     distance_controller(origin=None, destination=place)
@@ -1,52 +1,126 @@
+import functools
 import os
 import time
-from datetime import datetime
+from http import HTTPStatus
 from multiprocessing import Process
 from threading import Thread
-from typing import AnyStr, List, NoReturn, Union
+from typing import AnyStr, NoReturn, Union
 
 import requests
 from pydantic import HttpUrl
 
-from executors.alarm import alarm_executor
-from executors.automation import auto_helper
+from executors.alarm import alarm_db, alarm_executor
+from executors.automation import AutomationTable
 from executors.conditions import conditions
-from executors.crontab import crontab_executor
+from executors.crontab import CronRunner
 from executors.others import photo
 from executors.remind import reminder_executor
 from executors.word_match import word_match
 from modules.auth_bearer import BearerAuth
 from modules.conditions import keywords
+from modules.control.channel import ControlChannel
 from modules.crontab import expression
 from modules.database import database
 from modules.logger import config
 from modules.logger.custom_logger import logger
 from modules.meetings import events, icalendar
 from modules.models import models
-from modules.offline import compatibles
-from modules.timer.executor import RepeatedTimer
-from modules.utils import shared, support
+from modules.models.classes import CronJob
+from modules.offline import compatibles, responder
+from modules.timer import alarms
+from modules.timer.executor import TimerService
+from modules.timer.scheduler import Scheduler, next_minute
 
 db = database.Database(database=models.fileio.base_db)
 offline_compatible = compatibles.offline_compatible()
 
 
-def repeated_tasks() -> Union[List[RepeatedTimer], List]:
+def repeated_tasks() -> TimerService:
     """Runs tasks on a timed basis.
 
     Returns:
-        list:
-        Returns a list of RepeatedTimer object(s).
+        TimerService:
+        Returns the timer service that runs the tasks.
     """
-    tasks = []
+    service = TimerService()
     logger.info(f"Background tasks: {len(models.env.tasks)}")
-    for task in models.env.tasks:
+    for task in list(models.env.tasks):
         if word_match(phrase=task.task, match_list=offline_compatible):
-            tasks.append(RepeatedTimer(task.seconds, offline_communicator, task.task))
+            service.add(task.task, task.seconds, offline_communicator, task.task, jitter=task.jitter)
         else:
             logger.error(f"{task.task} is not a part of offline communication. Removing entry.")
             models.env.tasks.remove(task)
-    return tasks
+    service.start()
+    return service
+
+
+def events_sync() -> float:
+    """Gets calendar events in a dedicated process.
+
+    Returns:
+        float:
+        Epoch time of the next sync.
+    """
+    event_process = Process(target=events.events_writer)
+    event_process.start()
+    with db.connection:
+        cursor = db.connection.cursor()
+        cursor.execute("UPDATE children SET events=null")
+        cursor.execute("INSERT or REPLACE INTO children (events) VALUES (?);", (event_process.pid,))
+        db.connection.commit()
+    return time.time() + models.env.sync_events
+
+
+def meetings_sync() -> float:
+    """Gets calendar schedule from ICS in a dedicated process.
+
+    Returns:
+        float:
+        Epoch time of the next sync.
+    """
+    meeting_process = Process(target=icalendar.meetings_writer)
+    meeting_process.start()
+    with db.connection:
+        cursor = db.connection.cursor()
+        cursor.execute("UPDATE children SET meetings=null")
+        cursor.execute("INSERT or REPLACE INTO children (meetings) VALUES (?);", (meeting_process.pid,))
+        db.connection.commit()
+    if icalendar.last_status() == HTTPStatus.SERVICE_UNAVAILABLE.real:
+        return time.time() + 21_600  # Set to 6 hours if the meetings URL was unavailable during the previous sync
+    return time.time() + models.env.sync_meetings
+
+
+def crontab_trigger(runner: CronRunner, job: expression.CronExpression,
+                    cron: CronJob) -> Union[float, None]:
+    """Submits a cron job to the runner.
+
+    Args:
+        runner: Pool that runs the cron jobs.
+        job: Compiled cron expression of the job.
+        cron: Cron job with its policy and timeout.
+
+    Returns:
+        float:
+        Epoch time of the next run of the job.
+    """
+    runner.submit(command=job.comment, policy=cron.policy, timeout=cron.timeout)
+    if upcoming := job.next_run():
+        return upcoming.timestamp()
+
+
+def alarm_check() -> Union[float, None]:
+    """Triggers the alarms and reminders that are due.
+
+    Returns:
+        float:
+        Epoch time of the next alarm or reminder, ``None`` if there are none.
+    """
+    for entry in alarm_db.pop_due():
+        if entry.kind == alarms.ALARM:
+            Process(target=alarm_executor).start()
+        else:
+            Thread(target=reminder_executor, args=[entry.message]).start()
+    return alarm_db.next_due()
 
 
 def automator() -> NoReturn:
@@ -62,86 +136,51 @@ def automator() -> NoReturn:
                 9:00 PM:
                   task: set my bedroom lights to 5%
 
-        - Jarvis creates/swaps a ``status`` flag upon execution, so that it doesn't repeat execution within a minute.
+        - | The automation file is loaded into memory and parsed again only when it is modified.
+          | Tasks that were executed are tracked in memory, the automation file is never rewritten.
+        - | Tasks are run by a scheduler that sleeps until the next job is due, instead of a busy loop.
+          | Automation is checked once at the start of every minute, and each cron job is scheduled for its next run.
+        - | Alarms and reminders are read from a store indexed by their due time, and the scheduler sleeps until the
+          | next one is due. A wake-up signal is sent when one is created, to reschedule the alarm job.
     """
     config.multiprocessing_logger(filename=os.path.join('logs', 'automation_%d-%m-%Y.log'))
     offline_list = offline_compatible + keywords.restart_control
-    start_events = start_meetings = start_cron = time.time()
     events.event_app_launcher() if models.settings.macos else None
-    dry_run = True
-    while True:
-        if os.path.isfile(models.fileio.automation):
-            if exec_task := auto_helper(offline_list=offline_list):
-                try:
-                    offline_communicator(command=exec_task)
-                except Exception as error:
-                    logger.error(error)
-
-        if start_events + models.env.sync_events <= time.time() or dry_run:
-            start_events = time.time()
-            event_process = Process(target=events.events_writer)
-            logger.info(f"Getting calendar events from {models.env.event_app}") if dry_run else None
-            event_process.start()
-            with db.connection:
-                cursor = db.connection.cursor()
-                cursor.execute("UPDATE children SET events=null")
-                cursor.execute("INSERT or REPLACE INTO children (events) VALUES (?);", (event_process.pid,))
-                db.connection.commit()
-
-        if start_meetings + models.env.sync_meetings <= time.time() or dry_run:
-            if dry_run and models.env.ics_url:
-                try:
-                    if requests.get(url=models.env.ics_url).status_code == 503:
-                        models.env.sync_meetings = 21_600  # Set to 6 hours if unable to connect to the meetings URL
-                except (ConnectionError, TimeoutError, requests.exceptions.RequestException,
-                        requests.exceptions.Timeout) as error:
-                    logger.error(error)
-                    models.env.sync_meetings = 99_999_999  # NEVER RUNs, as env vars are loaded only during start up
-            start_meetings = time.time()
-            meeting_process = Process(target=icalendar.meetings_writer)
-            logger.info("Getting calendar schedule from ICS.") if dry_run else None
-            meeting_process.start()
-            with db.connection:
-                cursor = db.connection.cursor()
-                cursor.execute("UPDATE children SET meetings=null")
-                cursor.execute("INSERT or REPLACE INTO children (meetings) VALUES (?);", (meeting_process.pid,))
-                db.connection.commit()
-
-        if start_cron + 60 <= time.time():  # Condition passes every minute
-            start_cron = time.time()
-            for cron in models.env.crontab:
-                job = expression.CronExpression(line=cron)
-                if job.check_trigger():
-                    cron_process = Process(target=crontab_executor, args=(job.comment,))
-                    cron_process.start()
-                    with db.connection:
-                        cursor = db.connection.cursor()
-                        cursor.execute("INSERT or REPLACE INTO children (crontab) VALUES (?);", (cron_process.pid,))
-                        db.connection.commit()
-
-        if alarm_state := support.lock_files(alarm_files=True):
-            for each_alarm in alarm_state:
-                if each_alarm == datetime.now().strftime("%I_%M_%p.lock") or \
-                        each_alarm == datetime.now().strftime("%I_%M_%p_repeat.lock") or \
-                        each_alarm == datetime.now().strftime("%A_%I_%M_%p_repeat.lock"):
-                    Process(target=alarm_executor).start()
-                    if each_alarm.endswith("_repeat.lock"):
-                        os.rename(os.path.join("alarm", each_alarm), os.path.join("alarm", f"_{each_alarm}"))
-                    else:
-                        os.remove(os.path.join("alarm", each_alarm))
-                elif each_alarm.startswith('_') and not \
-                        (each_alarm == datetime.now().strftime("_%I_%M_%p_repeat.lock") or
-                         each_alarm == datetime.now().strftime("_%A_%I_%M_%p_repeat.lock")):
-                    os.rename(os.path.join("alarm", each_alarm), os.path.join("alarm", each_alarm.lstrip("_")))
-        if reminder_state := support.lock_files(reminder_files=True):
-            for each_reminder in reminder_state:
-                remind_time, remind_msg = each_reminder.split('|')
-                remind_msg = remind_msg.rstrip('.lock').replace('_', ' ')
-                if remind_time == datetime.now().strftime("%I_%M_%p"):
-                    Thread(target=reminder_executor, args=[remind_msg]).start()
-                    os.remove(os.path.join("reminder", each_reminder))
-
-        dry_run = False
+    alarms.import_lock_files(store=alarm_db)
+    automation = AutomationTable(offline_list=offline_list)
+
+    def every_minute() -> float:
+        """Runs the tasks that are scheduled for the current minute."""
+        for exec_task in automation.due():
+            try:
+                offline_communicator(command=exec_task)
+            except Exception as error:
+                logger.error(error)
+        return next_minute()
+
+    def on_wake() -> NoReturn:
+        """Moves the alarm job to the next alarm or reminder, as one may have been added or removed."""
+        if (deadline := alarm_db.next_due()) is None:
+            scheduler.cancel(key="alarms")
+        else:
+            scheduler.schedule(key="alarms", deadline=deadline, job=alarm_check)
+
+    scheduler = Scheduler(channel=ControlChannel(port=models.env.automator_port))
+    logger.info(f"Getting calendar events from {models.env.event_app}")
+    scheduler.schedule(key="events", deadline=time.time(), job=events_sync)
+    logger.info("Getting calendar schedule from ICS.")
+    scheduler.schedule(key="meetings", deadline=time.time(), job=meetings_sync)
+    scheduler.schedule(key="minute", deadline=time.time(), job=every_minute)
+    scheduler.schedule(key="alarms", deadline=time.time(), job=alarm_check)
+    runner = CronRunner(workers=models.env.cron_workers, policy=models.env.cron_policy,
+                        timeout=models.env.cron_timeout)
+    for index, cron in enumerate(models.env.crontab):
+        job = expression.CronExpression(line=cron.expression)
+        if upcoming := job.next_run():
+            logger.info(f"Next run for '{job.comment}': {upcoming.strftime('%c')}")
+            scheduler.schedule(key=("crontab", index), deadline=upcoming.timestamp(),
+                               job=functools.partial(crontab_trigger, runner, job, cron))
+    scheduler.run(on_wake=on_wake)
 
 
 def get_tunnel() -> Union[HttpUrl, NoReturn]:
@@ -211,7 +250,7 @@ def on_demand_offline_automation(task: str) -> Union[str, None]:
 
 
 def offline_communicator(command: str) -> Union[AnyStr, HttpUrl]:
-    """Initiates conditions after flipping ``status`` flag in ``called_by_offline`` dict which suppresses the speaker.
+    """Initiates conditions within a responder session, which suppresses the speaker and collects the response.
 
     Args:
         command: Takes the command that has to be executed as an argument.
@@ -220,20 +259,18 @@ def offline_communicator(command: str) -> Union[AnyStr, HttpUrl]:
         AnyStr:
         Response from Jarvis.
     """
-    shared.called_by_offline = True
-    # Specific for offline communication and not needed for live conversations
-    if word_match(phrase=command, match_list=keywords.ngrok):
-        if public_url := get_tunnel():
-            return public_url
-        else:
-            raise LookupError("Failed to retrieve the public URL")
-    if word_match(phrase=command, match_list=keywords.photo):
-        return photo()
-    conditions(phrase=command, should_return=True)
-    shared.called_by_offline = False
-    if response := shared.text_spoken:
-        shared.text_spoken = None
-        return response
+    with responder.session() as response:
+        # Specific for offline communication and not needed for live conversations
+        if word_match(phrase=command, match_list=keywords.ngrok):
+            if public_url := get_tunnel():
+                return public_url
+            else:
+                raise LookupError("Failed to retrieve the public URL")
+        if word_match(phrase=command, match_list=keywords.photo):
+            return photo()
+        conditions(phrase=command, should_return=True)
+    if response.text:
+        return response.text
     else:
-        logger.error(f"Offline request failed: {shared.text_spoken}")
+        logger.error(f"Offline request failed: {command}")
         return f"I was unable to process the request: {command}"
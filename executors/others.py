@@ -33,6 +33,7 @@ from modules.exceptions import CameraError
 from modules.facenet import face
 from modules.logger.custom_logger import logger
 from modules.models import models
+from modules.offline import responder
 from modules.utils import shared, support
 
 db = database.Database(database=models.fileio.base_db)
@@ -57,7 +58,7 @@ def apps(phrase: str) -> None:
     keyword = phrase.split()[-1] if phrase else None
     ignore = ['app', 'application']
     if not keyword or keyword in ignore:
-        if shared.called_by_offline:
+        if responder.called_by_offline():
             speaker.speak(text=f'I need an app name to open {models.env.title}!')
             return
         speaker.speak(text=f"Which app shall I open {models.env.title}?", run=True)
@@ -151,7 +152,7 @@ def google_home(device: str = None, file: str = None) -> None:
     if not (network_id := vpn_checker()):
         return
 
-    if not shared.called_by_offline:
+    if not responder.called_by_offline():
         speaker.speak(text=f'Scanning your IP range for Google Home devices {models.env.title}!', run=True)
         sys.stdout.write('\rScanning your IP range for Google Home devices..')
     network_id = '.'.join(network_id.split('.')[0:3])
@@ -215,7 +216,7 @@ def jokes() -> NoReturn:
 
 def flip_a_coin() -> NoReturn:
     """Says ``heads`` or ``tails`` from a random choice."""
-    playsound(sound=models.indicators.coin, block=True) if not shared.called_by_offline else None
+    playsound(sound=models.indicators.coin, block=True) if not responder.called_by_offline() else None
     speaker.speak(text=f"""{random.choice(['You got', 'It landed on',
                                            "It's"])} {random.choice(['heads', 'tails'])} {models.env.title}""")
 
@@ -248,7 +249,7 @@ def meaning(phrase: str) -> None:
                 n += 1
                 mean = ', '.join(value[0:2])
                 speaker.speak(text=f'{keyword} is{repeated}{insert} {key}, which means {mean}.')
-            if shared.called_by_offline:
+            if responder.called_by_offline():
                 return
             speaker.speak(text=f'Do you wanna know how {keyword} is spelled?', run=True)
             response = listener.listen(timeout=3, phrase_limit=3)
@@ -292,7 +293,7 @@ def news(news_source: str = 'fox') -> None:
 
     speaker.speak(text="News around you!")
     speaker.speak(text=' '.join([article['title'] for article in all_articles['articles']]))
-    if shared.called_by_offline:
+    if responder.called_by_offline():
         return
 
     if shared.called['report'] or shared.called['time_travel']:
@@ -380,7 +381,7 @@ def photo() -> str:
     except CameraError as error:
         logger.error(error)
         return f"I'm sorry {models.env.title}! I wasn't able to take a picture."
-    if shared.called_by_offline:
+    if responder.called_by_offline():
         facenet.capture_image(filename=filename)
     else:
         facenet.capture_image(filename=filename, display=True)
@@ -8,6 +8,7 @@ from api.server import trigger_api
 from executors.offline import automator, initiate_tunneling
 from executors.telegram import handler
 from modules.audio.speech_synthesis import synthesizer
+from modules.control.state import state
 from modules.database import database
 from modules.logger.custom_logger import logger
 from modules.models import models
@@ -23,6 +24,9 @@ def delete_db() -> NoReturn:
     if os.path.isfile(models.fileio.base_db):
         logger.info(f"Removing {models.fileio.base_db}")
         os.remove(models.fileio.base_db)
+    for suffix in ('-wal', '-shm'):  # write-ahead log and its index are not valid for a new database
+        if os.path.isfile(models.fileio.base_db + suffix):
+            os.remove(models.fileio.base_db + suffix)
     if os.path.isfile(models.fileio.base_db):
         raise FileExistsError(
             f"{models.fileio.base_db} still exists!"
@@ -31,12 +35,11 @@ def delete_db() -> NoReturn:
 
 
 def clear_db() -> NoReturn:
-    """Deletes entries from all databases except for VPN."""
+    """Deletes entries from all tables and the security mode flag, retaining the VPN and party mode flags."""
+    state.delete("guard")
     with db.connection:
         cursor = db.connection.cursor()
         for table, column in models.TABLES.items():
-            if table == "vpn" or table == "party":
-                continue
             logger.info(f"Deleting data from {table}: {cursor.execute(f'SELECT * FROM {table}').fetchall()}")
             cursor.execute(f"DELETE FROM {table}")
 
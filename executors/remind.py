@@ -1,21 +1,24 @@
 import os
-import pathlib
 import random
 import re
 from datetime import datetime, timedelta
 from typing import NoReturn
 
 from executors import communicator
+from executors.alarm import alarm_db
 from modules.audio import listener, speaker
 from modules.conditions import conversation
+from modules.control import channel
 from modules.logger.custom_logger import logger
 from modules.models import models
-from modules.utils import shared, support
+from modules.offline import responder
+from modules.timer import alarms
+from modules.utils import support
 from modules.windows import win_notifications
 
 
 def create_reminder(hour, minute, am_pm, message, to_about, timer: str = None) -> NoReturn:
-    """Creates the lock file necessary to set a reminder.
+    """Adds a reminder to the store and wakes up the automator.
 
     Args:
         hour: Hour of reminder time.
@@ -25,9 +28,8 @@ def create_reminder(hour, minute, am_pm, message, to_about, timer: str = None) -
         to_about: remind to or remind about as said in phrase.
         timer: Number of minutes/hours to reminder.
     """
-    if not os.path.isdir('reminder'):
-        os.mkdir('reminder')
-    pathlib.Path(os.path.join("reminder", f"{hour}_{minute}_{am_pm}|{message.replace(' ', '_')}.lock")).touch()
+    alarm_db.add(kind=alarms.REMINDER, at=f"{hour}:{minute} {am_pm}", message=message)
+    channel.send_signal(signal="wake", caller="create_reminder", port=models.env.automator_port)
     if timer:
         logger.info(f"Reminder created for '{message}' at {hour}:{minute} {am_pm}")
         speaker.speak(text=f"{random.choice(conversation.acknowledgement)}! "
@@ -67,7 +69,7 @@ def reminder(phrase: str) -> None:
                             timer=f"{hours} {hour_}", to_about=to_about)
             return
     if not (extracted_time := support.extract_time(input_=phrase)):
-        if shared.called_by_offline:
+        if responder.called_by_offline():
             speaker.speak(text='Reminder format should be::Remind me to do something, at some time.')
             return
         speaker.speak(text=f"When do you want to be reminded {models.env.title}?", run=True)
@@ -16,6 +16,7 @@ from modules.audio import listener, speaker
 from modules.conditions import keywords
 from modules.logger.custom_logger import logger
 from modules.models import models
+from modules.offline import responder
 from modules.temperature import temperature
 from modules.utils import shared, support
 
@@ -95,7 +96,7 @@ def system_vitals() -> None:
     restart_time = datetime.strftime(restart_time, "%A, %B %d, at %I:%M %p")
     restart_duration = support.time_converter(seconds=second)
     output += f'Restarted on: {restart_time} - {restart_duration} ago from now.'
-    if shared.called_by_offline:
+    if responder.called_by_offline():
         speaker.speak(text=output)
         return
     sys.stdout.write(f'\r{output}')
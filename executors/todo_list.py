@@ -6,6 +6,7 @@ from modules.audio import listener, speaker
 from modules.conditions import keywords
 from modules.database import database
 from modules.models import models
+from modules.offline import responder
 from modules.utils import shared
 
 tdb = database.Database(database=models.fileio.task_db)
@@ -26,7 +27,7 @@ def todo() -> None:
         else:
             result[category] = result[category] + ', ' + item  # updates category if already found in result
     if result:
-        if shared.called_by_offline:
+        if responder.called_by_offline():
             speaker.speak(text=json.dumps(result))
             return
         speaker.speak(text='Your to-do items are')
@@ -66,7 +67,7 @@ def add_todo() -> None:
                 return
     with tdb.connection:
         cursor = tdb.connection.cursor()
-        cursor.execute(f"INSERT OR REPLACE INTO tasks (category, item) VALUES {(category, item)}")
+        cursor.execute("INSERT OR REPLACE INTO tasks (category, item) VALUES (?, ?)", (category, item))
     speaker.speak(text=f"I've added the item: {item} to the category: {category}. "
                        "Do you want to add anything else to your to-do list?", run=True)
     category_continue = listener.listen(timeout=3, phrase_limit=3)
@@ -14,6 +14,7 @@ from modules.conditions import conversation
 from modules.exceptions import TVError
 from modules.logger.custom_logger import logger
 from modules.models import models
+from modules.offline import responder
 from modules.tv.tv_controls import TV
 from modules.utils import shared, support
 from modules.wakeonlan import wakeonlan
@@ -96,7 +97,7 @@ def television(phrase: str) -> None:
         power_controller = wakeonlan.WakeOnLan()
         with ThreadPoolExecutor(max_workers=len(models.env.tv_mac)) as executor:
             executor.map(power_controller.send_packet, models.env.tv_mac)
-        if not shared.called_by_offline:
+        if not responder.called_by_offline():
             speaker.speak(text=f"Looks like your TV is powered off {models.env.title}! Let me try to turn it back on!",
                           run=True)
 
@@ -5,12 +5,10 @@ from threading import Thread
 from vpn.controller import VPNServer
 
 from modules.audio import speaker
-from modules.database import database
+from modules.control.state import state
 from modules.models import models
 from modules.utils import support
 
-db = database.Database(database=models.fileio.base_db)
-
 
 def vpn_server(phrase: str) -> None:
     """Enables or disables VPN server.
@@ -18,11 +16,8 @@ def vpn_server(phrase: str) -> None:
     Args:
         phrase: Takes the phrase spoken as an argument.
     """
-    with db.connection:
-        cursor = db.connection.cursor()
-        state = cursor.execute("SELECT state FROM vpn").fetchone()
-    if state:
-        speaker.speak(text=f'VPN Server was recently {state[0]}, and the process is still running {models.env.title}! '
+    if operation := state.get("vpn"):
+        speaker.speak(text=f'VPN Server was recently {operation}, and the process is still running {models.env.title}! '
                            'Please wait and retry.')
         return
 
@@ -58,15 +53,9 @@ def vpn_server_switch(operation: str) -> None:
                            gmail_user=models.env.alt_gmail_user, gmail_pass=models.env.alt_gmail_pass,
                            recipient=models.env.recipient or models.env.alt_gmail_user,
                            phone=models.env.phone_number, log='FILE')
-    with db.connection:
-        cursor = db.connection.cursor()
-        cursor.execute("INSERT or REPLACE INTO vpn (state) VALUES (?);", (operation,))
-        db.connection.commit()
+    state.set("vpn", operation)
     if operation == 'enabled':
         vpn_object.create_vpn_server()
     elif operation == 'disabled':
         vpn_object.delete_vpn_server()
-    with db.connection:
-        cursor = db.connection.cursor()
-        cursor.execute(f"DELETE FROM vpn WHERE state='{operation}'")
-        db.connection.commit()
+    state.delete("vpn")
@@ -6,7 +6,7 @@ from executors.word_match import word_match
 from modules.audio import listener, speaker
 from modules.conditions import keywords
 from modules.models import models
-from modules.utils import shared
+from modules.offline import responder
 
 
 def wikipedia_() -> None:
@@ -23,7 +23,7 @@ def wikipedia_() -> None:
                 sys.stdout.write(f"\r{error}")
                 speaker.speak(text=f"Your keyword has multiple results {models.env.title}. {' '.join(error.options)}"
                                    "Please pick one and try again.")
-                if shared.called_by_offline:
+                if responder.called_by_offline():
                     return
                 speaker.speak(run=True)
                 if not (keyword1 := listener.listen(timeout=3, phrase_limit=5)):
@@ -1,7 +1,6 @@
-import sys
 from typing import Iterable, NoReturn, Union
 
-from modules.logger.custom_logger import logger
+from modules.conditions.tracer import tracer
 
 
 def word_match(phrase: str, match_list: Iterable[str]) -> Union[str, NoReturn]:
@@ -17,11 +16,9 @@ def word_match(phrase: str, match_list: Iterable[str]) -> Union[str, NoReturn]:
     """
     if not phrase:
         return
+    lower_phrase = phrase.lower()
     for word in match_list:
-        if word in phrase.lower():  # include .split() for an exact match of words instead of a regex
-            caller = sys._getframe(1).f_code.co_name  # noqa
-            if caller == 'auto_helper':
-                return word
-            logger.debug(f'Matching word: {word}')
-            logger.debug(f'Called by {caller}')
+        if word in lower_phrase:  # include .split() for an exact match of words instead of a regex
+            if tracer.rate:
+                tracer.record(phrase=phrase, match=word, source='word_match')
             return word
@@ -1,8 +1,9 @@
-import struct
 import sys
 from datetime import datetime
+from threading import Thread
 from typing import NoReturn
 
+import numpy
 import pvporcupine
 import pyaudio
 from playsound import playsound
@@ -14,30 +15,40 @@ from executors.location import write_current_location
 from executors.offline import repeated_tasks
 from executors.processor import clear_db, start_processes, stop_processes
 from executors.system import hosted_device_info
-from modules.audio import listener, speaker
+from modules.audio import (listener, playback, speaker, speech_synthesis,
+                           transcriber)
+from modules.audio.frames import CaptureSource, FrameSource
+from modules.audio.replay import WavStream
+from modules.conditions.usage import usage
+from modules.control import channel
+from modules.database import database
 from modules.exceptions import StopSignal
 from modules.logger.custom_logger import custom_handler, logger
 from modules.models import models
 from modules.utils import shared, support
 
 
-def restart_checker() -> NoReturn:
-    """Operations performed during internal/external request to restart."""
-    if flag := support.check_restart():
-        logger.info(f"Restart condition is set to {flag[0]} by {flag[1]}")
-        if flag[1] == "OFFLINE":
-            stop_processes()
-            logger.propagate = False
-            for _handler in logger.handlers:
-                logger.removeHandler(hdlr=_handler)
-            handler = custom_handler()
-            logger.info(f"Switching to {handler.baseFilename}")
-            logger.addHandler(hdlr=handler)
-            starter()
-            shared.processes = start_processes()
-        else:
-            stop_processes(func_name=flag[1])
-            shared.processes[flag[1]] = start_processes(flag[1])
+def restart_checker(flag: bool, caller: str) -> NoReturn:
+    """Operations performed during internal/external request to restart.
+
+    Args:
+        flag: Flag received along with the restart signal.
+        caller: Name of the function or process that requested the restart.
+    """
+    logger.info(f"Restart condition is set to {flag} by {caller}")
+    if caller == "OFFLINE":
+        stop_processes()
+        logger.propagate = False
+        for _handler in logger.handlers:
+            logger.removeHandler(hdlr=_handler)
+        handler = custom_handler()
+        logger.info(f"Switching to {handler.baseFilename}")
+        logger.addHandler(hdlr=handler)
+        starter()
+        shared.processes = start_processes()
+    else:
+        stop_processes(func_name=caller)
+        shared.processes[caller] = start_processes(caller)
 
 
 class Activator:
@@ -52,16 +63,18 @@ class Activator:
         - The ``should_return`` flag ensures, the user is not disturbed when accidentally woke up by wake work engine.
     """
 
-    def __init__(self, input_device_index: int = None):
+    def __init__(self, input_device_index: int = None, audio_stream: WavStream = None):
         """Initiates Porcupine object for hot word detection.
 
         Args:
             input_device_index: Index of Input Device to use.
+            audio_stream: Recorded audio stream to be replayed instead of opening the microphone.
 
         See Also:
             - Instantiates an instance of Porcupine object and monitors audio stream for occurrences of keywords.
             - A higher sensitivity results in fewer misses at the cost of increasing the false alarm rate.
             - sensitivity: Tolerance/Sensitivity level. Takes argument or env var ``sensitivity`` or defaults to ``0.5``
+            - Background tasks, control channel and the teardown of background processes are skipped when replaying.
 
         References:
             - `Audio Overflow <https://people.csail.mit.edu/hubert/pyaudio/docs/#pyaudio.Stream.read>`__ handling.
@@ -70,7 +83,6 @@ class Activator:
         keyword_paths = [pvporcupine.KEYWORD_PATHS[x] for x in models.env.wake_words]
         self.input_device_index = input_device_index
 
-        self.py_audio = pyaudio.PyAudio()
         arguments = {
             "library_path": pvporcupine.LIBRARY_PATH,
             "sensitivities": models.env.sensitivity
@@ -84,8 +96,24 @@ class Activator:
             arguments["keyword_paths"] = keyword_paths
 
         self.detector = pvporcupine.create(**arguments)
-        self.audio_stream = self.open_stream()
-        self.tasks = repeated_tasks()
+        if audio_stream:
+            self.py_audio = None
+            self.audio_stream = audio_stream
+        else:
+            self.py_audio = pyaudio.PyAudio()
+            self.audio_stream = self.open_stream()
+        self.frames = FrameSource(stream=self.audio_stream, frame_length=self.detector.frame_length,
+                                  sample_rate=self.detector.sample_rate, threaded=self.py_audio is not None)
+        self.reader = self.frames.reader()
+        self.pcm = numpy.empty(shape=self.detector.frame_length, dtype=numpy.int16)
+        shared.capture = CaptureSource(frames=self.frames)
+        if self.py_audio:
+            self.tasks = repeated_tasks()
+            self.channel = None if models.settings.limited else channel.ControlChannel()
+        else:  # replay mode runs alongside a live instance, so background tasks and control channel are left alone
+            self.tasks = None
+            self.channel = None
+        self.label = f"\rAwaiting: [{', '.join(models.env.wake_words).upper()}]"
 
     def open_stream(self) -> pyaudio.Stream:
         """Initializes an audio stream.
@@ -104,10 +132,15 @@ class Activator:
         )
 
     def executor(self) -> NoReturn:
-        """Calls the listener for actionable phrase and runs the speaker node for response."""
+        """Calls the listener for actionable phrase and runs the speaker node for response.
+
+        See Also:
+            - The audio stream is left open, and the listener starts reading from the frame after the wake word.
+            - Frames captured while responding are discarded before the detector resumes.
+        """
         logger.debug(f"Detected {models.settings.bot} at {datetime.now()}")
+        self.frames.mark = self.reader.cursor
         playsound(sound=models.indicators.acknowledgement, block=False)
-        self.py_audio.close(stream=self.audio_stream)
         if phrase := listener.listen(timeout=models.env.timeout, phrase_limit=models.env.phrase_limit,
                                      sound=False):
             try:
@@ -117,17 +150,24 @@ class Activator:
                 speaker.speak(text=f"I'm sorry {models.env.title}! I ran into an unknown error. "
                                    "Please check the logs for more information.")
             speaker.speak(run=True)
-        self.audio_stream = self.open_stream()
+        self.reader.skip()
+        support.flush_screen()
+        sys.stdout.write(self.label)
 
     def start(self) -> NoReturn:
         """Runs ``audio_stream`` in a forever loop and calls ``initiator`` when the phrase ``Jarvis`` is heard."""
+        self.frames.start()
+        sys.stdout.write(self.label)
         try:
             while True:
-                sys.stdout.write(f"\rAwaiting: [{', '.join(models.env.wake_words).upper()}]")
-                pcm = struct.unpack_from("h" * self.detector.frame_length,
-                                         self.audio_stream.read(num_frames=self.detector.frame_length,
-                                                                exception_on_overflow=False))
-                result = self.detector.process(pcm=pcm)
+                if (pcm := self.reader.read(out=self.pcm)) is None:
+                    if not self.py_audio:
+                        logger.info("Reached the end of the recorded audio stream.")
+                        return
+                    logger.critical("Audio stream was interrupted.")
+                    raise StopSignal
+                # Porcupine builds a ctypes array from the samples, which is faster from ints than from numpy scalars
+                result = self.detector.process(pcm=pcm.tolist())
                 if models.settings.legacy:
                     if len(models.env.wake_words) == 1 and result:
                         models.settings.bot = models.env.wake_words[0]
@@ -139,12 +179,15 @@ class Activator:
                     if result >= 0:
                         models.settings.bot = models.env.wake_words[result]
                         self.executor()
-                if models.settings.limited:
+                if not self.channel:
+                    continue
+                if not (control := self.channel.receive()):
                     continue
-                support.flush_screen()
-                restart_checker()
-                if flag := support.check_stop():
-                    logger.info(f"Stopper condition is set to {flag[0]} by {flag[1]}")
+                signal, flag, caller = control
+                if signal == "restart":
+                    restart_checker(flag=flag, caller=caller)
+                elif signal == "stop":
+                    logger.info(f"Stopper condition is set to {flag} by {caller}")
                     self.stop()
                     terminator()
         except StopSignal:
@@ -162,13 +205,27 @@ class Activator:
             - Closes audio stream.
             - Releases port audio resources.
         """
-        for task in self.tasks:
-            task.stop()
-        if not models.settings.limited:
-            stop_processes()
-        clear_db()
+        if self.tasks:
+            self.tasks.stop()
+        if self.channel:
+            self.channel.close()
+        if self.py_audio:  # background processes and database are owned by the live instance
+            if not models.settings.limited:
+                stop_processes()
+            clear_db()
+        self.frames.stop()
+        logger.info(f"Audio frames: {self.frames.stats()}")
+        logger.info(f"Database contention: {database.stats()}")
+        logger.info(f"Speech synthesis: {speech_synthesis.client.stats()}")
+        usage.stop()
         logger.info("Releasing resources acquired by Porcupine.")
         self.detector.delete()
+        playback.output.terminate()
+        if not self.py_audio:
+            if self.audio_stream:
+                logger.info("Closing recorded audio stream.")
+                self.audio_stream.close()
+            return
         if self.audio_stream and self.audio_stream.is_active():
             logger.info("Closing Audio Stream.")
             self.py_audio.close(stream=self.audio_stream)
@@ -181,6 +238,7 @@ def begin() -> NoReturn:
     """Starts main process to activate Jarvis after checking internet connection and initiating background processes."""
     logger.info(f"Current Process ID: {models.settings.pid}")
     starter()
+    usage.import_yaml(filepath=models.fileio.frequent)
     if ip_address() and public_ip_info():
         sys.stdout.write(f"\rINTERNET::Connected to {get_ssid() or 'the internet'}.")
     else:
@@ -191,6 +249,9 @@ def begin() -> NoReturn:
     shared.hosted_device = hosted_device_info()
     if not models.settings.limited:
         shared.processes = start_processes()
+    Thread(target=transcriber.preload, daemon=True).start()
+    if models.env.speech_synthesis_timeout and models.env.speech_synthesis_prewarm:
+        Thread(target=speaker.prewarm_cache, daemon=True).start()
     write_current_location()
     Activator().start()
 
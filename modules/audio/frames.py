@@ -0,0 +1,248 @@
+# noinspection PyUnresolvedReferences
+"""Module to share a single, persistent audio input stream between the wake word detector and the listener.
+
+>>> Frames
+
+"""
+
+from threading import Condition, Thread, current_thread
+from typing import Any, Dict, NoReturn, Union
+
+import numpy
+import pyaudio
+from speech_recognition import AudioSource
+
+from modules.logger.custom_logger import logger
+
+
+class FrameReader:
+    """Cursor that reads frames from a ``FrameSource`` independently of other readers.
+
+    >>> FrameReader
+
+    """
+
+    def __init__(self, source: 'FrameSource', start: int):
+        """Instantiates the reader at the given frame.
+
+        Args:
+            source: Frame source to read from.
+            start: Absolute index of the first frame to be read.
+        """
+        self.source = source
+        self.cursor = start
+
+    def read(self, out: numpy.ndarray = None) -> Union[numpy.ndarray, None]:
+        """Waits for the next frame and copies it out of the ring buffer.
+
+        Args:
+            out: Preallocated ``int16`` array of the frame length to copy the frame into. Defaults to a new array.
+
+        See Also:
+            - | The frame is copied while the lock is held, so the capture thread can't overwrite it once returned.
+              | Readers that run for every frame should pass ``out``, so that no array is allocated per frame.
+            - If the reader has fallen behind by more than the ring's capacity, the stale frames are skipped.
+
+        Returns:
+            numpy.ndarray:
+            The array that holds the frame, or ``None`` if the source has stopped.
+        """
+        source = self.source
+        with source.condition:
+            while self.cursor >= source.head:
+                if not source.running:
+                    return
+                if source.threaded:
+                    source.condition.wait()
+                else:
+                    source.pull()
+            if (lag := source.head - self.cursor) > source.capacity:
+                source.dropped += lag - source.capacity
+                self.cursor = source.head - source.capacity
+            slot = source.ring[self.cursor % source.capacity]
+            if out is None:
+                out = slot.copy()
+            else:
+                numpy.copyto(out, slot)
+            self.cursor += 1
+        return out
+
+    def skip(self) -> NoReturn:
+        """Moves the cursor to the live end of the stream, discarding any unread frames."""
+        with self.source.condition:
+            self.cursor = self.source.head
+
+
+class FrameSource:
+    """Captures audio frames from an input stream into a preallocated ring buffer.
+
+    >>> FrameSource
+
+    See Also:
+        - Each frame is copied straight from the raw bytes into a reused ``int16`` slot, no tuples or ints are built.
+        - The stream is never closed between interactions, so the audio spoken right after the wake word is retained.
+        - Multiple readers (wake word detector and listener) can consume the same frames at their own pace.
+        - | Live streams are captured in a background thread. When ``threaded`` is set to ``False`` (recorded audio),
+          | readers pull the frames synchronously, so no frame is dropped regardless of how fast the audio is read.
+    """
+
+    def __init__(self, stream: Union[pyaudio.Stream, Any], frame_length: int, sample_rate: int,
+                 capacity: int = 64, threaded: bool = True):
+        """Allocates the ring buffer.
+
+        Args:
+            stream: Input stream to read the audio from. Any object with a ``pyaudio.Stream`` like ``read`` method.
+            frame_length: Number of samples in each frame.
+            sample_rate: Sample rate of the input stream.
+            capacity: Number of frames held in the ring buffer.
+            threaded: Takes a boolean flag whether to capture the frames in a background thread.
+        """
+        self.stream = stream
+        self.frame_length = frame_length
+        self.sample_rate = sample_rate
+        self.capacity = capacity
+        self.ring = numpy.zeros(shape=(capacity, frame_length), dtype=numpy.int16)
+        self.condition = Condition()
+        self.head = 0
+        self.mark = None
+        self.running = False
+        self.overflowed = 0
+        self.dropped = 0
+        self.host_buffer = None
+        if hasattr(stream, 'get_input_latency'):  # depth of the host's input buffer in samples, for live streams
+            self.host_buffer = max(2 * frame_length, int(stream.get_input_latency() * sample_rate))
+        self.threaded = threaded
+        self.thread = Thread(target=self._capture, daemon=True) if threaded else None
+
+    def _read(self) -> bytes:
+        """Reads a single frame as raw bytes and keeps a count of the reads that found the host's buffer full.
+
+        See Also:
+            - | The frame is read even if the input has overflowed, since PyAudio discards the frame when it raises
+              | on overflow, which leaves a gap in the audio fed to the detector.
+            - | Overflows are counted instead when the samples waiting in the host's buffer before the read reach the
+              | depth of that buffer (input latency), at which point the host has started to drop samples.
+
+        Returns:
+            bytes:
+            Raw audio data for one frame.
+        """
+        if self.host_buffer and self.stream.get_read_available() >= self.host_buffer:
+            self.overflowed += 1
+        return self.stream.read(num_frames=self.frame_length, exception_on_overflow=False)
+
+    def pull(self) -> NoReturn:
+        """Reads a single frame from the stream into the ring buffer, stops the source at the end of the stream."""
+        if not (data := self._read()):
+            self.stop()
+            return
+        data = numpy.frombuffer(data, dtype=numpy.int16)
+        with self.condition:
+            frame = self.ring[self.head % self.capacity]
+            if data.size == self.frame_length:
+                frame[:] = data
+            else:  # Last frame of a recorded stream is padded with silence
+                frame[:data.size] = data
+                frame[data.size:] = 0
+            self.head += 1
+            self.condition.notify_all()
+
+    def _capture(self) -> NoReturn:
+        """Reads frames from the stream into the ring buffer until stopped."""
+        try:
+            while self.running:
+                self.pull()
+        except OSError as error:
+            if self.running:
+                logger.error(error)
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+    def start(self) -> NoReturn:
+        """Starts capturing frames, in a background thread for live streams."""
+        self.running = True
+        if self.threaded:
+            self.thread.start()
+
+    def stop(self) -> NoReturn:
+        """Stops capturing frames, wakes up any waiting readers and waits for the pending read to complete."""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.threaded and self.thread.is_alive() and self.thread is not current_thread():
+            self.thread.join(timeout=1)
+
+    def reader(self, start: int = None) -> FrameReader:
+        """Creates a new reader.
+
+        Args:
+            start: Absolute index of the first frame to be read. Defaults to the live end of the stream.
+
+        Returns:
+            FrameReader:
+            A reader positioned at the requested frame.
+        """
+        with self.condition:
+            if start is None:
+                start = self.head
+            return FrameReader(source=self, start=max(start, self.head - self.capacity))
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for the frames that were captured, dropped and overflowed.
+
+        Returns:
+            dict:
+            A dictionary of frame counters.
+        """
+        return {"frames": self.head, "dropped": self.dropped, "overflowed": self.overflowed}
+
+
+class CaptureSource(AudioSource):
+    """Exposes a ``FrameSource`` as an audio source for ``speech_recognition`` without opening a new stream.
+
+    >>> CaptureSource
+
+    See Also:
+        When a ``mark`` is set on the frame source, listening starts from that frame (pre-roll) instead of live audio.
+    """
+
+    def __init__(self, frames: FrameSource):
+        """Instantiates the audio source.
+
+        Args:
+            frames: Frame source that is shared with the wake word detector.
+        """
+        self.frames = frames
+        self.SAMPLE_RATE = frames.sample_rate
+        self.SAMPLE_WIDTH = pyaudio.get_sample_size(pyaudio.paInt16)
+        self.CHUNK = frames.frame_length
+        self.buffer = numpy.empty(shape=frames.frame_length, dtype=numpy.int16)
+        self.stream = None
+        self.reader = None
+
+    def __enter__(self) -> 'CaptureSource':
+        """Creates a reader from the pre-roll mark if set, from the live end of the stream otherwise."""
+        self.reader = self.frames.reader(start=self.frames.mark)
+        self.frames.mark = None
+        self.stream = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> NoReturn:
+        """Releases the reader, the underlying stream is left open."""
+        self.stream = None
+        self.reader = None
+
+    def read(self, size: int) -> bytes:
+        """Reads the next frame as raw bytes.
+
+        Args:
+            size: Number of samples requested. Always equal to the frame length.
+
+        Returns:
+            bytes:
+            Raw audio data, or empty bytes if the frame source has stopped.
+        """
+        if (frame := self.reader.read(out=self.buffer)) is None:
+            return b""
+        return frame.tobytes()
@@ -9,15 +9,25 @@ from typing import Union
 
 import requests.exceptions
 from playsound import playsound
-from speech_recognition import (Microphone, Recognizer, RequestError,
-                                UnknownValueError, WaitTimeoutError)
+from speech_recognition import (Microphone, RequestError, UnknownValueError,
+                                WaitTimeoutError)
 
+from modules.audio.transcriber import transcriber
 from modules.logger.custom_logger import logger
 from modules.models import models
-from modules.utils import support
+from modules.utils import shared, support
 
-recognizer = Recognizer()  # initiates recognizer that uses google's translation
-microphone = Microphone()  # initiates microphone object
+
+def get_microphone() -> Microphone:
+    """Initiates the microphone object on first use, so that importing this module doesn't open PortAudio.
+
+    Returns:
+        Microphone:
+        Microphone object from ``speech_recognition``.
+    """
+    if not shared.microphone:
+        shared.microphone = Microphone()
+    return shared.microphone
 
 
 def listen(timeout: Union[int, float], phrase_limit: Union[int, float], sound: bool = True,
@@ -33,15 +43,20 @@ def listen(timeout: Union[int, float], phrase_limit: Union[int, float], sound: b
     Returns:
         str:
          - Returns recognized statement from the microphone.
+
+    See Also:
+        Reads from the audio stream shared by the wake word detector when available, opens the microphone otherwise.
     """
-    with microphone as source:
+    with shared.capture or get_microphone() as source:
         try:
             playsound(sound=models.indicators.start, block=False) if sound else None
             sys.stdout.write("\rListener activated...") if stdout else None
-            listened = recognizer.listen(source=source, timeout=timeout, phrase_time_limit=phrase_limit)
-            playsound(sound=models.indicators.end, block=False) if sound else None
+            recognized = transcriber.listen(
+                source=source, timeout=timeout, phrase_limit=phrase_limit,
+                on_captured=lambda: playsound(sound=models.indicators.end, block=False) if sound else None,
+                on_partial=lambda partial: sys.stdout.write(f"\r{partial}") if stdout else None
+            )
             support.flush_screen()
-            recognized = recognizer.recognize_google(audio_data=listened)
             logger.info(recognized)
             return recognized
         except (UnknownValueError, RequestError, WaitTimeoutError):
@@ -0,0 +1,63 @@
+# noinspection PyUnresolvedReferences
+"""Module to play audio from memory, without writing it to a file.
+
+>>> Playback
+
+"""
+
+import io
+import wave
+from threading import Lock
+from typing import NoReturn
+
+import pyaudio
+
+from modules.logger.custom_logger import logger
+
+
+class AudioOutput:
+    """Plays WAV audio held in memory through the default output device.
+
+    >>> AudioOutput
+
+    See Also:
+        - | PortAudio is initialized on first use and retained, so each playback only opens a stream.
+        - Playbacks are serialized, so audio played from multiple threads doesn't overlap.
+    """
+
+    CHUNK = 4_096
+
+    def __init__(self):
+        """Instantiates the object without initializing PortAudio."""
+        self.py_audio = None
+        self.lock = Lock()
+
+    def play(self, content: bytes) -> NoReturn:
+        """Plays a WAV file's content.
+
+        Args:
+            content: Content of the WAV file.
+        """
+        with self.lock:
+            if not self.py_audio:
+                self.py_audio = pyaudio.PyAudio()
+            with wave.open(io.BytesIO(content), 'rb') as reader:
+                stream = self.py_audio.open(format=self.py_audio.get_format_from_width(reader.getsampwidth()),
+                                            channels=reader.getnchannels(), rate=reader.getframerate(), output=True)
+                try:
+                    while data := reader.readframes(self.CHUNK):
+                        stream.write(data)
+                finally:
+                    stream.stop_stream()
+                    stream.close()
+
+    def terminate(self) -> NoReturn:
+        """Releases the PortAudio resources."""
+        with self.lock:
+            if self.py_audio:
+                logger.info("Releasing PortAudio output resources.")
+                self.py_audio.terminate()
+                self.py_audio = None
+
+
+output = AudioOutput()
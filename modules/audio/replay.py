@@ -0,0 +1,159 @@
+# noinspection PyUnresolvedReferences
+"""Module to replay recorded audio through the wake word detector in place of a live microphone.
+
+>>> Replay
+
+"""
+
+import time
+import wave
+from typing import BinaryIO, Dict, List, NoReturn, Union
+
+import numpy
+from pydantic import FilePath
+
+from modules.exceptions import InvalidArgument
+from modules.logger.custom_logger import logger
+
+
+class WavStream:
+    """Reads one or more WAV files through the same ``read`` interface as ``pyaudio.Stream``.
+
+    >>> WavStream
+
+    See Also:
+        - Audio is served as fast as it is read, so a corpus can be replayed faster than real time.
+        - Files should be 16-bit PCM at the detector's sample rate. Only the first channel is used for stereo files.
+        - An empty ``bytes`` object is returned once all the files have been read.
+    """
+
+    def __init__(self, *sources: Union[FilePath, str, BinaryIO], sample_rate: int = 16_000, silence: float = 0):
+        """Instantiates the stream.
+
+        Args:
+            *sources: Filepaths or file-like objects of the WAV files to be replayed, in order.
+            sample_rate: Sample rate expected by the consumer of the stream.
+            silence: Seconds of silence to be inserted after each file.
+        """
+        self.sources = list(sources)
+        self.sample_rate = sample_rate
+        self.silence = int(silence * sample_rate)
+        self.reader = None
+        self.channels = 1
+        self.padding = 0
+        self.samples = 0
+
+    def _open_next(self) -> bool:
+        """Opens the next WAV file in line.
+
+        Returns:
+            bool:
+            A boolean flag to indicate whether a file was opened.
+
+        Raises:
+            InvalidArgument:
+            If the file is not 16-bit PCM or the sample rate doesn't match.
+        """
+        if not self.sources:
+            return False
+        source = self.sources.pop(0)
+        self.reader = wave.open(source, 'rb')
+        if self.reader.getsampwidth() != 2 or self.reader.getframerate() != self.sample_rate:
+            self.reader.close()
+            raise InvalidArgument(
+                f"{source} should be 16-bit PCM at {self.sample_rate} Hz, received "
+                f"{self.reader.getsampwidth() * 8}-bit at {self.reader.getframerate()} Hz"
+            )
+        self.channels = self.reader.getnchannels()
+        logger.info(f"Replaying {source}")
+        return True
+
+    def read(self, num_frames: int, exception_on_overflow: bool = False) -> bytes:
+        """Reads the next set of frames.
+
+        Args:
+            num_frames: Number of frames (samples) to read.
+            exception_on_overflow: Unused, retained for compatibility with ``pyaudio.Stream.read``.
+
+        Returns:
+            bytes:
+            Raw 16-bit audio data. Shorter than requested at the end of a file and empty at the end of the stream.
+        """
+        while True:
+            if self.padding:
+                size = min(num_frames, self.padding)
+                self.padding -= size
+                self.samples += size
+                return bytes(size * 2)
+            if self.reader:
+                if data := self.reader.readframes(num_frames):
+                    if self.channels > 1:
+                        data = numpy.frombuffer(data, dtype=numpy.int16)[::self.channels].tobytes()
+                    self.samples += len(data) // 2
+                    return data
+                self.reader.close()
+                self.reader = None
+                self.padding = self.silence
+                continue
+            if not self._open_next():
+                return b""
+
+    def is_active(self) -> bool:
+        """Checks if the stream has any audio left to read.
+
+        Returns:
+            bool:
+            A boolean flag to indicate whether the stream is active.
+        """
+        return bool(self.reader or self.padding or self.sources)
+
+    def close(self) -> NoReturn:
+        """Closes the file that is currently being read and discards the rest."""
+        if self.reader:
+            self.reader.close()
+        self.reader = None
+        self.padding = 0
+        self.sources.clear()
+
+
+def benchmark(filenames: List[Union[FilePath, str]], silence: float = 1, full: bool = False) -> Dict[str, float]:
+    """Replays a corpus of WAV files through the ``Activator`` and reports throughput and detections.
+
+    Args:
+        filenames: WAV files to be replayed in order.
+        silence: Seconds of silence inserted after each file.
+        full: Takes a boolean flag to run the listener and initiator upon detection instead of only recording it.
+
+    Returns:
+        dict:
+        Frame count, audio duration, elapsed time, real time factor and the offset (in seconds) of each detection.
+    """
+    from jarvis import Activator
+
+    detections = []
+    activator = Activator(audio_stream=WavStream(*filenames, silence=silence))
+    stream, executor, sample_rate = activator.audio_stream, activator.executor, activator.detector.sample_rate
+
+    def record() -> NoReturn:
+        """Records the position of the detection in the replayed audio."""
+        detections.append(round(stream.samples / sample_rate, 3))
+        if full:
+            executor()
+
+    activator.executor = record
+    start = time.perf_counter()
+    activator.start()
+    elapsed = time.perf_counter() - start
+    frames = activator.frames.stats()["frames"]
+    activator.stop()
+    duration = stream.samples / sample_rate
+    return {"frames": frames, "audio_seconds": round(duration, 3), "elapsed": round(elapsed, 3),
+            "realtime_factor": round(duration / elapsed, 2) if elapsed else 0, "detections": detections}
+
+
+if __name__ == '__main__':
+    import sys
+
+    if not sys.argv[1:]:
+        sys.exit("Usage: python -m modules.audio.replay <file.wav> [<file.wav> ...]")
+    print(benchmark(filenames=sys.argv[1:]))
@@ -4,33 +4,39 @@
 >>> Speaker
 
 """
-import os
+import queue
 import re
 import sys
+import time
+import wave
 from datetime import datetime
-from threading import Thread
-from typing import NoReturn, Union
+from threading import Event, Thread
+from typing import List, NoReturn, Union
 
 import pyttsx3
-import requests
-import yaml
-from playsound import playsound
 
+from modules.audio import playback, speech_synthesis, tts_cache
 from modules.conditions import conversation, keywords
+from modules.conditions.usage import usage
 from modules.logger.custom_logger import logger
 from modules.models import models
-from modules.utils import shared
+from modules.offline import responder
 
 audio_driver = pyttsx3.init()
 
 KEYWORDS = [__keyword for __keyword in dir(keywords) if not __keyword.startswith('__')]
 CONVERSATION = [__conversation for __conversation in dir(conversation) if not __conversation.startswith('__')]
 FUNCTIONS_TO_TRACK = KEYWORDS + CONVERSATION
+PREWARM = ("wake_up1", "wake_up2", "wake_up3", "acknowledgement")
+SENTENCE = re.compile(r'(?<=[.!?])\s+')
 
+audio_cache = tts_cache.AudioCache(directory=models.fileio.speech_synthesis_cache,
+                                   max_bytes=models.env.speech_synthesis_cache * 1024 * 1024)
 
-def speech_synthesizer(text: str, timeout: Union[int, float] = models.env.speech_synthesis_timeout,
-                       quality: str = "high", voice: str = "en-us_northern_english_male-glow_tts") -> bool:
-    """Makes a post call to docker container for speech synthesis.
+
+def synthesize(text: str, timeout: Union[int, float] = models.env.speech_synthesis_timeout,
+               quality: str = "high", voice: str = "en-us_northern_english_male-glow_tts") -> Union[bytes, None]:
+    """Gets the audio for a text from the cache, or makes a post call to docker container for speech synthesis.
 
     Args:
         text: Takes the text that has to be spoken as an argument.
@@ -39,10 +45,9 @@ def speech_synthesizer(text: str, timeout: Union[int, float] = models.env.speech
         voice: Voice for speech synthesis.
 
     Returns:
-        bool:
-        A boolean flag to indicate whether speech synthesis has worked.
+        bytes:
+        Content of the synthesized audio file, ``None`` if speech synthesis has failed.
     """
-    logger.info(f"Request for speech synthesis: {text}")
     if time_in_str := re.findall(r'(\d+:\d+\s?(?:AM|PM|am|pm:?))', text):
         for t_12 in time_in_str:
             t_24 = datetime.strftime(datetime.strptime(t_12, "%I:%M %p"), "%H:%M")
@@ -51,25 +56,101 @@ def speech_synthesizer(text: str, timeout: Union[int, float] = models.env.speech
     if 'IP' in text.split():
         ip_new = '-'.join([i for i in text.split(' ')[-1]]).replace('-.-', ', ')  # 192.168.1.1 -> 1-9-2, 1-6-8, 1, 1
         text = text.replace(text.split(' ')[-1], ip_new).replace(' IP ', ' I.P. ')
-    try:
-        response = requests.post(
-            url=f"http://{models.env.speech_synthesis_host}:{models.env.speech_synthesis_port}/api/tts",
-            headers={"Content-Type": "text/plain"}, params={"voice": voice, "quality": quality}, data=text,
-            verify=False, timeout=timeout
-        )
-        if response.ok:
-            with open(file=models.fileio.speech_synthesis_wav, mode="wb") as file:
-                file.write(response.content)
-            return True
-        logger.error(f"{response.status_code}::"
-                     f"http://{models.env.speech_synthesis_host}:{models.env.speech_synthesis_port}/api/tts")
-        return False
-    except UnicodeError as error:
-        logger.error(error)
-    except (ConnectionError, TimeoutError, requests.exceptions.RequestException, requests.exceptions.Timeout) as error:
-        logger.error(error)
-        logger.info("Disabling speech synthesis")
-        models.env.speech_synthesis_timeout = 0
+    key = tts_cache.cache_key(text=text, voice=voice, quality=quality)
+    if content := audio_cache.get(key=key):
+        logger.info(f"Speech synthesis served from cache: {key}")
+        return content
+    if content := speech_synthesis.client.tts(text=text, timeout=timeout, quality=quality, voice=voice):
+        audio_cache.put(key=key, content=content)
+        return content
+
+
+def split_sentences(text: str, minimum: int = 40) -> List[str]:
+    """Splits a text into sentences, joining the short ones with the sentence that follows.
+
+    Args:
+        text: Text to be split.
+        minimum: Minimum number of characters in a sentence, so that each request for speech synthesis is worthwhile.
+
+    Returns:
+        list:
+        Sentences in the order in which they appear in the text.
+    """
+    sentences, buffer = [], ""
+    for part in SENTENCE.split(text):
+        buffer = f"{buffer} {part}".strip()
+        if len(buffer) >= minimum:
+            sentences.append(buffer)
+            buffer = ""
+    if buffer:
+        sentences.append(buffer)
+    return sentences
+
+
+def stream_synthesis(text: str, depth: int = 2) -> NoReturn:
+    """Synthesizes a text sentence by sentence, and plays each sentence while the next one is being synthesized.
+
+    Args:
+        text: Text to be spoken.
+        depth: Number of synthesized sentences that can be held in memory, waiting to be played.
+
+    See Also:
+        - | If the synthesis of a sentence fails, that sentence and the ones after it are handed to the native
+          | audio driver, so the response is spoken in order.
+    """
+    sentences = split_sentences(text=text)
+    audio = queue.Queue(maxsize=depth)
+    stopped = Event()
+
+    def producer() -> NoReturn:
+        """Synthesizes the sentences in order, until a synthesis fails or the playback is stopped."""
+        for sentence in sentences:
+            content = None
+            if not stopped.is_set() and models.env.speech_synthesis_timeout:
+                try:
+                    content = synthesize(text=sentence, timeout=models.env.speech_synthesis_timeout)
+                except Exception as error:
+                    logger.error(error)
+            audio.put(content)
+            if not content:
+                return
+
+    Thread(target=producer, daemon=True).start()
+    for index, sentence in enumerate(sentences):
+        if content := audio.get():
+            try:
+                playback.output.play(content=content)
+                continue
+            except (OSError, EOFError, wave.Error) as error:
+                logger.error(error)
+        stopped.set()
+        while not audio.empty():  # unblocks the producer if it is waiting for room in the queue
+            audio.get_nowait()
+        logger.warning(f"Speech synthesis failed, speaking {len(sentences) - index} sentence(s) natively.")
+        audio_driver.say(text=" ".join(sentences[index:]))
+        return
+
+
+def prewarm_cache(wait: int = 300) -> NoReturn:
+    """Synthesizes the phrases from the ``conversation`` responses that aren't cached yet.
+
+    Args:
+        wait: Seconds to wait for the docker container to be ready.
+    """
+    for _ in range(wait // 5):
+        if speech_synthesis.client.health_check():
+            break
+        time.sleep(5)
+    else:
+        logger.warning(f"Speech synthesis wasn't ready in {wait}s, skipping pre-warm.")
+        return
+    phrases = [phrase for name in PREWARM for phrase in getattr(conversation, name)]
+    logger.info(f"Pre-warming speech synthesis cache with {len(phrases)} phrases.")
+    for phrase in phrases:
+        if not speech_synthesis.client.available():
+            return
+        synthesize(text=phrase, timeout=max(models.env.speech_synthesis_timeout, len(phrase)))
+    logger.info(f"Speech synthesis cache: {audio_cache.stats()}")
 
 
 def speak(text: str = None, run: bool = False, block: bool = True) -> NoReturn:
@@ -83,47 +164,20 @@ def speak(text: str = None, run: bool = False, block: bool = True) -> NoReturn:
     caller = sys._getframe(1).f_code.co_name  # noqa
     if text:
         text = text.replace('\n', '\t').strip()
-        shared.text_spoken = text
-        if shared.called_by_offline:
-            shared.offline_caller = caller
+        if response := responder.current():
+            response.respond(text=text, caller=caller)
             return
         logger.info(f'Speaker called by: {caller}')
         logger.info(f'Response: {text}')
         sys.stdout.write(f"\r{text}")
-        if models.env.speech_synthesis_timeout and \
-                speech_synthesizer(text=text) and \
-                os.path.isfile(models.fileio.speech_synthesis_wav):
-            playsound(sound=models.fileio.speech_synthesis_wav, block=block)
-            os.remove(models.fileio.speech_synthesis_wav)
+        if models.env.speech_synthesis_timeout:
+            if block:
+                stream_synthesis(text=text)
+            else:
+                Thread(target=stream_synthesis, kwargs={"text": text}, daemon=True).start()
         else:
             audio_driver.say(text=text)
     if run:
         audio_driver.runAndWait()
-    Thread(target=frequently_used, kwargs={"function_name": caller}).start() if caller in FUNCTIONS_TO_TRACK else None
-
-
-def frequently_used(function_name: str) -> NoReturn:
-    """Writes the function called and the number of times into a yaml file.
-
-    Args:
-        function_name: Name of the function that called the speaker.
-
-    See Also:
-        - This function does not have purpose, but to analyze and re-order the conditions' module at a later time.
-    """
-    if os.path.isfile(models.fileio.frequent):
-        try:
-            with open(models.fileio.frequent) as file:
-                data = yaml.load(stream=file, Loader=yaml.FullLoader) or {}
-        except yaml.YAMLError as error:
-            data = {}
-            logger.error(error)
-        if data.get(function_name):
-            data[function_name] += 1
-        else:
-            data[function_name] = 1
-    else:
-        data = {function_name: 1}
-    with open(models.fileio.frequent, 'w') as file:
-        yaml.dump(data={k: v for k, v in sorted(data.items(), key=lambda x: x[1], reverse=True)},
-                  stream=file, sort_keys=False)
+    if caller in FUNCTIONS_TO_TRACK:
+        usage.increment(function_name=caller)
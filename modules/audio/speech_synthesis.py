@@ -7,16 +7,184 @@
 
 import os
 import pathlib
-from typing import NoReturn
+import time
+from threading import Lock, Thread
+from typing import Any, Dict, NoReturn, Union
 
 import docker
 import requests
+from requests.adapters import HTTPAdapter
 
 from executors.port_handler import is_port_in_use, kill_port_pid
 from modules.logger.custom_logger import logger
 from modules.models import models
 
 
+class SynthesisClient:
+    """Long-lived client for the speech synthesis API, guarded by a circuit breaker.
+
+    >>> SynthesisClient
+
+    See Also:
+        - Requests share a session, so the connections to the container are kept alive and reused.
+        - | The session is created on first use within each process, so a forked process never shares the
+          | parent's sockets.
+        - | After ``threshold`` consecutive failures the circuit opens, and requests fail fast without a network call.
+          | Once the cool-down has passed, a health check runs in the background and closes the circuit if the
+          | container responds. The cool-down doubles after every failed health check, up to ``max_cooldown``.
+        - Latency and failure counts are retained for the lifetime of the process.
+    """
+
+    def __init__(self, host: str, port: int, threshold: int = 3, cooldown: int = 15, max_cooldown: int = 300):
+        """Instantiates the client with a closed circuit, without creating the session.
+
+        Args:
+            host: Hostname of the speech synthesis API.
+            port: Port number of the speech synthesis API.
+            threshold: Number of consecutive failures after which the circuit opens.
+            cooldown: Seconds to wait before the first health check after the circuit opens.
+            max_cooldown: Maximum seconds between health checks.
+        """
+        self.url = f"http://{host}:{port}"
+        self.session = None
+        self.pid = None
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.lock = Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.wait = cooldown
+        self.checking = False
+        self.requests = 0
+        self.errors = 0
+        self.trips = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency = None
+
+    def _session(self) -> requests.Session:
+        """Gets the session of the current process, creating one on first use or after a fork.
+
+        Returns:
+            requests.Session:
+            Session with a connection pool for the container.
+        """
+        if self.pid == os.getpid():
+            return self.session
+        with self.lock:
+            if self.pid != os.getpid():
+                self.session = requests.Session()
+                self.session.mount(prefix="http://", adapter=HTTPAdapter(pool_connections=1, pool_maxsize=4))
+                self.checking = False  # a health check running in the parent process doesn't exist in the child
+                self.pid = os.getpid()
+        return self.session
+
+    def available(self) -> bool:
+        """Checks if requests can be made, and starts a health check in the background if the cool-down has passed.
+
+        Returns:
+            bool:
+            A boolean flag to indicate whether the circuit is closed.
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.checking or time.monotonic() - self.opened_at < self.wait:
+                return False
+            self.checking = True
+        Thread(target=self.health_check, daemon=True).start()
+        return False
+
+    def health_check(self) -> bool:
+        """Checks if the container is responding, and closes or re-opens the circuit accordingly.
+
+        Returns:
+            bool:
+            A boolean flag to indicate whether the container is healthy.
+        """
+        try:
+            healthy = self._session().get(url=self.url, timeout=1).ok
+        except requests.exceptions.RequestException as error:
+            logger.debug(error)
+            healthy = False
+        with self.lock:
+            self.checking = False
+            if healthy:
+                if self.opened_at is not None:
+                    logger.info("Speech synthesis has recovered, closing the circuit.")
+                self.failures, self.opened_at, self.wait = 0, None, self.cooldown
+            elif self.opened_at is not None:
+                self.opened_at = time.monotonic()
+                self.wait = min(self.wait * 2, self.max_cooldown)
+        return healthy
+
+    def _failed(self) -> NoReturn:
+        """Records a failure, and opens the circuit after consecutive failures."""
+        with self.lock:
+            self.errors += 1
+            self.failures += 1
+            if self.opened_at is None and self.failures >= self.threshold:
+                self.trips += 1
+                self.opened_at = time.monotonic()
+                logger.warning(f"Speech synthesis failed {self.failures} times in a row, retrying in {self.wait}s.")
+
+    def tts(self, text: str, timeout: Union[int, float], quality: str, voice: str) -> Union[bytes, None]:
+        """Makes a post call to the container for speech synthesis.
+
+        Args:
+            text: Text to be converted to speech.
+            timeout: Time to wait for the container to respond.
+            quality: Quality at which the conversion is to be done.
+            voice: Voice for speech synthesis.
+
+        Returns:
+            bytes:
+            Content of the synthesized audio file, ``None`` if the request has failed or the circuit is open.
+        """
+        if not self.available():
+            return
+        start = time.perf_counter()
+        try:
+            response = self._session().post(url=f"{self.url}/api/tts", headers={"Content-Type": "text/plain"},
+                                            params={"voice": voice, "quality": quality}, data=text, timeout=timeout)
+        except UnicodeError as error:
+            logger.error(error)
+            return
+        except requests.exceptions.RequestException as error:
+            logger.error(error)
+            self._failed()
+            return
+        latency = time.perf_counter() - start
+        with self.lock:
+            self.requests += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            self.last_latency = latency
+        if response.ok:
+            with self.lock:
+                self.failures = 0
+            return response.content
+        logger.error(f"{response.status_code}::{self.url}/api/tts")
+        self._failed()
+
+    def stats(self) -> Dict[str, Any]:
+        """Request statistics and the state of the circuit.
+
+        Returns:
+            dict:
+            A dictionary of counters and latencies.
+        """
+        with self.lock:
+            return {"state": "closed" if self.opened_at is None else "open", "requests": self.requests,
+                    "errors": self.errors, "trips": self.trips, "last_latency": self.last_latency,
+                    "max_latency": self.max_latency,
+                    "avg_latency": self.total_latency / self.requests if self.requests else None}
+
+
+client = SynthesisClient(host=models.env.speech_synthesis_host, port=models.env.speech_synthesis_port)
+
+
 def check_existing() -> bool:
     """Checks for existing connection.
 
@@ -0,0 +1,271 @@
+# noinspection PyUnresolvedReferences
+"""Module for the engines that convert speech to text.
+
+>>> Transcriber
+
+"""
+
+import abc
+import json
+import time
+from threading import Lock
+from typing import Any, Callable, NoReturn, Union
+
+import numpy
+from speech_recognition import AudioData, AudioSource, Recognizer
+
+from modules.logger.custom_logger import logger
+from modules.models import models
+from modules.models.classes import SpeechEngine
+
+recognizer = Recognizer()
+
+
+class Transcriber:
+    """Converts speech to text using Google's speech recognition API.
+
+    >>> Transcriber
+
+    See Also:
+        - This is the default engine, and the one the local engines fall back to when their model can't be loaded.
+    """
+
+    def listen(self, source: AudioSource, timeout: Union[int, float], phrase_limit: Union[int, float],
+               on_captured: Callable[[], Any] = None, on_partial: Callable[[str], Any] = None) -> Union[str, None]:
+        """Listens for a phrase from the source and converts it to text.
+
+        Args:
+            source: Audio source to listen to.
+            timeout: Seconds to wait for a phrase to start.
+            phrase_limit: Maximum seconds a phrase can go on for.
+            on_captured: Function to call once the phrase has been captured.
+            on_partial: Function to call with the partial text, while the phrase is being converted.
+
+        Returns:
+            str:
+            Text converted from the phrase.
+
+        Raises:
+            WaitTimeoutError:
+            If a phrase didn't start within the timeout.
+        """
+        audio = recognizer.listen(source=source, timeout=timeout, phrase_time_limit=phrase_limit)
+        on_captured() if on_captured else None
+        return self.transcribe(audio=audio, on_partial=on_partial)
+
+    def transcribe(self, audio: AudioData, on_partial: Callable[[str], Any] = None) -> Union[str, None]:
+        """Converts recorded audio to text.
+
+        Args:
+            audio: Recorded audio.
+            on_partial: Unused, Google's API doesn't return partial results.
+
+        Returns:
+            str:
+            Text converted from the audio.
+
+        Raises:
+            UnknownValueError:
+            If the speech was unintelligible.
+            RequestError:
+            If the API was unreachable.
+        """
+        return recognizer.recognize_google(audio_data=audio)
+
+
+class LocalTranscriber(Transcriber, abc.ABC):
+    """Base for the engines that run on the local CPU, with a model that is loaded once and retained in memory.
+
+    >>> LocalTranscriber
+
+    """
+
+    def __init__(self, model: str):
+        """Instantiates the engine without loading the model.
+
+        Args:
+            model: Name or path of the model.
+        """
+        self.model_name = model
+        self.model = None
+        self.failed = False
+        self.lock = Lock()
+
+    @abc.abstractmethod
+    def _load(self) -> Any:
+        """Loads the model, implemented by each engine."""
+
+    def load(self) -> bool:
+        """Loads the model if it isn't loaded already.
+
+        Returns:
+            bool:
+            A boolean flag to indicate whether the model is available.
+        """
+        with self.lock:
+            if self.model is None and not self.failed:
+                start = time.perf_counter()
+                try:
+                    self.model = self._load()
+                    logger.info(f"Loaded {self.model_name} in {round(time.perf_counter() - start, 2)}s")
+                except Exception as error:  # missing package or model, falls back to Google's API
+                    logger.error(f"Unable to load {self.model_name}, falling back to Google: {error}")
+                    self.failed = True
+        return self.model is not None
+
+
+class VoskTranscriber(LocalTranscriber):
+    """Converts speech to text using a Vosk model.
+
+    >>> VoskTranscriber
+
+    See Also:
+        - | Listening and recognition happen together: audio is fed to the recognizer as it is read, partial text
+          | is reported as it changes, and the phrase ends as soon as Vosk detects the end of speech.
+    """
+
+    def _load(self) -> Any:
+        """Loads the Vosk model from its directory."""
+        import vosk
+        vosk.SetLogLevel(-1)
+        return vosk.Model(model_path=self.model_name)
+
+    def _recognizer(self, sample_rate: int) -> Any:
+        """Creates a recognizer for a sample rate, recognizers are cheap unlike the model."""
+        import vosk
+        return vosk.KaldiRecognizer(self.model, sample_rate)
+
+    def listen(self, source: AudioSource, timeout: Union[int, float], phrase_limit: Union[int, float],
+               on_captured: Callable[[], Any] = None, on_partial: Callable[[str], Any] = None) -> Union[str, None]:
+        """Listens for a phrase from the source, converting it to text as it is read.
+
+        Args:
+            source: Audio source to listen to.
+            timeout: Seconds to wait for a phrase to start.
+            phrase_limit: Maximum seconds a phrase can go on for.
+            on_captured: Function to call once the phrase has been captured.
+            on_partial: Function to call with the partial text, as it changes.
+
+        Returns:
+            str:
+            Text converted from the phrase, ``None`` if nothing was heard.
+        """
+        if not self.load():
+            return super().listen(source=source, timeout=timeout, phrase_limit=phrase_limit,
+                                  on_captured=on_captured, on_partial=on_partial)
+        kaldi = self._recognizer(sample_rate=source.SAMPLE_RATE)
+        samples, started, partial = 0, None, ""
+        while data := source.stream.read(source.CHUNK):
+            samples += len(data) // source.SAMPLE_WIDTH
+            elapsed = samples / source.SAMPLE_RATE
+            if kaldi.AcceptWaveform(data):
+                if text := json.loads(kaldi.Result()).get("text"):
+                    on_captured() if on_captured else None
+                    return text
+            elif (current := json.loads(kaldi.PartialResult()).get("partial")) and current != partial:
+                partial = current
+                started = started or elapsed
+                on_partial(partial) if on_partial else None
+            if started is None and elapsed > timeout:
+                return
+            if started is not None and elapsed - started > phrase_limit:
+                break
+        on_captured() if on_captured else None
+        return json.loads(kaldi.FinalResult()).get("text") or None
+
+    def transcribe(self, audio: AudioData, on_partial: Callable[[str], Any] = None) -> Union[str, None]:
+        """Converts recorded audio to text.
+
+        Args:
+            audio: Recorded audio.
+            on_partial: Function to call with the partial text, as it changes.
+
+        Returns:
+            str:
+            Text converted from the audio, ``None`` if nothing was recognized.
+        """
+        if not self.load():
+            return super().transcribe(audio=audio, on_partial=on_partial)
+        kaldi = self._recognizer(sample_rate=16_000)
+        data = audio.get_raw_data(convert_rate=16_000, convert_width=2)
+        texts = []
+        for start in range(0, len(data), 8_000):
+            if kaldi.AcceptWaveform(data[start:start + 8_000]):
+                if text := json.loads(kaldi.Result()).get("text"):
+                    texts.append(text)
+            elif on_partial and (partial := json.loads(kaldi.PartialResult()).get("partial")):
+                on_partial(" ".join(texts + [partial]))
+        if text := json.loads(kaldi.FinalResult()).get("text"):
+            texts.append(text)
+        return " ".join(texts) or None
+
+
+class WhisperTranscriber(LocalTranscriber):
+    """Converts speech to text using a Whisper model, with ``faster-whisper`` on the CPU.
+
+    >>> WhisperTranscriber
+
+    See Also:
+        - Whisper converts a phrase once it is captured, partial text is reported as each segment is decoded.
+        - The language is detected from the audio unless one is set, English-only (``.en``) models skip detection.
+    """
+
+    def __init__(self, model: str, language: str = None):
+        """Instantiates the engine without loading the model.
+
+        Args:
+            model: Name or path of the model.
+            language: Code of the language spoken, eg: ``en``. Detected from the audio when ``None``.
+        """
+        super().__init__(model=model)
+        self.language = language
+
+    def _load(self) -> Any:
+        """Loads the Whisper model, quantized to 8-bit integers for the CPU."""
+        from faster_whisper import WhisperModel
+        return WhisperModel(model_size_or_path=self.model_name, device="cpu", compute_type="int8")
+
+    def transcribe(self, audio: AudioData, on_partial: Callable[[str], Any] = None) -> Union[str, None]:
+        """Converts recorded audio to text.
+
+        Args:
+            audio: Recorded audio.
+            on_partial: Function to call with the text decoded so far, after each segment.
+
+        Returns:
+            str:
+            Text converted from the audio, ``None`` if nothing was recognized.
+        """
+        if not self.load():
+            return super().transcribe(audio=audio, on_partial=on_partial)
+        samples = numpy.frombuffer(audio.get_raw_data(convert_rate=16_000, convert_width=2), dtype=numpy.int16)
+        segments, _ = self.model.transcribe(audio=samples.astype(numpy.float32) / 32_768, language=self.language,
+                                            beam_size=1)
+        texts = []
+        for segment in segments:
+            texts.append(segment.text.strip())
+            on_partial(" ".join(texts)) if on_partial else None
+        return " ".join(texts).strip() or None
+
+
+def get_transcriber() -> Transcriber:
+    """Creates the engine chosen with the ``SPEECH_ENGINE`` env var.
+
+    Returns:
+        Transcriber:
+        Engine to convert speech to text.
+    """
+    if models.env.speech_engine == SpeechEngine.VOSK:
+        return VoskTranscriber(model=models.env.speech_model)
+    if models.env.speech_engine == SpeechEngine.WHISPER:
+        return WhisperTranscriber(model=models.env.speech_model or "base.en", language=models.env.speech_language)
+    return Transcriber()
+
+
+def preload() -> NoReturn:
+    """Loads the model of a local engine ahead of the first phrase."""
+    if isinstance(transcriber, LocalTranscriber):
+        transcriber.load()
+
+
+transcriber = get_transcriber()
@@ -0,0 +1,150 @@
+# noinspection PyUnresolvedReferences
+"""Content-addressed cache for the audio generated by speech synthesis.
+
+>>> TTSCache
+
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, NoReturn, Union
+
+from modules.logger.custom_logger import logger
+
+
+def cache_key(text: str, voice: str, quality: str) -> str:
+    """Generates the key for a synthesized audio.
+
+    Args:
+        text: Text that was converted to speech.
+        voice: Voice used for speech synthesis.
+        quality: Quality of the conversion.
+
+    Returns:
+        str:
+        SHA-256 digest of the voice, quality and text.
+    """
+    return hashlib.sha256("\0".join((voice, quality, text)).encode()).hexdigest()
+
+
+class AudioCache:
+    """Stores synthesized audio as files named after their key, evicting the least recently used beyond a size limit.
+
+    >>> AudioCache
+
+    See Also:
+        - | The index is built from the files' modification times at startup, and a hit touches the file, so the
+          | order of use is retained across restarts and is shared (loosely) by the processes that speak.
+        - | Files are written to a temporary name and renamed, so a process never reads a partially written audio.
+          | A file removed by another process is treated as a miss.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        """Loads the index of the existing files.
+
+        Args:
+            directory: Directory in which the audio files are stored.
+            max_bytes: Maximum total size of the audio files, ``0`` disables the cache.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = Lock()
+        self.index: Dict[str, int] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        if not max_bytes:
+            return
+        os.makedirs(directory, exist_ok=True)
+        entries = []
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith('.wav'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self.index[key] = size
+            self.size += size
+        self._evict()
+
+    def _path(self, key: str) -> str:
+        """Path of the audio file for a key."""
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def get(self, key: str) -> Union[bytes, None]:
+        """Gets the audio stored for a key.
+
+        Args:
+            key: Key generated using ``cache_key``.
+
+        Returns:
+            bytes:
+            Content of the audio file, ``None`` if the key isn't cached.
+        """
+        if not self.max_bytes:
+            return
+        try:
+            with open(self._path(key), 'rb') as file:
+                content = file.read()
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            with self.lock:
+                self.misses += 1
+                self.size -= self.index.pop(key, 0)
+            return
+        with self.lock:
+            self.hits += 1
+            if key not in self.index:  # stored by another process
+                self.size += len(content)
+            self.index[key] = len(content)
+            self.index.move_to_end(key)
+        return content
+
+    def put(self, key: str, content: bytes) -> NoReturn:
+        """Stores the audio for a key, and evicts the least recently used files beyond the size limit.
+
+        Args:
+            key: Key generated using ``cache_key``.
+            content: Content of the audio file.
+        """
+        if not self.max_bytes or len(content) > self.max_bytes:
+            return
+        temporary = f"{self._path(key)}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, 'wb') as file:
+                file.write(content)
+            os.replace(temporary, self._path(key))
+        except OSError as error:
+            logger.error(error)
+            return
+        with self.lock:
+            self.size += len(content) - self.index.pop(key, 0)
+            self.index[key] = len(content)
+            self._evict()
+
+    def _evict(self) -> NoReturn:
+        """Removes the least recently used files until the cache is within its size limit."""
+        while self.size > self.max_bytes and self.index:
+            key, size = self.index.popitem(last=False)
+            self.size -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            logger.debug(f"Evicted {key} from speech synthesis cache")
+
+    def __contains__(self, key: str) -> bool:
+        """Checks if a key is cached, without updating its use."""
+        return bool(self.max_bytes) and os.path.isfile(self._path(key))
+
+    def stats(self) -> dict:
+        """Usage statistics of the cache.
+
+        Returns:
+            dict:
+            Number of files, total size, hits and misses.
+        """
+        with self.lock:
+            return {"files": len(self.index), "bytes": self.size, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses}
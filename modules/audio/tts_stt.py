@@ -5,59 +5,182 @@
 
 """
 
+import io
+import itertools
 import os
-import time
-from multiprocessing import Process
-from typing import NoReturn, Union
+import tempfile
+from multiprocessing import Process, Queue
+from queue import Empty
+from threading import Event, Lock, Thread
+from typing import Dict, List, NoReturn, Union
 
 import soundfile
 from pydantic import FilePath
-from speech_recognition import AudioFile, Recognizer, UnknownValueError
+from speech_recognition import AudioFile, UnknownValueError
 
 from modules.audio import voices
+from modules.audio.transcriber import recognizer, transcriber
 from modules.logger.custom_logger import logger
-from modules.utils import shared
-
-recognizer = Recognizer()
 
 audio_driver = voices.voice_default()
 
 
-def _generate_audio_file(filename: Union[FilePath, str], text: str) -> NoReturn:
-    """Generates an audio file from text.
+def _worker(requests: Queue, responses: Queue) -> NoReturn:
+    """Converts the texts received in the requests queue, and puts the audio in the responses queue.
 
     Args:
-        filename: Filename to be generated.
-        text: Text that has to be converted into audio.
-    """
-    logger.info(f"Generating audio into {filename} from the text: {text}")
-    audio_driver.save_to_file(filename=filename, text=text)
-    audio_driver.runAndWait()
+        requests: Queue of request IDs and texts, ``None`` to stop the worker.
+        responses: Queue of request IDs and the content of the WAV files.
 
+    See Also:
+        - | ``runAndWait`` returns only after the file has been written completely, so the file is read without
+          | polling for it. The file is re-encoded as WAV, since the native driver writes AIFF on macOS.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "audio.wav")
+        while request := requests.get():
+            identifier, text = request
+            try:
+                logger.info(f"Generating audio from the text: {text}")
+                audio_driver.save_to_file(filename=filename, text=text)
+                audio_driver.runAndWait()
+                data, samplerate = soundfile.read(file=filename)
+                buffer = io.BytesIO()
+                soundfile.write(file=buffer, data=data, samplerate=samplerate, format='WAV')
+                responses.put((identifier, buffer.getvalue()))
+            except Exception as error:
+                logger.error(error)
+                responses.put((identifier, None))
+
+
+class NativeSynthesizer:
+    """Converts text to audio with the native driver, in a worker process that is started once and kept warm.
+
+    >>> NativeSynthesizer
+
+    See Also:
+        - | Requests are sent to the worker through a queue, and a collector thread hands each response to the caller
+          | that is waiting for it, so concurrent callers are served in order without sharing a file.
+        - A worker that doesn't respond within the timeout is terminated, and a new one is started for the next request.
+        - | Each worker is numbered, and a caller that times out only stops the worker its request was sent to. The
+          | callers still waiting on a stopped worker are woken up with no audio, instead of waiting out the timeout.
+    """
 
-def text_to_audio(text: str, filename: Union[FilePath, str] = None) -> Union[FilePath, str]:
-    """Converts text into an audio file.
+    def __init__(self, timeout: Union[int, float] = 30):
+        """Instantiates the object without starting the worker.
+
+        Args:
+            timeout: Seconds to wait for the worker to convert a text.
+        """
+        self.timeout = timeout
+        self.lock = Lock()
+        self.counter = itertools.count()
+        self.waiting: Dict[int, List[Union[Event, bytes, None]]] = {}
+        self.generation = 0
+        self.process = None
+        self.pid = None
+        self.requests = None
+        self.responses = None
+
+    def _start(self) -> NoReturn:
+        """Starts the worker process and the collector thread."""
+        self.generation += 1
+        self.requests, self.responses = Queue(), Queue()
+        self.process = Process(target=_worker, args=(self.requests, self.responses), name='native-tts', daemon=True)
+        self.process.start()
+        self.pid = os.getpid()
+        Thread(target=self._collect, args=(self.responses, self.generation), name='native-tts-collector',
+               daemon=True).start()
+        logger.info(f"Started native speech synthesis worker with PID {self.process.pid}")
+
+    def _collect(self, responses: Queue, generation: int) -> NoReturn:
+        """Wakes up the callers as their responses are received, until the worker is stopped or replaced.
+
+        Args:
+            responses: Queue of request IDs and the content of the WAV files.
+            generation: Number of the worker that the responses are received from.
+
+        See Also:
+            Nothing is put in the queue to stop the collector, since the terminated worker may hold the queue's lock.
+        """
+        while self.generation == generation and self.process is not None:
+            try:
+                identifier, content = responses.get(timeout=1)
+            except Empty:
+                continue
+            with self.lock:
+                waiter = self.waiting.pop(identifier, None)
+            if waiter:
+                waiter[1] = content
+                waiter[0].set()
+
+    def _release(self) -> NoReturn:
+        """Stops the worker process and the collector thread, and wakes up the callers waiting on them.
+
+        See Also:
+            Called with the lock held.
+        """
+        if self.process and self.pid == os.getpid():  # a worker inherited from the parent process isn't stopped
+            self.process.terminate()
+            self.requests.cancel_join_thread()  # requests that weren't delivered to the worker don't block the exit
+        self.process = None
+        waiting, self.waiting = self.waiting, {}
+        for waiter in waiting.values():
+            waiter[1] = None
+            waiter[0].set()
+
+    def stop(self, generation: int = None) -> NoReturn:
+        """Stops the worker process and the collector thread.
+
+        Args:
+            generation: Number of the worker to be stopped, ``None`` to stop the current worker.
+        """
+        with self.lock:
+            if generation is None or generation == self.generation:
+                self._release()
+
+    def convert(self, text: str, timeout: Union[int, float] = None) -> Union[bytes, None]:
+        """Converts text into audio.
+
+        Args:
+            text: Text that has to be converted to audio.
+            timeout: Seconds to wait for the conversion. Defaults to the timeout of the object.
+
+        Returns:
+            bytes:
+            Content of the WAV file, ``None`` if the conversion has failed or timed out.
+        """
+        waiter = [Event(), None]
+        with self.lock:
+            if not (self.process and self.pid == os.getpid() and self.process.is_alive()):
+                self._release()
+                self._start()
+            generation = self.generation
+            identifier = next(self.counter)
+            self.waiting[identifier] = waiter
+            self.requests.put((identifier, text))
+        if waiter[0].wait(timeout=timeout or self.timeout):
+            return waiter[1]
+        with self.lock:
+            self.waiting.pop(identifier, None)
+        logger.error(f"Native speech synthesis didn't respond in {timeout or self.timeout}s, restarting the worker.")
+        self.stop(generation=generation)
+
+
+native = NativeSynthesizer()
+
+
+def text_to_audio(text: str) -> Union[bytes, None]:
+    """Converts text into audio using the native speech synthesis worker.
 
     Args:
-        filename: Name of the file that has to be generated.
         text: Text that has to be converted to audio.
+
+    Returns:
+        bytes:
+        Content of the WAV file, ``None`` if the conversion has failed.
     """
-    if not filename:
-        if shared.offline_caller:
-            filename = f"{shared.offline_caller}.wav"
-            shared.offline_caller = None  # Reset caller after using it
-        else:
-            filename = f"{int(time.time())}.wav"
-    process = Process(target=_generate_audio_file, kwargs={'filename': filename, 'text': text})
-    process.start()
-    while True:
-        if os.path.isfile(filename) and os.stat(filename).st_size:
-            time.sleep(0.5)
-            break
-    logger.info(f"Generated {filename}")
-    data, samplerate = soundfile.read(file=filename)
-    soundfile.write(file=filename, data=data, samplerate=samplerate)
-    return filename
+    return native.convert(text=text)
 
 
 def audio_to_text(filename: Union[FilePath, str]) -> str:
@@ -75,6 +198,6 @@ def audio_to_text(filename: Union[FilePath, str]) -> str:
         with file as source:
             audio = recognizer.record(source)
         os.remove(filename)
-        return recognizer.recognize_google(audio)
+        return transcriber.transcribe(audio=audio)
     except UnknownValueError:
         logger.error("Unrecognized audio or language.")
@@ -53,7 +53,7 @@ locate_places = ["where is", "where's", "which city", "which state", "which coun
 
 directions = ["take me", "get directions"]
 
-set_alarm = ["alarm", "wake me", "timer"]
+set_alarm = ["alarm", "wake me", "timer", "snooze"]
 
 kill_alarm = ["stop alarm", "stop my alarm", "stop another alarm", "stop an alarm",
               "stop timer", "stop my timer", "stop another timer", "stop an timer",
@@ -0,0 +1,101 @@
+# noinspection PyUnresolvedReferences
+"""Compiles the keyword lists into a single automaton to find every matching condition in one pass over a phrase.
+
+>>> Matcher
+
+"""
+
+from collections import deque
+from types import ModuleType
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+
+def module_groups(*modules: ModuleType) -> Dict[str, List[str]]:
+    """Collects the keyword lists declared in the given modules.
+
+    Args:
+        *modules: Modules with keyword lists as module level variables.
+
+    Returns:
+        dict:
+        A dictionary of variable names and their keyword lists.
+    """
+    groups = {}
+    for module in modules:
+        for name, value in vars(module).items():
+            if name.startswith('_') or not isinstance(value, list):
+                continue
+            if name in groups:
+                raise ValueError(f"{name!r} is declared in more than one keyword module")
+            groups[name] = value
+    return groups
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over groups of keywords.
+
+    >>> KeywordMatcher
+
+    See Also:
+        - A keyword matches when it is a substring of the lower-cased phrase, same as ``word_match``.
+        - | Keywords with uppercase characters can never match a lower-cased phrase, they are retained in the
+          | automaton as is to keep the behavior identical to ``word_match``.
+        - Precedence is left to the caller, ``match`` only reports which groups were found.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        """Builds the trie, failure links and output sets.
+
+        Args:
+            groups: Dictionary of group names and their keywords.
+        """
+        self.groups = tuple(groups)
+        self.transitions: List[Dict[str, int]] = [{}]
+        outputs: List[Set[str]] = [set()]
+        for name, words in groups.items():
+            for word in words:
+                if not word:
+                    continue
+                state = 0
+                for char in word:
+                    if char not in self.transitions[state]:
+                        self.transitions.append({})
+                        outputs.append(set())
+                        self.transitions[state][char] = len(self.transitions) - 1
+                    state = self.transitions[state][char]
+                outputs[state].add(name)
+        self.failure = [0] * len(self.transitions)
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, target in self.transitions[state].items():
+                queue.append(target)
+                fallback = self.failure[state]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.failure[fallback]
+                self.failure[target] = self.transitions[fallback].get(char, 0)
+                outputs[target] |= outputs[self.failure[target]]
+        self.outputs: List[FrozenSet[str]] = [frozenset(output) for output in outputs]
+
+    def match(self, phrase: str) -> Set[str]:
+        """Scans the phrase once and collects every group that has at least one keyword in it.
+
+        Args:
+            phrase: Phrase to be scanned.
+
+        Returns:
+            set:
+            Names of the groups that matched.
+        """
+        matched = set()
+        if not phrase:
+            return matched
+        transitions, failure, outputs = self.transitions, self.failure, self.outputs
+        state = 0
+        for char in phrase.lower():
+            while state and char not in transitions[state]:
+                state = failure[state]
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                matched |= outputs[state]
+        return matched
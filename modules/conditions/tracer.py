@@ -0,0 +1,61 @@
+# noinspection PyUnresolvedReferences
+"""Samples keyword matches into a ring buffer, to inspect how phrases are being routed without debug logging.
+
+>>> Tracer
+
+"""
+
+import random
+import time
+from collections import deque
+from typing import Dict, Iterable, List, NoReturn, Union
+
+from modules.models import models
+
+
+class MatchTracer:
+    """Records a sample of keyword matches in a fixed size ring buffer.
+
+    >>> MatchTracer
+
+    See Also:
+        - Tracing is disabled when ``rate`` is ``0``, call sites should check ``rate`` before calling ``record``.
+        - The buffer is held in memory, so each process only records the matches that occurred within itself.
+    """
+
+    def __init__(self, rate: float, size: int):
+        """Allocates the ring buffer.
+
+        Args:
+            rate: Fraction of matches to be recorded, between 0 and 1.
+            size: Number of recent matches to be retained.
+        """
+        self.rate = rate
+        self.records = deque(maxlen=size)
+        self.sampled = 0
+
+    def record(self, phrase: str, match: Union[str, Iterable[str]], source: str) -> NoReturn:
+        """Records the match if it falls within the sampling rate.
+
+        Args:
+            phrase: Phrase that was matched.
+            match: Keyword or names of the keyword groups that matched.
+            source: Name of the matcher that found the match.
+        """
+        if self.rate < 1 and random.random() >= self.rate:
+            return
+        self.sampled += 1
+        self.records.append({"time": time.time(), "source": source, "phrase": phrase,
+                             "match": match if isinstance(match, str) else sorted(match)})
+
+    def recent(self) -> List[Dict[str, Union[str, float, List[str]]]]:
+        """Lists the recorded matches, oldest first.
+
+        Returns:
+            list:
+            A list of dictionaries with the time, source, phrase and match.
+        """
+        return list(self.records)
+
+
+tracer = MatchTracer(rate=models.env.match_trace_rate, size=models.env.match_trace_size)
@@ -0,0 +1,198 @@
+# noinspection PyUnresolvedReferences
+"""Counts the functions that respond to the user, to analyze and re-order the conditions.
+
+>>> Usage
+
+"""
+
+import os
+import signal
+import time
+from multiprocessing.util import register_after_fork
+from threading import Event, RLock, Thread
+from types import FrameType
+from typing import Dict, List, NoReturn, Union
+
+import yaml
+from pydantic import FilePath
+
+from modules.database import database
+from modules.logger.custom_logger import logger
+from modules.models import models
+
+
+class UsageCounter:
+    """Counts function calls in memory, and adds the counts to a SQLite table periodically.
+
+    >>> UsageCounter
+
+    See Also:
+        - Incrementing a counter only updates a dictionary, so there is no file I/O for each response.
+        - | The pending counts are added to the table in a single transaction, so the counts flushed by multiple
+          | processes are never lost or overwritten.
+        - The flusher thread is started on the first increment within each process.
+        - | Child processes flush their pending counts when they receive ``SIGTERM``, since ``stop_processes``
+          | terminates them without calling ``stop``.
+    """
+
+    def __init__(self, database_file: FilePath, interval: int = 60):
+        """Instantiates the counter.
+
+        Args:
+            database_file: Name of the database file.
+            interval: Seconds between the flushes.
+        """
+        self.database_file = database_file
+        self.interval = interval
+        self.lock = RLock()  # re-entrant, as the SIGTERM handler may interrupt an increment in the main thread
+        self.pending: Dict[str, List[Union[int, float]]] = {}
+        self.stopped = Event()
+        self.pid = None
+        self.db = None
+        register_after_fork(self, UsageCounter._after_fork)
+
+    def _after_fork(self) -> NoReturn:
+        """Installs a ``SIGTERM`` handler to flush the pending counts, called in the main thread of a child process."""
+        previous = signal.getsignal(signal.SIGTERM)
+
+        def terminate(signum: int, frame: FrameType) -> NoReturn:
+            """Flushes the pending counts and hands the signal over to the previous handler."""
+            self.stop()
+            if callable(previous):
+                previous(signum, frame)
+                return
+            signal.signal(signum, signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+
+        signal.signal(signal.SIGTERM, terminate)
+
+    def _attach(self) -> NoReturn:
+        """Opens the database and starts the flusher thread, once per process."""
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.pending = {}  # counts inherited from the parent process are flushed by the parent
+            self.db = database.Database(database=self.database_file)
+            self.db.create_table(table_name="usage", columns=["function TEXT PRIMARY KEY", "count INTEGER NOT NULL",
+                                                              "first_used REAL", "last_used REAL"])
+            self.stopped = Event()
+            self.pid = os.getpid()
+            Thread(target=self._flusher, args=(self.stopped,), name='usage-flusher', daemon=True).start()
+
+    def _flusher(self, stopped: Event) -> NoReturn:
+        """Flushes the pending counts after every interval, until stopped.
+
+        Args:
+            stopped: Event that is set to stop the thread.
+        """
+        while not stopped.wait(timeout=self.interval):
+            self.flush()
+
+    def increment(self, function_name: str) -> NoReturn:
+        """Increments the count of a function.
+
+        Args:
+            function_name: Name of the function.
+        """
+        self._attach()
+        now = time.time()
+        with self.lock:
+            if counts := self.pending.get(function_name):
+                counts[0] += 1
+                counts[2] = now
+            else:
+                self.pending[function_name] = [1, now, now]
+
+    def _write(self, counts: Dict[str, List[Union[int, float]]]) -> bool:
+        """Adds counts to the table in a single transaction.
+
+        Args:
+            counts: A dictionary of function names and their count, first and last usage.
+
+        Returns:
+            bool:
+            A boolean flag to indicate whether the transaction was committed.
+        """
+        try:
+            with self.db.connection:
+                self.db.connection.executemany(
+                    "INSERT INTO usage (function, count, first_used, last_used) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(function) DO UPDATE SET count = count + excluded.count, "
+                    "first_used = COALESCE(MIN(first_used, excluded.first_used), first_used, excluded.first_used), "
+                    "last_used = COALESCE(MAX(last_used, excluded.last_used), last_used, excluded.last_used)",
+                    [(name, *values) for name, values in counts.items()]
+                )
+        except Exception as error:
+            logger.error(f"Unable to flush usage counts: {error}")
+            return False
+        return True
+
+    def flush(self) -> bool:
+        """Adds the pending counts to the table.
+
+        Returns:
+            bool:
+            A boolean flag to indicate whether the pending counts (if any) were committed.
+        """
+        if self.pid != os.getpid():
+            return False
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        if not pending or self._write(counts=pending):
+            return True
+        with self.lock:  # retained for the next flush
+            for name, (count, first_used, last_used) in pending.items():
+                if counts := self.pending.get(name):
+                    counts[0] += count
+                else:
+                    self.pending[name] = [count, first_used, last_used]
+        return False
+
+    def counts(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """Gets the counts of all the functions, including the ones that are yet to be flushed.
+
+        Returns:
+            dict:
+            A dictionary of function names and their count, first and last usage, ordered by the count.
+        """
+        self._attach()
+        self.flush()
+        cursor = self.db.connection.execute(
+            "SELECT function, count, first_used, last_used FROM usage ORDER BY count DESC"
+        )
+        return {name: {"count": count, "first_used": first_used, "last_used": last_used}
+                for name, count, first_used, last_used in cursor.fetchall()}
+
+    def import_yaml(self, filepath: FilePath) -> NoReturn:
+        """Moves the counts stored in the ``frequent.yaml`` file to the table.
+
+        Args:
+            filepath: Path of the yaml file.
+
+        See Also:
+            The file is removed only after its counts are committed, so a failed import is retried on the next start.
+        """
+        if not os.path.isfile(filepath):
+            return
+        try:
+            with open(filepath) as file:
+                data = yaml.load(stream=file, Loader=yaml.FullLoader) or {}
+        except yaml.YAMLError as error:
+            logger.error(f"Unable to import usage counts from {filepath}: {error}")
+            return
+        self._attach()
+        if not self._write(counts={name: [int(count), None, None] for name, count in data.items()}):
+            logger.warning(f"Retaining {filepath} to import the usage counts on the next start")
+            return
+        os.remove(filepath)
+        logger.info(f"Imported usage counts of {len(data)} functions from {filepath}")
+
+    def stop(self) -> NoReturn:
+        """Stops the flusher thread, and flushes the pending counts."""
+        self.stopped.set()
+        self.flush()
+
+
+usage = UsageCounter(database_file=models.fileio.usage)
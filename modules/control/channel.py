@@ -0,0 +1,96 @@
+# noinspection PyUnresolvedReferences
+"""Control channel to deliver stop, restart and wake-up signals between processes.
+
+>>> Channel
+
+"""
+
+import json
+import select
+import socket
+from typing import NoReturn, Tuple, Union
+
+from modules.logger.custom_logger import logger
+from modules.models import models
+
+HOST = socket.gethostbyname('localhost')
+SIGNALS = ("stop", "restart", "wake")
+
+
+class ControlChannel:
+    """Binds a non-blocking datagram socket on the loopback interface to receive control signals.
+
+    >>> ControlChannel
+
+    See Also:
+        - Replaces the ``stopper`` and ``restart`` tables that were polled on every audio frame.
+        - ``receive`` never blocks, so it can be called from the wake word loop without affecting detection.
+    """
+
+    def __init__(self, port: int = models.env.control_port):
+        """Binds the socket to the loopback interface.
+
+        Args:
+            port: Port number on which the control signals are received.
+        """
+        self.socket = socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        self.socket.bind((HOST, port))
+        self.socket.setblocking(False)
+        logger.info(f"Listening for control signals on {HOST}:{port}")
+
+    def wait(self, timeout: Union[float, None]) -> bool:
+        """Blocks until a signal is pending or the timeout expires.
+
+        Args:
+            timeout: Seconds to wait for, ``None`` to wait indefinitely.
+
+        Returns:
+            bool:
+            A boolean flag to indicate whether a signal is ready to be received.
+        """
+        readable, _, _ = select.select([self.socket], [], [], timeout)
+        return bool(readable)
+
+    def receive(self) -> Union[Tuple[str, bool, str], None]:
+        """Reads a single pending signal without blocking.
+
+        Returns:
+            tuple:
+            Returns the signal, flag and caller if a signal was received.
+        """
+        try:
+            payload = self.socket.recv(1024)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as error:  # Windows raises ConnectionResetError for ICMP port unreachable messages
+            logger.error(error)
+            return
+        try:
+            message = json.loads(payload)
+            if message["signal"] in SIGNALS:
+                return message["signal"], message["flag"], message["caller"]
+        except (ValueError, KeyError, TypeError) as error:
+            logger.error(error)
+        logger.warning(f"Ignoring unrecognized control signal: {payload}")
+
+    def close(self) -> NoReturn:
+        """Closes the socket."""
+        self.socket.close()
+
+
+def send_signal(signal: str, caller: str, flag: bool = True, port: int = models.env.control_port) -> NoReturn:
+    """Sends a control signal to the main process, or to the process listening on the given port.
+
+    Args:
+        signal: Name of the signal. Should be one of ``stop``, ``restart`` or ``wake``
+        caller: Name of the function or process that requested the signal.
+        flag: Flag to be sent along with the signal.
+        port: Port number on which the receiving process listens for control signals.
+    """
+    if signal not in SIGNALS:
+        raise ValueError(
+            f"'{signal}' is not a valid control signal. Available signals are: {', '.join(SIGNALS)}"
+        )
+    logger.info(f"Sending {signal} signal on behalf of {caller}")
+    with socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM) as sock:
+        sock.sendto(json.dumps({"signal": signal, "flag": flag, "caller": caller}).encode(), (HOST, port))
@@ -0,0 +1,180 @@
+# noinspection PyUnresolvedReferences
+"""Flags shared across processes, with local reads and change notifications.
+
+>>> State
+
+"""
+
+import json
+import os
+import socket
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, List, NoReturn
+
+import psutil
+from pydantic import FilePath
+
+from modules.control.channel import HOST
+from modules.database import database
+from modules.logger.custom_logger import logger
+from modules.models import models
+
+
+class StateStore:
+    """Key-value store for the flags shared across processes, such as ``guard``, ``party`` and ``vpn``.
+
+    >>> StateStore
+
+    See Also:
+        - Reads are served from a dictionary within the process, without a database round trip.
+        - | Each process that uses the store listens on an ephemeral loopback port, and writers push every change to
+          | the listening processes, which update their dictionary and call the subscribed callbacks.
+        - | Changes are written to the ``state`` table before they are pushed, so a process that starts later (or
+          | missed a notification) loads the current values from the database.
+    """
+
+    def __init__(self, database_file: FilePath):
+        """Instantiates the store, the listener is started when the store is first used in a process.
+
+        Args:
+            database_file: Name of the database file used as a backstop.
+        """
+        self.database_file = database_file
+        self.lock = Lock()
+        self.cache: Dict[str, Any] = {}
+        self.callbacks: Dict[str, List[Callable[[str, Any], None]]] = {}
+        self.pid = None
+        self.db = None
+        self.socket = None
+
+    def _attach(self) -> NoReturn:
+        """Loads the current values and starts listening for changes, once per process."""
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.db = database.Database(database=self.database_file)
+            self.db.create_table(table_name="state", columns=["key TEXT PRIMARY KEY", "value TEXT"])
+            self.db.create_table(table_name="subscribers", columns=["pid INTEGER PRIMARY KEY", "port INTEGER"])
+            self.socket = socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM)
+            self.socket.bind((HOST, 0))
+            with self.db.connection:
+                for (pid,) in self.db.connection.execute("SELECT pid FROM subscribers").fetchall():
+                    if not psutil.pid_exists(pid):
+                        self.db.connection.execute("DELETE FROM subscribers WHERE pid=?", (pid,))
+                self.db.connection.execute("INSERT OR REPLACE INTO subscribers (pid, port) VALUES (?, ?)",
+                                           (os.getpid(), self.socket.getsockname()[1]))
+                rows = self.db.connection.execute("SELECT key, value FROM state").fetchall()
+            self.cache = {key: json.loads(value) for key, value in rows}
+            self.pid = os.getpid()
+            Thread(target=self._listen, args=(self.socket,), name='state-listener', daemon=True).start()
+
+    def _listen(self, sock: socket.socket) -> NoReturn:
+        """Applies the changes pushed by other processes.
+
+        Args:
+            sock: Socket on which the changes are received.
+        """
+        while True:
+            try:
+                payload = sock.recv(65_536)
+            except OSError as error:  # Windows raises ConnectionResetError for ICMP port unreachable messages
+                if sock.fileno() == -1:
+                    return
+                logger.error(error)
+                continue
+            try:
+                message = json.loads(payload)
+                self._apply(key=message["key"], value=message["value"])
+            except (ValueError, KeyError, TypeError) as error:
+                logger.error(f"Ignoring invalid state change: {payload} - {error}")
+
+    def _apply(self, key: str, value: Any) -> NoReturn:
+        """Updates the local value of a key and calls its subscribers.
+
+        Args:
+            key: Name of the flag.
+            value: New value, ``None`` if the flag was removed.
+        """
+        with self.lock:
+            if value is None:
+                self.cache.pop(key, None)
+            else:
+                self.cache[key] = value
+            callbacks = list(self.callbacks.get(key, []))
+        for callback in callbacks:
+            try:
+                callback(key, value)
+            except Exception as error:
+                logger.error(f"State callback for {key} failed: {error}")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Gets the value of a flag.
+
+        Args:
+            key: Name of the flag.
+            default: Value to return if the flag is not set.
+
+        Returns:
+            Any:
+            Value of the flag.
+        """
+        self._attach()
+        return self.cache.get(key, default)
+
+    def set(self, key: str, value: Any) -> NoReturn:
+        """Sets the value of a flag and notifies all the processes that use the store.
+
+        Args:
+            key: Name of the flag.
+            value: JSON serializable value, ``None`` to remove the flag.
+        """
+        self._attach()
+        with self.db.connection:
+            if value is None:
+                self.db.connection.execute("DELETE FROM state WHERE key=?", (key,))
+            else:
+                self.db.connection.execute("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                                           (key, json.dumps(value)))
+            subscribers = self.db.connection.execute("SELECT pid, port FROM subscribers WHERE pid != ?",
+                                                     (os.getpid(),)).fetchall()
+        self._apply(key=key, value=value)
+        payload = json.dumps({"key": key, "value": value}).encode()
+        for pid, port in subscribers:
+            try:
+                self.socket.sendto(payload, (HOST, port))
+            except OSError as error:
+                logger.error(f"Unable to notify process {pid} on port {port}: {error}")
+
+    def delete(self, *keys: str) -> NoReturn:
+        """Removes flags.
+
+        Args:
+            *keys: Names of the flags.
+        """
+        for key in keys:
+            self.set(key=key, value=None)
+
+    def subscribe(self, key: str, callback: Callable[[str, Any], None]) -> NoReturn:
+        """Registers a function to be called in the current process when a flag changes.
+
+        Args:
+            key: Name of the flag.
+            callback: Function that takes the name and the new value of the flag.
+        """
+        self._attach()
+        with self.lock:
+            self.callbacks.setdefault(key, []).append(callback)
+
+    def close(self) -> NoReturn:
+        """Stops listening for changes in the current process."""
+        if self.pid != os.getpid():
+            return
+        with self.db.connection:
+            self.db.connection.execute("DELETE FROM subscribers WHERE pid=?", (os.getpid(),))
+        self.socket.close()
+        self.pid = None
+
+
+state = StateStore(database_file=models.fileio.base_db)
@@ -1,6 +1,6 @@
 import calendar
 import datetime
-from typing import Tuple, Union
+from typing import Iterator, List, Tuple, Union
 
 from modules.exceptions import InvalidArgument
 
@@ -10,9 +10,13 @@ class CronExpression:
 
     >>> CronExpression
 
+    See Also:
+        - | Static values of each field are compiled into a bitmask, while the ``L``, ``W``, ``#`` and ``%`` atoms are
+          | kept aside and evaluated only for the dates they depend on.
+        - ``next_run`` skips months, days and hours that cannot match, instead of checking every minute.
     """
 
-    DAY_NAMES = zip(('sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat'), range(7))
+    DAY_NAMES = tuple(zip(('sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat'), range(7)))
     MINUTES = (0, 59)
     HOURS = (0, 23)
     DAYS_OF_MONTH = (1, 31)
@@ -20,8 +24,8 @@ class CronExpression:
     DAYS_OF_WEEK = (0, 6)
     L_FIELDS = (DAYS_OF_WEEK, DAYS_OF_MONTH)
     FIELD_RANGES = (MINUTES, HOURS, DAYS_OF_MONTH, MONTHS, DAYS_OF_WEEK)
-    MONTH_NAMES = zip(('jan', 'feb', 'mar', 'apr', 'may', 'jun',
-                       'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), range(1, 13))
+    MONTH_NAMES = tuple(zip(('jan', 'feb', 'mar', 'apr', 'may', 'jun',
+                             'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), range(1, 13)))
     DEFAULT_EPOCH = (1970, 1, 1, 0, 0, 0)
     SUBSTITUTIONS = {
         "@yearly": "0 0 1 1 *",
@@ -42,6 +46,8 @@ class CronExpression:
                 - The epoch should be defined down to the minute sorted by descending significance.
         """
         self.numerical_tab = []
+        self.masks: List[int] = []
+        self.dynamic: List[List[str]] = []
         for key, value in self.SUBSTITUTIONS.items():
             if line.startswith(key):
                 line = line.replace(key, value)
@@ -104,6 +110,7 @@ class CronExpression:
             This method should only be called by the user if the string_tab member is modified.
         """
         self.numerical_tab = []
+        self.dynamic = []
 
         for field_str, span in zip(self.string_tab, self.FIELD_RANGES):
             split_field_str = field_str.split(',')
@@ -113,19 +120,24 @@ class CronExpression:
                 )
 
             unified = set()
+            dynamic = []
             for cron_atom in split_field_str:
                 # parse_atom only handles static cases
                 for special_char in ('%', '#', 'L', 'W'):
                     if special_char in cron_atom:
+                        dynamic.append(cron_atom)
                         break
                 else:
                     unified.update(parse_atom(cron_atom, span))
 
             self.numerical_tab.append(unified)
+            self.dynamic.append(dynamic)
 
         if self.string_tab[2] == "*" and self.string_tab[4] != "*":
             self.numerical_tab[2] = set()
 
+        self.masks = [sum(1 << value for value in unified) for unified in self.numerical_tab]
+
     def check_trigger(self, date_tuple: Union[Tuple[int, int, int, int, int], Tuple[int, ...]] = None,
                       utc_offset: int = 0) -> bool:
         """Returns boolean indicating if the trigger is active at the given time.
@@ -148,91 +160,199 @@ class CronExpression:
         else:
             year, month, day, hour, mins = tuple(map(int, datetime.datetime.now().strftime("%Y %m %d %H %M").split()))
         given_date = datetime.date(year, month, day)
-        zeroday = datetime.date(*self.epoch[:3])
-        last_dom = calendar.monthrange(year, month)[-1]
-        dom_matched = True
+        if not self.match_date(given_date=given_date):
+            return False
+        delta_hrs = self._delta_hours(given_date=given_date, hour=hour, utc_offset=utc_offset)
+        return self._match_field(index=1, value=hour, delta_t=delta_hrs) and \
+            self._match_field(index=0, value=mins, delta_t=mins - self.epoch[4] + delta_hrs * 60)
 
-        # In calendar and datetime.date.weekday, Monday = 0
-        given_dow = (datetime.date.weekday(given_date) + 1) % 7
-        first_dow = (given_dow + 1 - day) % 7
+    def _delta_hours(self, given_date: datetime.date, hour: int, utc_offset: int) -> int:
+        """Number of hours that have passed from the epoch to the given hour, used for periodicities."""
+        return hour - self.epoch[3] + (given_date - datetime.date(*self.epoch[:3])).days * 24 + \
+            utc_offset - self.epoch[5]
 
-        # Figure out how much time has passed from the epoch to the given date
-        utc_diff = utc_offset - self.epoch[5]
-        mod_delta_yrs = year - self.epoch[0]
-        mod_delta_mon = month - self.epoch[1] + mod_delta_yrs * 12
-        mod_delta_day = (given_date - zeroday).days
-        mod_delta_hrs = hour - self.epoch[3] + mod_delta_day * 24 + utc_diff
-        mod_delta_min = mins - self.epoch[4] + mod_delta_hrs * 60
-
-        # Makes iterating through like components easier.
-        quintuple = zip((mins, hour, day, month, given_dow), self.numerical_tab, self.string_tab,
-                        (mod_delta_min, mod_delta_hrs, mod_delta_day, mod_delta_mon, mod_delta_day),
-                        self.FIELD_RANGES)
-
-        for value, valid_values, field_str, delta_t, field_type in quintuple:
-            # All valid, static values for the fields are stored in sets
-            if value in valid_values:
-                continue
+    def _match_field(self, index: int, value: int, delta_t: int, day: int = None,
+                     first_dow: int = None, last_dom: int = None) -> bool:
+        """Checks if a value matches a field, either using the bitmask or the context sensitive atoms.
 
-            # The following for loop implements the logic for context
-            # sensitive and epoch sensitive constraints. break statements,
-            # which are executed when a match is found, lead to a continue
-            # in the outer loop. If there are no matches found, the given date
-            # does not match expression constraints, so the function returns
-            # False as seen at the end of this for...else... construct.
-            for cron_atom in field_str.split(','):
-                if cron_atom[0] == '%':
-                    if not (delta_t % int(cron_atom[1:])):
-                        break
+        Args:
+            index: Index of the field in the expression.
+            value: Value to be checked.
+            delta_t: Time passed from the epoch, in the unit of the field.
+            day: Day of the month, required for day of month and day of week fields.
+            first_dow: Day of week of the first day of the month, with Sunday = 0.
+            last_dom: Last day of the month.
 
-                elif field_type == self.DAYS_OF_WEEK and '#' in cron_atom:
-                    d, n = int(cron_atom[0]), int(cron_atom[2])
-                    # Computes Nth occurence of D day of the week
-                    if (((d - first_dow) % 7) + 1 + 7 * (n - 1)) == day:
-                        break
+        Returns:
+            bool:
+            A boolean flag to indicate whether the value matches the field.
+        """
+        if self.masks[index] >> value & 1:
+            return True
+
+        field_type = self.FIELD_RANGES[index]
+        # Implements the logic for context sensitive and epoch sensitive constraints, which can't be compiled.
+        for cron_atom in self.dynamic[index]:
+            if cron_atom[0] == '%':
+                if not (delta_t % int(cron_atom[1:])):
+                    return True
+
+            elif field_type == self.DAYS_OF_WEEK and '#' in cron_atom:
+                d, n = int(cron_atom[0]), int(cron_atom[2])
+                # Computes Nth occurence of D day of the week
+                if (((d - first_dow) % 7) + 1 + 7 * (n - 1)) == day:
+                    return True
+
+            elif field_type == self.DAYS_OF_MONTH and cron_atom[-1] == 'W':
+                target = min(int(cron_atom[:-1]), last_dom)
+                lands_on = (first_dow + target - 1) % 7
+                if lands_on == 0:
+                    # Shift from Sun. to Mon. unless Mon. is next month
+                    target += 1 if target < last_dom else -2
+                elif lands_on == 6:
+                    # Shift from Sat. to Fri. unless Fri. in prior month
+                    target += -1 if target > 1 else 2
+
+                # Match if the day is correct, and target is a weekday
+                if target == day and (first_dow + target - 7) % 7 > 1:
+                    return True
+
+            elif field_type in self.L_FIELDS and cron_atom.endswith('L'):
+                # In dom field, L means the last day of the month
+                target = last_dom
+
+                if field_type == self.DAYS_OF_WEEK:
+                    # Calculates the last occurence of given day of week
+                    desired_dow = int(cron_atom[:-1])
+                    target = (((desired_dow - first_dow) % 7) + 29)
+                    target -= 7 if target > last_dom else 0
+
+                if target == day:
+                    return True
+        return False
+
+    def match_month(self, given_date: datetime.date) -> bool:
+        """Checks if the month of a date matches the expression.
 
-                elif field_type == self.DAYS_OF_MONTH and cron_atom[-1] == 'W':
-                    target = min(int(cron_atom[:-1]), last_dom)
-                    lands_on = (first_dow + target - 1) % 7
-                    if lands_on == 0:
-                        # Shift from Sun. to Mon. unless Mon. is next month
-                        target += 1 if target < last_dom else -2
-                    elif lands_on == 6:
-                        # Shift from Sat. to Fri. unless Fri. in prior month
-                        target += -1 if target > 1 else 2
-
-                    # Break if the day is correct, and target is a weekday
-                    if target == day and (first_dow + target - 7) % 7 > 1:
-                        break
+        Args:
+            given_date: Date to be checked.
 
-                elif field_type in self.L_FIELDS and cron_atom.endswith('L'):
-                    # In dom field, L means the last day of the month
-                    target = last_dom
+        Returns:
+            bool:
+            A boolean flag to indicate whether the month matches.
+        """
+        delta_mon = given_date.month - self.epoch[1] + (given_date.year - self.epoch[0]) * 12
+        return self._match_field(index=3, value=given_date.month, delta_t=delta_mon)
 
-                    if field_type == self.DAYS_OF_WEEK:
-                        # Calculates the last occurence of given day of week
-                        desired_dow = int(cron_atom[:-1])
-                        target = (((desired_dow - first_dow) % 7) + 29)
-                        target -= 7 if target > last_dom else 0
+    def match_date(self, given_date: datetime.date) -> bool:
+        """Checks if a date matches the day of month, month and day of week fields of the expression.
 
-                    if target == day:
-                        break
-            else:
-                # See 2010.11.15 of CHANGELOG
-                if field_type == self.DAYS_OF_MONTH and self.string_tab[4] != '*':
-                    dom_matched = False
-                    continue
-                elif field_type == self.DAYS_OF_WEEK and self.string_tab[2] != '*':
-                    # If we got here, then days of months validated so it does
-                    # not matter that days of the week failed.
-                    return dom_matched
+        Args:
+            given_date: Date to be checked.
 
-                # None of the expressions matched which means this field fails
-                return False
+        See Also:
+            - | When both day of month and day of week are restricted, the date matches if either of them does.
+              | See 2010.11.15 of CHANGELOG
 
-        # Arriving at this point means the date landed within the constraints
-        # of all fields; the associated trigger should be fired.
-        return True
+        Returns:
+            bool:
+            A boolean flag to indicate whether the date matches.
+        """
+        if not self.match_month(given_date=given_date):
+            return False
+        day = given_date.day
+        last_dom = calendar.monthrange(given_date.year, given_date.month)[-1]
+        # In calendar and datetime.date.weekday, Monday = 0
+        given_dow = (given_date.weekday() + 1) % 7
+        first_dow = (given_dow + 1 - day) % 7
+        delta_day = (given_date - datetime.date(*self.epoch[:3])).days
+        dom_matched = self._match_field(index=2, value=day, delta_t=delta_day, day=day,
+                                        first_dow=first_dow, last_dom=last_dom)
+        if dom_matched and self.string_tab[2] != '*' and self.string_tab[4] != '*':
+            return True
+        if not dom_matched and self.string_tab[4] == '*':
+            return False
+        return self._match_field(index=4, value=given_dow, delta_t=delta_day, day=day,
+                                 first_dow=first_dow, last_dom=last_dom)
+
+    def _allowed(self, index: int, span: int, delta_t: int) -> int:
+        """Bitmask of the values that match a minutes or hours field, including the periodicities.
+
+        Args:
+            index: Index of the field in the expression.
+            span: Number of values in the field.
+            delta_t: Time passed from the epoch to the first value of the field.
+
+        Returns:
+            int:
+            Bitmask of the matching values.
+        """
+        mask = self.masks[index]
+        if self.dynamic[index]:
+            for value in range(span):
+                if not mask >> value & 1 and self._match_field(index=index, value=value, delta_t=delta_t + value):
+                    mask |= 1 << value
+        return mask
+
+    def _search(self, start: datetime.datetime, until: datetime.date,
+                utc_offset: int) -> Union[datetime.datetime, None]:
+        """Finds the first minute matching the expression, starting from (and including) the given minute."""
+        given_date = start.date()
+        while given_date <= until:
+            if not self.match_month(given_date=given_date):
+                # Jump to the first day of the next month
+                given_date = (given_date.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+                continue
+            if self.match_date(given_date=given_date):
+                first_hour = start.hour if given_date == start.date() else 0
+                midnight = self._delta_hours(given_date=given_date, hour=0, utc_offset=utc_offset)
+                hours = self._allowed(index=1, span=24, delta_t=midnight) >> first_hour << first_hour
+                while hours:
+                    hour = (hours & -hours).bit_length() - 1
+                    hours &= hours - 1
+                    first_minute = start.minute if given_date == start.date() and hour == start.hour else 0
+                    minutes = self._allowed(index=0, span=60, delta_t=(midnight + hour) * 60 - self.epoch[4])
+                    if minutes := minutes >> first_minute << first_minute:
+                        return datetime.datetime.combine(given_date, datetime.time(hour=hour)) + \
+                            datetime.timedelta(minutes=(minutes & -minutes).bit_length() - 1)
+            given_date += datetime.timedelta(days=1)
+
+    def next_run(self, after: datetime.datetime = None, utc_offset: int = 0,
+                 years: int = 28) -> Union[datetime.datetime, None]:
+        """Gets the next time the trigger will be active.
+
+        Args:
+            after: Datetime after which the next run should be found. Defaults to current time.
+            utc_offset: UTC offset, required only when periodicities are used in the hours and minutes fields.
+            years: Number of years to search for, as the calendar repeats itself every 28 years.
+
+        Returns:
+            datetime:
+            Start of the first minute after the given datetime that matches the expression, ``None`` if there is none.
+        """
+        start = (after or datetime.datetime.now()).replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        return self._search(start=start, until=start.date() + datetime.timedelta(days=366 * years),
+                            utc_offset=utc_offset)
+
+    def iter_runs(self, start: datetime.datetime, end: datetime.datetime,
+                  utc_offset: int = 0) -> Iterator[datetime.datetime]:
+        """Iterates through all the times the trigger will be active within a time range.
+
+        Args:
+            start: Start of the range, inclusive to the minute.
+            end: End of the range, inclusive.
+            utc_offset: UTC offset, required only when periodicities are used in the hours and minutes fields.
+
+        Yields:
+            datetime:
+            Start of each minute within the range that matches the expression.
+        """
+        current = start.replace(second=0, microsecond=0)
+        if current < start:
+            current += datetime.timedelta(minutes=1)
+        while (current := self._search(start=current, until=end.date(), utc_offset=utc_offset)) and current <= end:
+            yield current
+            current += datetime.timedelta(minutes=1)
 
 
 def parse_atom(parse: str, minmax: tuple) -> set:
@@ -309,3 +429,4 @@ if __name__ == '__main__':
 
     print(job.check_trigger((2022, 7, 27, 0, 0)))
     print(job.check_trigger((2022, 7, 26, 0, 0)))
+    print(job.next_run(datetime.datetime(2022, 7, 26, 0, 0)))
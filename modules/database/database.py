@@ -3,30 +3,178 @@ import logging
 import os
 import random
 import sqlite3
-from typing import NoReturn, Union
+import time
+from threading import Lock, RLock, local
+from typing import Dict, List, NoReturn, Tuple, Union
 
 from pydantic import FilePath
 
 
+class Writer:
+    """Serializes the transactions on a database file within a process, and records the contention.
+
+    >>> Writer
+
+    See Also:
+        - SQLite allows a single writer at a time, so writers within a process queue up here instead of busy-waiting.
+        - The lock is reentrant, so a thread can nest transactions on the same database file.
+    """
+
+    def __init__(self):
+        """Instantiates the lock and its counters."""
+        self.lock = RLock()
+        self.transactions = 0
+        self.contended = 0
+        self.lock_wait = 0.0
+        self.max_lock_wait = 0.0
+        self.busy_errors = 0
+
+    def acquire(self) -> NoReturn:
+        """Acquires the lock, recording how long it took if it was held by another thread."""
+        if self.lock.acquire(blocking=False):
+            self.transactions += 1
+            return
+        start = time.perf_counter()
+        self.lock.acquire()
+        waited = time.perf_counter() - start
+        self.transactions += 1
+        self.contended += 1
+        self.lock_wait += waited
+        self.max_lock_wait = max(self.max_lock_wait, waited)
+
+    def release(self, error: BaseException = None) -> NoReturn:
+        """Releases the lock, counting the transactions that failed as the database was locked by another process.
+
+        Args:
+            error: Exception raised within the transaction.
+        """
+        if isinstance(error, sqlite3.OperationalError) and 'locked' in str(error):
+            self.busy_errors += 1
+        self.lock.release()
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Contention metrics of the database file.
+
+        Returns:
+            dict:
+            Number of transactions, how many waited for the lock and for how long, and busy errors.
+        """
+        return {"transactions": self.transactions, "contended": self.contended, "lock_wait": self.lock_wait,
+                "max_lock_wait": self.max_lock_wait, "busy_errors": self.busy_errors}
+
+
+_writers: Dict[Tuple[int, str], Writer] = {}
+_writers_lock = Lock()
+
+
+def writer(database: str) -> Writer:
+    """Gets the writer lock of a database file for the current process.
+
+    Args:
+        database: Name of the database file.
+
+    Returns:
+        Writer:
+        Writer lock shared by all the connections to the database file within the process.
+    """
+    key = (os.getpid(), os.path.realpath(database))
+    with _writers_lock:
+        if key not in _writers:
+            _writers[key] = Writer()
+        return _writers[key]
+
+
+def stats() -> Dict[str, Dict[str, Union[int, float]]]:
+    """Contention metrics of all the database files used in the current process.
+
+    Returns:
+        dict:
+        A dictionary of database files and their metrics.
+    """
+    with _writers_lock:
+        return {path: lock.stats() for (pid, path), lock in _writers.items() if pid == os.getpid()}
+
+
+class Connection(sqlite3.Connection):
+    """SQLite connection whose transactions (``with connection:``) are serialized within the process.
+
+    >>> Connection
+
+    """
+
+    writer: Writer = None
+
+    def __enter__(self) -> "Connection":
+        """Acquires the writer lock before the transaction begins."""
+        self.writer.acquire()
+        return super().__enter__()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        """Commits or rolls back the transaction and releases the writer lock."""
+        try:
+            return super().__exit__(exc_type, exc_val, exc_tb)
+        finally:
+            self.writer.release(error=exc_val)
+
+
 class Database:
     """Creates a connection to the base DB.
 
     >>> Database
 
+    See Also:
+        - | The database runs in WAL mode with ``synchronous=NORMAL``, so readers don't block the writer and commits
+          | don't wait for a disk sync.
+        - | Each thread (and each process) gets its own connection, which is opened when first used.
+          | Prepared statements are cached per connection.
+        - | Write transactions begin immediately, so a writer waits for the busy timeout instead of failing when it
+          | upgrades a read lock, and transactions are serialized within the process.
     """
 
-    def __init__(self, database: Union[FilePath, str], timeout: int = 10):
-        """Instantiates the class ``Database`` to create a connection and a cursor.
+    def __init__(self, database: Union[FilePath, str], timeout: int = 10, cached_statements: int = 256):
+        """Instantiates the class ``Database`` and switches the database to WAL mode.
 
         Args:
             database: Name of the database file.
             timeout: Timeout for the connection to database.
+            cached_statements: Number of prepared statements cached for each connection.
         """
         if not database.endswith('.db'):
             database = database + '.db'
-        self.connection = sqlite3.connect(database=database, check_same_thread=False, timeout=timeout)
+        self.database = database
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self._local = local()
+        self.connection.execute("PRAGMA journal_mode=WAL")
+
+    @property
+    def connection(self) -> Connection:
+        """Connection to the database for the current thread.
+
+        Returns:
+            Connection:
+            A connection that is created for the thread when first used, or after the process was forked.
+        """
+        if getattr(self._local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(database=self.database, timeout=self.timeout, factory=Connection,
+                                         cached_statements=self.cached_statements, isolation_level='IMMEDIATE',
+                                         check_same_thread=False)
+            connection.writer = writer(database=self.database)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Contention metrics of the database file in the current process.
+
+        Returns:
+            dict:
+            Number of transactions, how many waited for the lock and for how long, and busy errors.
+        """
+        return writer(database=self.database).stats()
 
-    def create_table(self, table_name: str, columns: list[str]) -> NoReturn:
+    def create_table(self, table_name: str, columns: List[str]) -> NoReturn:
         """Creates the table with the required columns.
 
         Args:
@@ -10,7 +10,7 @@ from pydantic import FilePath
 from modules.exceptions import CameraError
 from modules.logger.custom_logger import logger
 from modules.models import models
-from modules.utils import shared
+from modules.offline import responder
 
 
 def verify_image(filename: Union[str, FilePath]) -> bool:
@@ -166,5 +166,5 @@ class FaceNet:
         ignore, image = self.validation_video.read()
         cv2.imwrite(filename=filename, img=image)
         self.validation_video.release()
-        if display and not shared.called_by_offline:
+        if display and not responder.called_by_offline():
             cv2.imshow('Snap', image)
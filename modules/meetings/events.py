@@ -12,8 +12,9 @@ from modules.audio import speaker
 from modules.database import database
 from modules.logger.custom_logger import logger
 from modules.models import models
+from modules.offline import responder
 from modules.retry import retry
-from modules.utils import shared, support
+from modules.utils import support
 
 db = database.Database(database=models.fileio.base_db)
 
@@ -25,13 +26,12 @@ def events_writer() -> NoReturn:
     This function runs in a dedicated process to avoid wait time when events information is requested.
     """
     info = events_gatherer()
-    query = f"INSERT OR REPLACE INTO {models.env.event_app} (info, date) VALUES " \
-            f"{(info, datetime.now().strftime('%Y_%m_%d'))}"
+    query = f"INSERT OR REPLACE INTO {models.env.event_app} (info, date) VALUES (?, ?)"
     with db.connection:
         cursor = db.connection.cursor()
         cursor.execute(f"DELETE FROM {models.env.event_app}")
         cursor.connection.commit()
-        cursor.execute(query)
+        cursor.execute(query, (info, datetime.now().strftime('%Y_%m_%d')))
         cursor.connection.commit()
     return
 
@@ -123,7 +123,7 @@ def events() -> None:
                        f"({datetime.now().strftime('%Y_%m_%d')})")
         speaker.speak(text=f"Events table is outdated {models.env.title}. Please try again in a minute or two.")
     else:
-        if shared.called_by_offline:
+        if responder.called_by_offline():
             Process(target=events_writer).start()
             speaker.speak(text=f"Events table is empty {models.env.title}. Please try again in a minute or two.")
             return
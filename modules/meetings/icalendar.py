@@ -1,10 +1,14 @@
+import hashlib
+import json
+import os
 import sqlite3
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
+from http import HTTPStatus
 from multiprocessing import Process
 from multiprocessing.context import TimeoutError as ThreadTimeoutError
 from multiprocessing.pool import ThreadPool
-from typing import NoReturn
+from typing import Dict, List, NoReturn, Union
 
 import requests
 from ics import Calendar
@@ -13,8 +17,8 @@ from modules.audio import speaker
 from modules.database import database
 from modules.logger.custom_logger import logger
 from modules.models import models
+from modules.offline import responder
 from modules.retry import retry
-from modules.utils import shared
 
 db = database.Database(database=models.fileio.base_db)
 
@@ -30,14 +34,90 @@ def meetings_writer() -> NoReturn:
         cursor = db.connection.cursor()
         cursor.execute("DELETE FROM ics")
         cursor.connection.commit()
-        cursor.execute(f"INSERT OR REPLACE INTO ics (info, date) VALUES {(info, datetime.now().strftime('%Y_%m_%d'))}")
+        cursor.execute("INSERT OR REPLACE INTO ics (info, date) VALUES (?, ?)",
+                       (info, datetime.now().strftime('%Y_%m_%d')))
         cursor.connection.commit()
     return
 
 
+def load_cache() -> Dict[str, Union[str, int, List[Dict[str, Union[str, float, bool]]]]]:
+    """Loads the events parsed during the previous sync, along with the validators of the ICS feed.
+
+    Returns:
+        dict:
+        Cached feed information, an empty dictionary if there is no cache for the current ICS URL.
+    """
+    try:
+        with open(models.fileio.ics_cache) as file:
+            cache = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return cache if cache.get('url') == models.env.ics_url else {}
+
+
+def save_cache(cache: Dict[str, Union[str, int, List[Dict[str, Union[str, float, bool]]]]]) -> NoReturn:
+    """Writes the cache to a temporary file and swaps it in, so that readers never see a partial file.
+
+    Args:
+        cache: Feed information to be stored.
+    """
+    tmp_file = models.fileio.ics_cache + '.tmp'
+    with open(tmp_file, 'w') as file:
+        json.dump(cache, file)
+    os.replace(tmp_file, models.fileio.ics_cache)
+
+
+def last_status() -> Union[int, None]:
+    """Gets the status code of the last request made to the ICS URL.
+
+    Returns:
+        int:
+        HTTP status code, ``None`` if the URL was never reached.
+    """
+    return load_cache().get('status')
+
+
+def parse_events(text: str) -> List[Dict[str, Union[str, float, bool]]]:
+    """Parses the ICS feed into a list of events sorted by their start time.
+
+    Args:
+        text: Content of the ICS feed.
+
+    Returns:
+        list:
+        List of events with name, start time as ISO string and epoch, end time as epoch, and all day flag.
+    """
+    start = time.perf_counter()
+    events = [{"name": event.name, "begin": event.begin.isoformat(), "start": event.begin.float_timestamp,
+               "end": event.end.float_timestamp, "all_day": event.all_day} for event in Calendar(text).events]
+    logger.info(f"Parsed {len(events)} events in {round(time.perf_counter() - start, 2)}s")
+    return sorted(events, key=lambda event: event['start'])
+
+
+def todays_events(events: List[Dict[str, Union[str, float, bool]]]) -> List[Dict[str, Union[str, float, bool]]]:
+    """Extracts the events that overlap with the current day.
+
+    Args:
+        events: List of events sorted by their start time.
+
+    Returns:
+        list:
+        Events that are happening today.
+    """
+    midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    day_start, day_end = midnight.timestamp(), (midnight + timedelta(days=1)).timestamp()
+    return [event for event in events if event['start'] < day_end and event['end'] > day_start]
+
+
 def meetings_gatherer() -> str:
     """Gets ICS data and converts into a statement.
 
+    See Also:
+        - | The ICS URL is requested with the ``ETag`` and ``Last-Modified`` values of the previous response, so an
+          | unchanged feed is neither downloaded nor parsed again.
+        - | Parsed events are cached in a file, along with a digest of the feed for servers that don't support
+          | conditional requests.
+
     Returns:
         str:
         - On success, returns a message saying which event is scheduled at what time.
@@ -46,29 +126,49 @@ def meetings_gatherer() -> str:
     """
     if not models.env.ics_url:
         return f"I wasn't given a calendar URL to look up your meetings {models.env.title}!"
+    cache = load_cache()
+    headers = {}
+    if cache.get('etag'):
+        headers['If-None-Match'] = cache['etag']
+    if cache.get('last_modified'):
+        headers['If-Modified-Since'] = cache['last_modified']
     try:
-        response = requests.get(url=models.env.ics_url)
+        response = requests.get(url=models.env.ics_url, headers=headers)
     except (ConnectionError, TimeoutError, requests.exceptions.RequestException, requests.exceptions.Timeout) as error:
         logger.error(error)
         return f"I was unable to connect to the internet {models.env.title}! Please check your connection."
-    if not response.ok:
+    if response.status_code == HTTPStatus.NOT_MODIFIED.real and 'events' in cache:
+        logger.info("ICS feed has not been modified since the last sync.")
+        events = cache['events']
+    elif not response.ok:
         logger.error(response.status_code)
+        save_cache({**cache, 'url': models.env.ics_url, 'status': response.status_code})
         return "I wasn't able to read your calendar schedule sir! Please check the shared URL."
-    calendar = Calendar(response.text)
-    events = list(calendar.timeline.today())
+    else:
+        digest = hashlib.sha256(response.content).hexdigest()
+        if digest == cache.get('digest') and 'events' in cache:
+            logger.info("ICS feed content is unchanged since the last sync.")
+            events = cache['events']
+        else:
+            events = parse_events(text=response.text)
+        save_cache({'url': models.env.ics_url, 'status': response.status_code, 'digest': digest,
+                    'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified'),
+                    'events': events})
+    events = todays_events(events=events)
     if not events:
         return f"You don't have any meetings today {models.env.title}!"
     meeting_status, count = "", 0
     for index, event in enumerate(events):
-        if event.end.timestamp < int(time.time()):  # Skips if meeting ended earlier than current time
+        if event['end'] < int(time.time()):  # Skips if meeting ended earlier than current time
             continue
         count += 1
-        begin_local = event.begin.strftime("%I:%M %p")
+        begin_local = datetime.fromisoformat(event['begin']).strftime("%I:%M %p")
         if len(events) == 1:
-            meeting_status += f"You have an all day meeting {models.env.title}! {event.name}. " if event.all_day else \
-                f"You have a meeting at {begin_local} {models.env.title}! {event.name}. "
+            meeting_status += f"You have an all day meeting {models.env.title}! {event['name']}. " \
+                if event['all_day'] else f"You have a meeting at {begin_local} {models.env.title}! {event['name']}. "
         else:
-            meeting_status += f"{event.name} - all day" if event.all_day else f"{event.name} at {begin_local}"
+            meeting_status += f"{event['name']} - all day" if event['all_day'] else \
+                f"{event['name']} at {begin_local}"
             meeting_status += ', ' if index + 1 < len(events) else '.'
     if count:
         plural = "meeting" if count == 1 else "meetings"
@@ -93,7 +193,7 @@ def meetings() -> None:
                        f"({datetime.now().strftime('%Y_%m_%d')})")
         speaker.speak(text=f"Meetings table is outdated {models.env.title}. Please try again in a minute or two.")
     else:
-        if shared.called_by_offline:
+        if responder.called_by_offline():
             Process(target=meetings_writer).start()
             speaker.speak(text=f"Meetings table is empty {models.env.title}. Please try again in a minute or two.")
             return
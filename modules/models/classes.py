@@ -97,6 +97,7 @@ class CustomDict(BaseModel):
 
     seconds: int
     task: constr(strip_whitespace=True)
+    jitter: float = Field(default=0, ge=0)
 
     @validator('task', allow_reuse=True)
     def check_empty_string(cls, v, values, **kwargs):  # noqa
@@ -106,6 +107,38 @@ class CustomDict(BaseModel):
         raise ValueError('Bad value')
 
 
+class CronPolicy(str, Enum):
+    """Policies for a cron job that is triggered while its previous run is still going.
+
+    >>> CronPolicy
+
+    """
+
+    SKIP = 'skip'
+    QUEUE = 'queue'
+    PARALLEL = 'parallel'
+
+
+class SpeechEngine(str, Enum):
+    """Engines supported for speech recognition.
+
+    >>> SpeechEngine
+
+    """
+
+    GOOGLE = 'google'
+    VOSK = 'vosk'
+    WHISPER = 'whisper'
+
+
+class CronJob(BaseModel):
+    """Cron job model."""
+
+    expression: constr(strip_whitespace=True)
+    policy: CronPolicy = None
+    timeout: PositiveInt = None
+
+
 class EnvConfig(BaseSettings):
     """Configure all env vars and validate using ``pydantic`` to share across modules.
 
@@ -125,6 +158,8 @@ class EnvConfig(BaseSettings):
     offline_host: str = Field(default=socket.gethostbyname('localhost'), env='OFFLINE_HOST')
     offline_port: PositiveInt = Field(default=4483, env='OFFLINE_PORT')
     offline_pass: str = Field(default='OfflineComm', env='OFFLINE_PASS')
+    control_port: PositiveInt = Field(default=4484, env='CONTROL_PORT')
+    automator_port: PositiveInt = Field(default=4485, env='AUTOMATOR_PORT')
     sync_meetings: PositiveInt = Field(default=3_600, env='SYNC_MEETINGS')
     sync_events: PositiveInt = Field(default=3_600, env='SYNC_EVENTS')
     icloud_user: EmailStr = Field(default=None, env='ICLOUD_USER')
@@ -158,6 +193,9 @@ class EnvConfig(BaseSettings):
     sensitivity: Union[Sensitivity, List[Sensitivity]] = Field(default=0.5, le=1, ge=0, env='SENSITIVITY')
     timeout: Union[PositiveFloat, PositiveInt] = Field(default=3, env='TIMEOUT')
     phrase_limit: Union[PositiveFloat, PositiveInt] = Field(default=3, env='PHRASE_LIMIT')
+    speech_engine: SpeechEngine = Field(default=SpeechEngine.GOOGLE, env='SPEECH_ENGINE')
+    speech_model: str = Field(default=None, env='SPEECH_MODEL')
+    speech_language: str = Field(default=None, env='SPEECH_LANGUAGE')
     bot_token: str = Field(default=None, env='BOT_TOKEN')
     bot_chat_ids: List[int] = Field(default=[], env='BOT_CHAT_IDS')
     bot_users: List[str] = Field(default=[], env='BOT_USERS')
@@ -168,11 +206,21 @@ class EnvConfig(BaseSettings):
     speech_synthesis_timeout: int = Field(default=3, env='SPEECH_SYNTHESIS_TIMEOUT')
     speech_synthesis_host: str = Field(default=socket.gethostbyname('localhost'), env='SPEECH_SYNTHESIS_HOST')
     speech_synthesis_port: int = Field(default=5002, env='SPEECH_SYNTHESIS_PORT')
+    speech_synthesis_cache: int = Field(default=50, ge=0, env='SPEECH_SYNTHESIS_CACHE')
+    speech_synthesis_prewarm: bool = Field(default=False, env='SPEECH_SYNTHESIS_PREWARM')
     title: str = Field(default='sir', env='TITLE')
     name: str = Field(default='Vignesh', env='NAME')
     tasks: List[CustomDict] = Field(default=[], env="TASKS")
-    crontab: List[str] = Field(default=[], env='CRONTAB')
+    crontab: List[CronJob] = Field(default=[], env='CRONTAB')
+    cron_workers: PositiveInt = Field(default=2, env='CRON_WORKERS')
+    cron_policy: CronPolicy = Field(default=CronPolicy.SKIP, env='CRON_POLICY')
+    cron_timeout: PositiveInt = Field(default=3_600, env='CRON_TIMEOUT')
     limited: bool = Field(default=False, env='LIMITED')
+    match_trace_rate: float = Field(default=0, le=1, ge=0, env='MATCH_TRACE_RATE')
+    match_trace_size: PositiveInt = Field(default=100, env='MATCH_TRACE_SIZE')
+    api_workers: PositiveInt = Field(default=4, env='API_WORKERS')
+    api_queue_depth: int = Field(default=8, ge=0, env='API_QUEUE_DEPTH')
+    api_queue_timeout: Union[PositiveFloat, PositiveInt] = Field(default=30, env='API_QUEUE_TIMEOUT')
 
     class Config:
         """Environment variables configuration."""
@@ -192,6 +240,14 @@ class EnvConfig(BaseSettings):
         except ValueError:
             raise InvalidEnvVars('Format should be DD-MM')
 
+    # noinspection PyMethodParameters
+    @validator("crontab", pre=True, allow_reuse=True)
+    def parse_crontab(cls, value: list) -> list:
+        """Converts the cron expressions given as strings into cron job models."""
+        if isinstance(value, list):
+            return [{"expression": job} if isinstance(job, str) else job for job in value]
+        return value
+
 
 env = EnvConfig()
 
@@ -208,14 +264,17 @@ class FileIO(BaseModel):
     tmp_automation: FilePath = os.path.join('fileio', 'tmp_automation.yaml')
     base_db: FilePath = os.path.join('fileio', 'database.db')
     task_db: FilePath = os.path.join('fileio', 'tasks.db')
+    alarm_db: FilePath = os.path.join('fileio', 'alarms.db')
     frequent: FilePath = os.path.join('fileio', 'frequent.yaml')
+    ics_cache: FilePath = os.path.join('fileio', 'ics_cache.json')
     location: FilePath = os.path.join('fileio', 'location.yaml')
     notes: FilePath = os.path.join('fileio', 'notes.txt')
     robinhood: FilePath = os.path.join('fileio', 'robinhood.html')
     smart_devices: FilePath = os.path.join('fileio', 'smart_devices.yaml')
     training_data: FilePath = os.path.join('fileio', 'training_data.yaml')
+    usage: FilePath = os.path.join('fileio', 'usage.db')
     event_script: FilePath = os.path.join('fileio', f'{env.event_app}.scpt')
-    speech_synthesis_wav: FilePath = os.path.join('fileio', 'speech_synthesis.wav')
+    speech_synthesis_cache: FilePath = os.path.join('fileio', 'speech_synthesis')
     speech_synthesis_log: FilePath = datetime.now().strftime(os.path.join('logs', 'speech_synthesis_%d-%m-%Y.log'))
     templates: DirectoryPath = os.path.realpath(os.path.join('modules', 'templates'))
 
@@ -20,7 +20,8 @@ from modules.camera.camera import Camera
 from modules.crontab.expression import CronExpression
 from modules.database import database
 from modules.exceptions import CameraError, InvalidEnvVars
-from modules.models.classes import Indicators, env, fileio, settings
+from modules.models.classes import (CronJob, Indicators, SpeechEngine, env,
+                                    fileio, settings)
 
 indicators = Indicators()
 
@@ -63,33 +64,39 @@ if env.ics_url and not env.ics_url.endswith('.ics'):
 if env.tv_mac and isinstance(env.tv_mac, str):
     env.tv_mac = [env.tv_mac]
 
+if env.speech_engine == SpeechEngine.VOSK and not (env.speech_model and os.path.isdir(env.speech_model)):
+    raise InvalidEnvVars(
+        "'SPEECH_MODEL' should be the path to a vosk model directory when 'SPEECH_ENGINE' is vosk"
+    )
+
 if env.speech_synthesis_port == env.offline_port:
     raise InvalidEnvVars(
         "Speech synthesizer and offline communicator cannot run simultaneously on the same port number."
     )
 
+if len({env.offline_port, env.speech_synthesis_port, env.control_port, env.automator_port}) != 4:
+    raise InvalidEnvVars(
+        "Control channel and automator cannot share their port numbers with each other, "
+        "offline communicator or speech synthesizer."
+    )
+
 if all([env.robinhood_user, env.robinhood_pass, env.robinhood_pass]):
-    env.crontab.append(cron_schedule(extended=True))
+    env.crontab.append(CronJob(expression=cron_schedule(extended=True)))
 
 # Forces limited version if env var is set, otherwise it is enforced based on the number of physical cores
 if env.limited:
     settings.limited = True
 
 # Validates crontab expression if provided
-for expression in env.crontab:
-    CronExpression(expression)
+for job in env.crontab:
+    CronExpression(job.expression)
 
 # Create all necessary DB tables during startup
 db = database.Database(database=fileio.base_db)
 TABLES = {
     env.event_app: ["info", "date"],
     "ics": ["info", "date"],
-    "stopper": ["flag", "caller"],
-    "restart": ["flag", "caller"],
-    "children": ["meetings", "events", "crontab", "party", "guard"],
-    "vpn": ["state"],
-    "party": ["pid"],
-    "guard": ["state"]
+    "children": ["meetings", "events", "crontab", "party", "guard"]
 }
 for table, column in TABLES.items():
     db.create_table(table_name=table, columns=column)
@@ -0,0 +1,75 @@
+# noinspection PyUnresolvedReferences
+"""Request scoped context to collect the response of a command that was executed by the offline communicator.
+
+>>> Responder
+
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Union
+
+
+class Responder:
+    """Holds the response of a single offline request.
+
+    >>> Responder
+
+    See Also:
+        - Each request gets its own responder, so concurrent requests cannot swap or lose each other's responses.
+        - | The responder is bound to the thread (or task) that executes the request, executors that speak from a
+          | thread of their own are not captured.
+    """
+
+    def __init__(self):
+        """Instantiates an empty response."""
+        self.text = None
+        self.caller = None
+
+    def respond(self, text: str, caller: str) -> None:
+        """Stores the response in place of speaking it.
+
+        Args:
+            text: Text that would have been spoken.
+            caller: Name of the function that called the speaker.
+        """
+        self.text = text
+        self.caller = caller
+
+
+_responder: ContextVar[Union[Responder, None]] = ContextVar('responder', default=None)
+
+
+def current() -> Union[Responder, None]:
+    """Gets the responder of the request that is being executed.
+
+    Returns:
+        Responder:
+        Responder for the current request, ``None`` if not invoked by the offline communicator.
+    """
+    return _responder.get()
+
+
+def called_by_offline() -> bool:
+    """Checks if the current command was invoked by the offline communicator.
+
+    Returns:
+        bool:
+        A boolean flag to indicate whether the speaker should be suppressed.
+    """
+    return _responder.get() is not None
+
+
+@contextmanager
+def session() -> Iterator[Responder]:
+    """Binds a new responder to the current context for the duration of a request.
+
+    Yields:
+        Responder:
+        Responder that collects the response of the request.
+    """
+    token = _responder.set(Responder())
+    try:
+        yield _responder.get()
+    finally:
+        _responder.reset(token)
@@ -15,7 +15,7 @@ from executors.offline import offline_communicator
 from executors.word_match import word_match
 from modules.audio import tts_stt
 from modules.conditions import keywords
-from modules.database import database
+from modules.control import channel
 from modules.exceptions import BotInUse
 from modules.logger.custom_logger import logger
 from modules.models import models
@@ -25,7 +25,6 @@ from modules.utils import support
 
 importlib.reload(module=logging)
 
-db = database.Database(database=models.fileio.base_db)
 offline_compatible = compatibles.offline_compatible()
 
 USER_TITLE = {}
@@ -157,22 +156,23 @@ class TelegramBot:
             logger.error(response.json())
         return response
 
-    def send_audio(self, chat_id: int, filename: Union[str, FilePath], parse_mode: str = 'HTML') -> requests.Response:
-        """Sends an audio file to the user.
+    def send_audio(self, chat_id: int, content: bytes, title: str = 'response.wav',
+                   parse_mode: str = 'HTML') -> requests.Response:
+        """Sends an audio to the user.
 
         Args:
             chat_id: Chat ID.
-            filename: Name of the audio file that has to be sent.
+            content: Content of the audio file that has to be sent.
+            title: Title of the audio.
             parse_mode: Parse mode. Defaults to ``HTML``
 
         Returns:
             Response:
             Response class.
         """
-        with open(filename, 'rb') as audio:
-            files = {'audio': audio.read()}
-        return self._make_request(url=self.BASE_URL + models.env.bot_token + '/sendAudio', files=files,
-                                  payload={'chat_id': chat_id, 'title': filename, 'parse_mode': parse_mode})
+        return self._make_request(url=self.BASE_URL + models.env.bot_token + '/sendAudio',
+                                  files={'audio': (title, content)},
+                                  payload={'chat_id': chat_id, 'title': title, 'parse_mode': parse_mode})
 
     def send_photo(self, chat_id: int, filename: Union[str, FilePath]) -> requests.Response:
         """Sends an image file to the user.
@@ -307,7 +307,7 @@ class TelegramBot:
                                    f"Processed: {time.strftime('%m-%d-%Y %H:%M:%S', time.localtime(time.time()))}")
 
     def verify_stop(self, payload: dict) -> bool:
-        """Stops Jarvis by setting stop flag in ``fileio.base_db`` if stop is requested by the user with a bypass flag.
+        """Stops Jarvis by signalling the main process if stop is requested by the user with a bypass flag.
 
         Args:
             payload: Payload received, to extract information from.
@@ -321,10 +321,7 @@ class TelegramBot:
         if "bypass" in payload.get('text', '').lower():
             logger.info(f"{payload['from']['username']} requested a STOP bypass.")
             self.reply_to(payload=payload, response=f"Shutting down now {models.env.title}!\n{support.exit_message()}")
-            with db.connection:
-                cursor = db.connection.cursor()
-                cursor.execute("INSERT or REPLACE INTO stopper (flag, caller) VALUES (?,?);", (True, 'TelegramAPI'))
-                cursor.connection.commit()
+            channel.send_signal(signal="stop", caller="TelegramAPI")
         else:
             self.reply_to(payload=payload,
                           response="Jarvis cannot be stopped via offline communication without a 'bypass' flag.")
@@ -374,10 +371,11 @@ class TelegramBot:
             logger.error(payload)
         # Catches both unconverted source ogg and unconverted audio to text
         title = USER_TITLE.get(payload['from']['username'], models.env.title)
-        filename = tts_stt.text_to_audio(text=f"I'm sorry {title}! I was unable to process your voice command. "
-                                              "Please try again!")
-        self.send_audio(filename=filename, chat_id=payload['from']['id'])
-        os.remove(filename)
+        response = f"I'm sorry {title}! I was unable to process your voice command. Please try again!"
+        if content := tts_stt.text_to_audio(text=response):
+            self.send_audio(chat_id=payload['from']['id'], content=content)
+        else:
+            self.send_message(chat_id=payload['from']['id'], response=response)
 
     def process_text(self, payload: dict) -> None:
         """Processes the payload received after checking for authentication.
@@ -494,10 +492,8 @@ class TelegramBot:
             self.send_photo(chat_id=payload['from']['id'], filename=response)
             os.remove(response)
             return
-        if payload.get('voice'):
-            filename = tts_stt.text_to_audio(text=response)
-            self.send_audio(chat_id=payload['from']['id'], filename=filename)
-            os.remove(filename)
+        if payload.get('voice') and (content := tts_stt.text_to_audio(text=response)):
+            self.send_audio(chat_id=payload['from']['id'], content=content)
             return
         self.send_message(chat_id=payload['from']['id'], response=response)
 
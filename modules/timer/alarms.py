@@ -0,0 +1,228 @@
+import calendar
+import os
+import time
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, NoReturn, Union
+
+from pydantic import FilePath
+
+from modules.database import database
+from modules.logger.custom_logger import logger
+
+ALARM = "alarm"
+REMINDER = "reminder"
+DAILY = "daily"
+
+
+class Entry(NamedTuple):
+    """Alarm or reminder that is stored in the schedule.
+
+    >>> Entry
+
+    """
+
+    kind: str
+    at: str
+    recurrence: Union[str, None]
+    message: Union[str, None]
+
+
+def next_occurrence(at: str, recurrence: str = None, after: datetime = None) -> datetime:
+    """Calculates the next time an alarm or a reminder should go off.
+
+    Args:
+        at: Time of day in the format ``07:30 AM``
+        recurrence: ``daily``, name of the day of week, or ``None`` for a one time entry.
+        after: Datetime from which the next occurrence is calculated. Defaults to current time.
+
+    Returns:
+        datetime:
+        Start of the next minute that matches the time of day (and the day of week), including the current minute.
+    """
+    after = (after or datetime.now()).replace(second=0, microsecond=0)
+    clock = datetime.strptime(at, "%I:%M %p")
+    occurrence = after.replace(hour=clock.hour, minute=clock.minute)
+    if occurrence < after:
+        occurrence += timedelta(days=1)
+    if recurrence and recurrence != DAILY:
+        weekday = list(calendar.day_name).index(recurrence.capitalize())
+        occurrence += timedelta(days=(weekday - occurrence.weekday()) % 7)
+    return occurrence
+
+
+class AlarmStore:
+    """Alarms and reminders stored in a SQLite table, indexed by the time at which they go off.
+
+    >>> AlarmStore
+
+    See Also:
+        - The next due time is looked up using the index on ``fire_at``, instead of scanning for lock files.
+        - Recurring entries are moved to their next occurrence when they go off, one time entries are marked as fired.
+        - Fired entries are retained for a day, so that they can be snoozed.
+        - The database is shared by the processes that create the entries and the automator that triggers them.
+    """
+
+    def __init__(self, database_file: Union[FilePath, str]):
+        """Creates the table and the index if they don't exist already.
+
+        Args:
+            database_file: Name of the database file.
+        """
+        self.db = database.Database(database=database_file)
+        self.db.create_table(table_name="schedule",
+                             columns=["id INTEGER PRIMARY KEY", "kind TEXT NOT NULL", "at TEXT NOT NULL",
+                                      "recurrence TEXT", "message TEXT", "fire_at REAL", "fired_at REAL"])
+        with self.db.connection:
+            self.db.connection.execute("CREATE INDEX IF NOT EXISTS schedule_fire_at ON schedule (fire_at)")
+
+    def add(self, kind: str, at: str, recurrence: str = None, message: str = None) -> datetime:
+        """Adds an alarm or a reminder.
+
+        Args:
+            kind: ``alarm`` or ``reminder``
+            at: Time of day in the format ``07:30 AM``
+            recurrence: ``daily``, name of the day of week, or ``None`` for a one time entry.
+            message: Message for a reminder.
+
+        Returns:
+            datetime:
+            Time at which the entry will go off first.
+        """
+        fire_at = next_occurrence(at=at, recurrence=recurrence)
+        with self.db.connection:
+            self.db.connection.execute(
+                "INSERT INTO schedule (kind, at, recurrence, message, fire_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, at, recurrence, message, fire_at.timestamp())
+            )
+        logger.info(f"{kind.capitalize()} set for {fire_at.strftime('%A %I:%M %p')}")
+        return fire_at
+
+    def entries(self, kind: str) -> List[Entry]:
+        """Gets the alarms or reminders that are yet to go off.
+
+        Args:
+            kind: ``alarm`` or ``reminder``
+
+        Returns:
+            list:
+            Pending entries ordered by the time at which they go off.
+        """
+        cursor = self.db.connection.execute(
+            "SELECT kind, at, recurrence, message FROM schedule WHERE kind=? AND fire_at IS NOT NULL ORDER BY fire_at",
+            (kind,)
+        )
+        return [Entry(*row) for row in cursor.fetchall()]
+
+    def remove(self, kind: str, at: str = None) -> int:
+        """Removes the alarms or reminders set for a time of day.
+
+        Args:
+            kind: ``alarm`` or ``reminder``
+            at: Time of day in the format ``07:30 AM``. Removes all the entries of the kind if not specified.
+
+        Returns:
+            int:
+            Number of entries removed.
+        """
+        with self.db.connection:
+            if at:
+                cursor = self.db.connection.execute("DELETE FROM schedule WHERE kind=? AND at=?", (kind, at))
+            else:
+                cursor = self.db.connection.execute("DELETE FROM schedule WHERE kind=?", (kind,))
+        return cursor.rowcount
+
+    def next_due(self) -> Union[float, None]:
+        """Gets the time at which the next alarm or reminder should go off.
+
+        Returns:
+            float:
+            Epoch time of the next entry, ``None`` if there are no pending entries.
+        """
+        return self.db.connection.execute("SELECT MIN(fire_at) FROM schedule").fetchone()[0]
+
+    def pop_due(self, now: float = None, grace: int = 60) -> List[Entry]:
+        """Gets the entries that are due and moves them to their next occurrence.
+
+        Args:
+            now: Epoch time to look up. Defaults to current time.
+            grace: Seconds after which an overdue entry is skipped, when the automator wasn't running in time.
+
+        Returns:
+            list:
+            Entries that should go off now.
+        """
+        now = now or time.time()
+        due = []
+        with self.db.connection:
+            cursor = self.db.connection.cursor()
+            rows = cursor.execute(
+                "SELECT id, kind, at, recurrence, message, fire_at FROM schedule WHERE fire_at <= ? ORDER BY fire_at",
+                (now,)
+            ).fetchall()
+            for identifier, kind, at, recurrence, message, fire_at in rows:
+                if now - fire_at > grace:
+                    logger.warning(f"Missed {kind} set for {datetime.fromtimestamp(fire_at).strftime('%c')}")
+                else:
+                    due.append(Entry(kind, at, recurrence, message))
+                upcoming = next_occurrence(at=at, recurrence=recurrence,
+                                           after=datetime.fromtimestamp(now) + timedelta(minutes=1)).timestamp() \
+                    if recurrence else None
+                cursor.execute("UPDATE schedule SET fire_at=?, fired_at=? WHERE id=?", (upcoming, now, identifier))
+            cursor.execute("DELETE FROM schedule WHERE fire_at IS NULL AND fired_at < ?", (now - 86_400,))
+        return due
+
+    def snooze(self, kind: str, minutes: int) -> Union[Entry, None]:
+        """Sets the alarm or reminder that went off most recently, to go off again after a few minutes.
+
+        Args:
+            kind: ``alarm`` or ``reminder``
+            minutes: Number of minutes to snooze.
+
+        Returns:
+            Entry:
+            Entry that was snoozed, ``None`` if nothing went off within the last hour.
+        """
+        now = time.time()
+        if not (row := self.db.connection.execute(
+            "SELECT message FROM schedule WHERE kind=? AND fired_at >= ? ORDER BY fired_at DESC LIMIT 1",
+            (kind, now - 3_600)
+        ).fetchone()):
+            return
+        fire_at = now + minutes * 60
+        entry = Entry(kind, datetime.fromtimestamp(fire_at).strftime("%I:%M %p"), None, row[0])
+        with self.db.connection:
+            self.db.connection.execute(
+                "INSERT INTO schedule (kind, at, recurrence, message, fire_at) VALUES (?, ?, ?, ?, ?)",
+                (*entry, fire_at)
+            )
+        return entry
+
+
+def import_lock_files(store: AlarmStore) -> NoReturn:
+    """Moves the alarms and reminders stored as lock files in the ``alarm`` and ``reminder`` directories to the store.
+
+    Args:
+        store: Store to add the entries to.
+    """
+    for kind in (ALARM, REMINDER):
+        if not os.path.isdir(kind):
+            continue
+        for filename in os.listdir(kind):
+            if filename.startswith("."):
+                continue
+            name, message, recurrence = filename.lstrip("_").replace(".lock", ""), None, None
+            if kind == REMINDER and "|" in name:
+                name, message = name.split("|", 1)
+                message = message.replace("_", " ")
+            parts = name.split("_")
+            if parts[-1] == "repeat":
+                parts.pop()
+                recurrence = parts.pop(0) if len(parts) == 4 else DAILY
+            try:
+                hour, minute, am_pm = parts
+                store.add(kind=kind, at=f"{hour}:{minute} {am_pm}", recurrence=recurrence, message=message)
+            except ValueError as error:
+                logger.error(f"Unable to import {kind} from {filename}: {error}")
+            os.remove(os.path.join(kind, filename))
+        if not os.listdir(kind):
+            os.rmdir(kind)
@@ -1,48 +1,200 @@
-from threading import Timer
-from typing import Callable, NoReturn, Union
+# noinspection PyUnresolvedReferences
+"""Runs periodic tasks at fixed intervals in a small pool of threads.
+
+>>> Executor
+
+"""
+
+import itertools
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, List, NoReturn, Union
 
 from modules.logger.custom_logger import logger
+from modules.timer.scheduler import Scheduler
 
 
-class RepeatedTimer:
-    """Initiate ``RepeatedTimer`` object to run a task repeated after given intervals.
+class PeriodicTask:
+    """Task that is run by the ``TimerService`` at a fixed interval, along with its run statistics.
 
-    >>> RepeatedTimer
+    >>> PeriodicTask
 
     """
 
-    def __init__(self, interval: Union[int, float], function: Callable, *args, **kwargs):
-        """Instantiates the object and starts the task.
+    def __init__(self, index: int, name: str, interval: Union[int, float], function: Callable, args: tuple,
+                 kwargs: dict, jitter: Union[int, float]):
+        """Instantiates the task with empty statistics.
 
         Args:
-            interval: Seconds after which the task should be triggered repeatedly.
+            index: Unique index of the task, assigned by the ``TimerService``.
+            name: Name of the task, used in logs and statistics.
+            interval: Seconds between the runs.
             function: Function that has to be called.
-            *args: Arguments.
-            **kwargs: Keyword arguments.
+            args: Arguments.
+            kwargs: Keyword arguments.
+            jitter: Maximum number of seconds each run is randomly delayed by.
         """
-        self._timer = None
+        self.index = index
+        self.name = name
         self.interval = interval
         self.function = function
         self.args = args
         self.kwargs = kwargs
-        self.is_running = False
-        self.start()
+        self.jitter = jitter
+        self.tick = None
+        self.running = False
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_run = None
+        self.last_duration = None
+        self.max_duration = 0.0
+        self.total_duration = 0.0
 
-    def _run(self) -> NoReturn:
-        """Initiates function."""
-        self.is_running = False
-        self.start()
-        self.function(*self.args, **self.kwargs)
+    def stats(self) -> Dict[str, Any]:
+        """Run statistics of the task.
+
+        Returns:
+            dict:
+            A dictionary of counters and durations.
+        """
+        return {"name": self.name, "interval": self.interval, "running": self.running, "runs": self.runs,
+                "skipped": self.skipped, "failures": self.failures, "last_run": self.last_run,
+                "last_duration": self.last_duration, "max_duration": self.max_duration,
+                "avg_duration": self.total_duration / self.runs if self.runs else None}
+
+
+class TimerService:
+    """Runs periodic tasks from a single timer thread, instead of a thread per task per interval.
+
+    >>> TimerService
+
+    See Also:
+        - | Deadlines are kept by a ``Scheduler``, and the timer thread only hands each due task to the workers.
+          | Tasks are keyed by the index assigned when added, so tasks with the same name don't replace each other.
+        - | Runs are scheduled on a fixed grid from when the task was added, so intervals don't drift with the run time.
+          | Jitter delays an individual run, without moving the grid.
+        - | A run that is due while the previous run of the same task is still going is skipped, and counted as
+          | skipped in the statistics.
+        - Tasks run in a small pool of worker threads, so a slow task doesn't delay the timer.
+    """
+
+    def __init__(self, workers: int = 2):
+        """Instantiates an empty service.
+
+        Args:
+            workers: Number of tasks that can run concurrently.
+        """
+        self.tasks: Dict[int, PeriodicTask] = {}
+        self.counter = itertools.count()
+        self.lock = Lock()
+        self.scheduler = Scheduler()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='timer')
+        self.thread = Thread(target=self.scheduler.run, name='timer-service', daemon=True)
+
+    def add(self, name: str, interval: Union[int, float], function: Callable, *args,
+            jitter: Union[int, float] = 0, **kwargs) -> PeriodicTask:
+        """Adds a task to be run after every interval, starting one interval from now.
+
+        Args:
+            name: Name of the task.
+            interval: Seconds between the runs.
+            function: Function that has to be called.
+            *args: Arguments.
+            jitter: Maximum number of seconds each run is randomly delayed by.
+            **kwargs: Keyword arguments.
+
+        Returns:
+            PeriodicTask:
+            Task that was added.
+        """
+        task = PeriodicTask(index=next(self.counter), name=name, interval=interval, function=function, args=args,
+                            kwargs=kwargs, jitter=jitter)
+        task.tick = time.time() + interval
+        with self.lock:
+            self.tasks[task.index] = task
+        self.scheduler.schedule(key=("timer", task.index), deadline=self._deadline(task=task),
+                                job=lambda: self._dispatch(task=task))
+        return task
+
+    def remove(self, task: PeriodicTask) -> NoReturn:
+        """Removes a task, a run that is in progress is left to complete.
+
+        Args:
+            task: Task that was returned when added.
+        """
+        with self.lock:
+            self.tasks.pop(task.index, None)
+        self.scheduler.cancel(key=("timer", task.index))
+
+    @staticmethod
+    def _deadline(task: PeriodicTask) -> float:
+        """Epoch time of the next run of a task, which is its next tick on the grid delayed by the jitter."""
+        return task.tick + (random.uniform(0, task.jitter) if task.jitter else 0)
 
     def start(self) -> NoReturn:
-        """Checks if task is running, schedules a thread timer otherwise."""
-        if not self.is_running:
-            self._timer = Timer(self.interval, self._run)
-            self._timer.start()
-            self.is_running = True
+        """Starts the timer thread."""
+        self.thread.start()
+
+    def _dispatch(self, task: PeriodicTask) -> Union[float, None]:
+        """Hands a due task over to the workers, called by the scheduler.
+
+        Args:
+            task: Task that is due.
+
+        Returns:
+            float:
+            Epoch time of the next run of the task, ``None`` if the task was removed.
+        """
+        with self.lock:
+            if self.tasks.get(task.index) is not task:
+                return
+            if task.running:
+                task.skipped += 1
+                logger.warning(f"Skipping {task.name} as the previous run is still in progress")
+            else:
+                task.running = True
+                self.executor.submit(self._run, task)
+            # Moves to the next tick on the grid, skipping the ticks that were missed
+            task.tick += task.interval * (int((time.time() - task.tick) // task.interval) + 1)
+        return self._deadline(task=task)
+
+    def _run(self, task: PeriodicTask) -> NoReturn:
+        """Runs a task and records its statistics.
+
+        Args:
+            task: Task to be run.
+        """
+        start = time.perf_counter()
+        try:
+            task.function(*task.args, **task.kwargs)
+        except Exception as error:
+            task.failures += 1
+            logger.error(f"{task.name}: {error}")
+        finally:
+            duration = time.perf_counter() - start
+            with self.lock:
+                task.running = False
+                task.runs += 1
+                task.last_run = time.time()
+                task.last_duration = duration
+                task.max_duration = max(task.max_duration, duration)
+                task.total_duration += duration
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Run statistics of all the tasks.
+
+        Returns:
+            list:
+            Statistics of each task, in the order they were added.
+        """
+        with self.lock:
+            return [task.stats() for task in self.tasks.values()]
 
     def stop(self) -> NoReturn:
-        """Flips the running flag to False and cancels the existing timer."""
-        logger.info(f"Stopping {self.function.__name__} while executing {self.args or self.kwargs}")
-        self._timer.cancel()
-        self.is_running = False
+        """Stops the timer thread, runs that are in progress are left to complete."""
+        logger.info(f"Stopping timer service: {self.stats()}")
+        self.scheduler.stop()
+        self.executor.shutdown(wait=False)
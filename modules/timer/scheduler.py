@@ -0,0 +1,218 @@
+# noinspection PyUnresolvedReferences
+"""Scheduler that runs jobs at their deadlines, sleeping in between.
+
+>>> Scheduler
+
+"""
+
+import heapq
+import itertools
+import time
+from threading import Event, RLock
+from typing import Callable, Dict, Hashable, List, NoReturn, Tuple, Union
+
+from modules.control.channel import ControlChannel
+from modules.logger.custom_logger import logger
+
+
+class Scheduler:
+    """Min-heap of deadlines that sleeps until the next job is due or a wake-up signal is received.
+
+    >>> Scheduler
+
+    See Also:
+        - Each job is a callable that returns its next deadline (epoch seconds), or ``None`` to stop repeating.
+        - | Rescheduling or cancelling a job leaves its older deadline in the heap, which is discarded when popped.
+          | Keys are tuples whose first element is the group, so that a group of jobs can be cancelled at once.
+        - | A job stays registered while it runs. If it is cancelled or rescheduled in the meantime (from any thread),
+          | the deadline it returns is ignored.
+        - | When a control channel is given, ``wake`` signals received on it interrupt the sleep. Otherwise, the sleep
+          | is interrupted when a job is scheduled from another thread, so the heap can be shared across threads.
+        - | A job that raises is rescheduled after a retry interval that doubles with each consecutive failure, up
+          | to ``max_retry``, so a failing job neither stops for good nor runs in a tight loop.
+    """
+
+    def __init__(self, channel: ControlChannel = None, retry: float = 30, max_retry: float = 900):
+        """Instantiates an empty heap.
+
+        Args:
+            channel: Control channel to receive wake-up signals on.
+            retry: Seconds to wait before running a job that raised.
+            max_retry: Maximum seconds to wait before running a job that keeps raising.
+        """
+        self.channel = channel
+        self.retry = retry
+        self.max_retry = max_retry
+        self.heap: List[Tuple[float, int, Hashable]] = []
+        self.jobs: Dict[Hashable, Tuple[int, Callable[[], Union[float, None]]]] = {}
+        self.failures: Dict[Hashable, int] = {}
+        self.counter = itertools.count()
+        self.lock = RLock()
+        self.interrupt = Event()
+        self.stopped = False
+
+    def schedule(self, key: Hashable, deadline: float, job: Callable[[], Union[float, None]]) -> NoReturn:
+        """Adds a job or moves an existing job to a new deadline.
+
+        Args:
+            key: Unique key of the job.
+            deadline: Epoch time at which the job should run.
+            job: Callable that runs the job and returns its next deadline.
+        """
+        with self.lock:
+            version = next(self.counter)
+            self.jobs[key] = (version, job)
+            heapq.heappush(self.heap, (deadline, version, key))
+        self.interrupt.set()
+
+    def cancel(self, key: Hashable) -> NoReturn:
+        """Cancels a job.
+
+        Args:
+            key: Unique key of the job.
+        """
+        with self.lock:
+            self.jobs.pop(key, None)
+            self.failures.pop(key, None)
+
+    def cancel_group(self, group: str) -> NoReturn:
+        """Cancels all the jobs that belong to a group.
+
+        Args:
+            group: First element of the keys to be cancelled.
+        """
+        with self.lock:
+            for key in [key for key in self.jobs if isinstance(key, tuple) and key[0] == group]:
+                del self.jobs[key]
+                self.failures.pop(key, None)
+
+    def next_deadline(self) -> Union[float, None]:
+        """Discards the stale entries at the top of the heap and returns the earliest deadline.
+
+        Returns:
+            float:
+            Epoch time of the next job, ``None`` if there are no jobs.
+        """
+        with self.lock:
+            while self.heap:
+                deadline, version, key = self.heap[0]
+                if (entry := self.jobs.get(key)) and entry[0] == version:
+                    return deadline
+                heapq.heappop(self.heap)
+
+    def _pop_due(self) -> Union[Tuple[Hashable, int, Callable[[], Union[float, None]]], None]:
+        """Pops the earliest job if it is due, discarding stale entries, within a single locked section.
+
+        Returns:
+            tuple:
+            Key, version and callable of the job that is due, ``None`` if no job is due.
+
+        See Also:
+            The job is left in ``jobs`` while it runs, so it can be cancelled or rescheduled from another thread.
+        """
+        with self.lock:
+            while self.heap:
+                deadline, version, key = self.heap[0]
+                if not (entry := self.jobs.get(key)) or entry[0] != version:
+                    heapq.heappop(self.heap)
+                    continue
+                if deadline > time.time():
+                    return
+                heapq.heappop(self.heap)
+                return key, version, entry[1]
+
+    def _reschedule(self, key: Hashable, version: int, job: Callable[[], Union[float, None]],
+                    deadline: Union[float, None]) -> NoReturn:
+        """Schedules the next run of a job, unless it was cancelled or rescheduled while it was running.
+
+        Args:
+            key: Unique key of the job.
+            version: Version of the job that was run.
+            job: Callable that runs the job.
+            deadline: Epoch time of the next run, ``None`` to remove the job.
+        """
+        with self.lock:
+            if (entry := self.jobs.get(key)) is None or entry[0] != version:
+                return
+            if deadline is None:
+                del self.jobs[key]
+                self.failures.pop(key, None)
+                return
+            self.schedule(key=key, deadline=deadline, job=job)
+
+    def run_pending(self) -> int:
+        """Runs every job that is due and schedules its next run, or a retry if the job raised.
+
+        Returns:
+            int:
+            Number of jobs that were run.
+        """
+        count = 0
+        while due := self._pop_due():
+            key, version, job = due
+            count += 1
+            try:
+                upcoming = job()
+            except Exception as error:
+                with self.lock:
+                    failures = self.failures[key] = self.failures.get(key, 0) + 1
+                delay = min(self.retry * 2 ** (failures - 1), self.max_retry)
+                logger.error(f"{key}: {error}, retrying in {delay}s")
+                self._reschedule(key=key, version=version, job=job, deadline=time.time() + delay)
+                continue
+            with self.lock:
+                self.failures.pop(key, None)
+            self._reschedule(key=key, version=version, job=job, deadline=upcoming)
+        return count
+
+    def wait(self) -> bool:
+        """Sleeps until the next deadline or until a wake-up signal is received.
+
+        Returns:
+            bool:
+            A boolean flag to indicate whether a wake-up signal was received.
+        """
+        self.interrupt.clear()
+        timeout = None if (deadline := self.next_deadline()) is None else max(0.0, deadline - time.time())
+        if not self.channel:
+            self.interrupt.wait(timeout=timeout)
+            return False
+        if not self.channel.wait(timeout=timeout):
+            return False
+        woke = False
+        while control := self.channel.receive():
+            signal, _, caller = control
+            if signal == "wake":
+                logger.debug(f"Woken up by {caller}")
+                woke = True
+        return woke
+
+    def run(self, on_wake: Callable[[], None] = None) -> NoReturn:
+        """Runs the jobs until stopped.
+
+        Args:
+            on_wake: Function to be called when a wake-up signal is received, before the pending jobs are run.
+        """
+        while not self.stopped:
+            if self.wait() and on_wake:
+                on_wake()
+            if not self.stopped:
+                self.run_pending()
+
+    def stop(self) -> NoReturn:
+        """Stops the run loop once the current wait or job is complete."""
+        self.stopped = True
+        self.interrupt.set()
+
+
+def next_minute(now: float = None) -> float:
+    """Calculates the start of the next minute.
+
+    Args:
+        now: Epoch time to start from. Defaults to current time.
+
+    Returns:
+        float:
+        Epoch time of the start of the next minute.
+    """
+    return (int(now or time.time()) // 60 + 1) * 60
@@ -13,7 +13,7 @@ from pywebostv.controls import (ApplicationControl, MediaControl,
 from modules.exceptions import TVError
 from modules.logger.custom_logger import logger
 from modules.models import models
-from modules.utils import shared
+from modules.offline import responder
 
 
 class TV:
@@ -44,7 +44,7 @@ class TV:
         except (socket.gaierror, ConnectionRefusedError) as error:
             logger.error(error)
             self.reconnect = True
-            if not shared.called_by_offline:
+            if not responder.called_by_offline():
                 playsound(sound=models.indicators.tv_scan, block=False)
             if discovered := WebOSClient.discover():
                 self.client = discovered[0]
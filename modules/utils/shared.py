@@ -6,11 +6,10 @@
 """
 
 greeting = False
-called_by_offline = False
 
-text_spoken = None
-offline_caller = None
 tv = None
+capture = None
+microphone = None
 
 processes = {}
 hosted_device = {}
@@ -27,12 +27,9 @@ from holidays import country_holidays
 from executors.internet import ip_address
 from modules.audio import speaker
 from modules.conditions import keywords
-from modules.database import database
 from modules.logger.custom_logger import logger
 from modules.models import models
 
-db = database.Database(database=models.fileio.base_db)
-
 
 def hostname_to_ip(hostname: str) -> List[str]:
     """Uses ``socket.gethostbyname_ex`` to translate a host name to IPv4 address format, extended interface.
@@ -401,53 +398,6 @@ def number_to_words(input_: Union[int, str], capitalize: bool = False) -> str:
     return result[0].upper() + result[1:] if capitalize else result
 
 
-def lock_files(alarm_files: bool = False, reminder_files: bool = False) -> List[str]:
-    """Checks for ``*.lock`` files within the ``alarm`` directory if present.
-
-    Args:
-        alarm_files: Takes a boolean value to gather list of alarm lock files.
-        reminder_files: Takes a boolean value to gather list of reminder lock files.
-
-    Returns:
-        list:
-        List of ``*.lock`` file names ignoring other hidden files.
-    """
-    if alarm_files:
-        return [f for f in os.listdir("alarm") if not f.startswith(".")] if os.path.isdir("alarm") else None
-    if reminder_files:
-        return [f for f in os.listdir("reminder") if not f.startswith(".")] if os.path.isdir("reminder") else None
-
-
-def check_restart() -> List[str]:
-    """Checks for entries in the restart table in base db.
-
-    Returns:
-        list:
-        Returns the flag, caller from the restart table.
-    """
-    with db.connection:
-        cursor = db.connection.cursor()
-        flag = cursor.execute("SELECT flag, caller FROM restart").fetchone()
-        cursor.execute("DELETE FROM restart")
-        db.connection.commit()
-    return flag
-
-
-def check_stop() -> List[str]:
-    """Checks for entries in the stopper table in base db.
-
-    Returns:
-        list:
-        Returns the flag, caller from the stopper table.
-    """
-    with db.connection:
-        cursor = db.connection.cursor()
-        flag = cursor.execute("SELECT flag, caller FROM stopper").fetchone()
-        cursor.execute("DELETE FROM stopper")
-        db.connection.commit()
-    return flag
-
-
 def exit_message() -> str:
     """Variety of exit messages based on day of week and time of day.
 
@@ -0,0 +1,245 @@
+# noinspection PyUnresolvedReferences
+"""Benchmark to measure how fast ``conditions`` and ``split_phrase`` route a phrase and to catch routing regressions.
+
+>>> DispatchBenchmark
+
+Every executor that ``conditions`` can call is replaced with a stub that records its name, so nothing is actually
+executed. Each phrase in the corpus is labelled with the handler(s) it is expected to reach.
+
+Usage:
+    python -m tests.dispatch_benchmark
+    python -m tests.dispatch_benchmark --rounds 50 --corpus my_phrases.yaml --training
+
+"""
+
+import argparse
+import inspect
+import os
+import time
+from types import ModuleType, SimpleNamespace
+from typing import Callable, Dict, Iterable, List, NoReturn, Union
+
+import yaml
+
+from executors import commander
+from executors import conditions as dispatcher
+from modules.exceptions import StopSignal
+from modules.models import models
+
+CORPUS = os.path.join(os.path.dirname(__file__), 'dispatch_corpus.yaml')
+UNRECOGNIZED = "unrecognized"
+
+
+class Recorder:
+    """Collects the names of the stubbed executors that were called while routing a phrase.
+
+    >>> Recorder
+
+    """
+
+    def __init__(self):
+        """Instantiates an empty route."""
+        self.route: List[str] = []
+
+    def stub(self, name: str, value=None) -> Callable:
+        """Creates a stub that records the executor's name when called.
+
+        Args:
+            name: Name to be recorded.
+            value: Value to be returned by the stub.
+
+        Returns:
+            Callable:
+            Stub function.
+        """
+        def executor(*args, **kwargs):
+            """Records the call in place of the actual executor."""
+            self.route.append(name)
+            return value
+        return executor
+
+    def namespace(self, prefix: str, **overrides: str) -> object:
+        """Creates an object whose attributes are all stubs, to replace a module such as ``controls``.
+
+        Args:
+            prefix: Prefix for the recorded names.
+            **overrides: Attribute names mapped to the names to be recorded in their place.
+
+        Returns:
+            object:
+            Object that returns a stub for any attribute.
+        """
+        recorder = self
+
+        class Namespace:
+            """Returns a recording stub for every attribute."""
+
+            def __getattr__(self, item: str) -> Callable:
+                return recorder.stub(name=overrides.get(item, f"{prefix}.{item}"))
+
+        return Namespace()
+
+
+class SyncThread:
+    """Runs the target in the calling thread, so that background hand-offs are recorded and not timed as threads."""
+
+    def __init__(self, target: Callable, args: Iterable = (), kwargs: dict = None, **_):
+        """Stores the target and its arguments."""
+        self.target, self.args, self.kwargs = target, args, kwargs or {}
+
+    def start(self) -> NoReturn:
+        """Calls the target."""
+        self.target(*self.args, **self.kwargs)
+
+
+def install_stubs(recorder: Recorder) -> Dict[ModuleType, Dict[str, object]]:
+    """Replaces every executor that ``conditions`` and ``split_phrase`` can call with a recording stub.
+
+    Args:
+        recorder: Recorder that collects the route.
+
+    Returns:
+        dict:
+        Original attributes of each patched module, to be restored later.
+
+    See Also:
+        Delayed tasks are recorded as ``timed_delay`` instead of starting a process.
+    """
+    patches = {
+        dispatcher: {name: recorder.stub(name=name) for name, value in vars(dispatcher).items()
+                     if inspect.isfunction(value) and name != 'conditions'},
+        commander: {"speaker": SimpleNamespace(speak=lambda **kwargs: None),
+                    "Process": lambda **kwargs: SimpleNamespace(start=recorder.stub(name="timed_delay"))}
+    }
+    patches[dispatcher].update(controls=recorder.namespace(prefix="controls"),
+                               support=recorder.namespace(prefix="support", unrecognized_dumper=UNRECOGNIZED),
+                               Thread=SyncThread)
+    originals = {}
+    for module, attributes in patches.items():
+        originals[module] = {name: getattr(module, name) for name in attributes}
+        for name, value in attributes.items():
+            setattr(module, name, value)
+    return originals
+
+
+def restore(originals: Dict[ModuleType, Dict[str, object]]) -> NoReturn:
+    """Restores the attributes that were replaced by ``install_stubs``.
+
+    Args:
+        originals: Original attributes of each patched module.
+    """
+    for module, attributes in originals.items():
+        for name, value in attributes.items():
+            setattr(module, name, value)
+
+
+def load_corpus(filepaths: Iterable[str], training: bool = False) -> Dict[str, List[str]]:
+    """Loads the labelled phrases.
+
+    Args:
+        filepaths: YAML files with phrases mapped to the expected handler or a list of handlers.
+        training: Takes a boolean flag to include the phrases collected by ``support.unrecognized_dumper``.
+
+    Returns:
+        dict:
+        Phrases mapped to the list of handlers they are expected to reach.
+    """
+    corpus = {}
+    for filepath in filepaths:
+        with open(filepath) as file:
+            for phrase, label in (yaml.load(stream=file, Loader=yaml.FullLoader) or {}).items():
+                corpus[str(phrase)] = [label] if isinstance(label, str) else list(label)
+    if training and os.path.isfile(models.fileio.training_data):
+        with open(models.fileio.training_data) as file:
+            for records in (yaml.load(stream=file, Loader=yaml.FullLoader) or {}).values():
+                for phrase in records.values():
+                    corpus.setdefault(str(phrase), [UNRECOGNIZED])
+    return corpus
+
+
+def percentile(latencies: List[float], percent: float) -> float:
+    """Nearest rank percentile of the sorted latencies.
+
+    Args:
+        latencies: Sorted list of latencies.
+        percent: Percentile to be calculated.
+
+    Returns:
+        float:
+        Latency at the given percentile.
+    """
+    return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+
+def run(corpus: Dict[str, List[str]], entrypoint: Callable, rounds: int,
+        recorder: Recorder) -> Dict[str, Union[float, int, List[str]]]:
+    """Routes every phrase in the corpus through the entrypoint and measures the latency of each dispatch.
+
+    Args:
+        corpus: Phrases mapped to the list of handlers they are expected to reach.
+        entrypoint: Either ``conditions`` or ``split_phrase``.
+        rounds: Number of times the corpus is routed.
+        recorder: Recorder that collects the route.
+
+    Returns:
+        dict:
+        Routes per second, p50 and p99 latency in microseconds, and the phrases that were misrouted.
+    """
+    latencies, misroutes = [], {}
+    for _ in range(rounds):
+        for phrase, expected in corpus.items():
+            recorder.route.clear()
+            start = time.perf_counter()
+            try:
+                entrypoint(phrase=phrase, should_return=True)
+            except StopSignal:
+                recorder.route.append("StopSignal")
+            latencies.append(time.perf_counter() - start)
+            if recorder.route != expected:
+                misroutes[phrase] = f"expected {expected}, routed to {recorder.route}"
+    latencies.sort()
+    return {"routes_per_sec": round(len(latencies) / sum(latencies)),
+            "p50_us": round(percentile(latencies, 50) * 1e6, 2),
+            "p99_us": round(percentile(latencies, 99) * 1e6, 2),
+            "misroutes": [f"{phrase!r}: {detail}" for phrase, detail in misroutes.items()]}
+
+
+def benchmark(corpus: Dict[str, List[str]], rounds: int = 20) -> Dict[str, Dict[str, Union[float, int, List[str]]]]:
+    """Benchmarks ``conditions`` with single route phrases and ``split_phrase`` with the entire corpus.
+
+    Args:
+        corpus: Phrases mapped to the list of handlers they are expected to reach.
+        rounds: Number of times the corpus is routed.
+
+    Returns:
+        dict:
+        Results for each entrypoint.
+    """
+    recorder = Recorder()
+    originals = install_stubs(recorder=recorder)
+    try:
+        single = {phrase: expected for phrase, expected in corpus.items()
+                  if len(expected) == 1 and expected[0] != "timed_delay"}
+        return {"conditions": run(corpus=single, entrypoint=dispatcher.conditions, rounds=rounds, recorder=recorder),
+                "split_phrase": run(corpus=corpus, entrypoint=commander.split_phrase, rounds=rounds,
+                                    recorder=recorder)}
+    finally:
+        restore(originals=originals)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the routing of phrases by conditions and split_phrase.")
+    parser.add_argument("--corpus", action="append", default=[], help="Additional YAML files of labelled phrases.")
+    parser.add_argument("--rounds", type=int, default=20, help="Number of times the corpus is routed.")
+    parser.add_argument("--training", action="store_true",
+                        help="Include phrases from the training data, which are expected to remain unrecognized.")
+    arguments = parser.parse_args()
+    phrases = load_corpus(filepaths=[CORPUS, *arguments.corpus], training=arguments.training)
+    failed = False
+    for entry, result in benchmark(corpus=phrases, rounds=arguments.rounds).items():
+        print(f"{entry}: {result['routes_per_sec']:,} routes/sec\tp50: {result['p50_us']}µs\t"
+              f"p99: {result['p99_us']}µs\tmisroutes: {len(result['misroutes'])}")
+        for misroute in result['misroutes']:
+            print(f"\t{misroute}")
+        failed = failed or bool(result['misroutes'])
+    raise SystemExit(int(failed))
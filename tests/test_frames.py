@@ -0,0 +1,54 @@
+import numpy
+
+from modules.audio.frames import FrameSource
+
+
+class LiveStream:
+    """Stream that reports a full host buffer on every read, like a live stream that has overflowed."""
+
+    def __init__(self, frames: int, frame_length: int):
+        self.frames = frames
+        self.frame_length = frame_length
+        self.reads = 0
+        self.flags = []
+
+    def get_input_latency(self) -> float:
+        return 0.1
+
+    def get_read_available(self) -> int:
+        return 16_000
+
+    def read(self, num_frames: int, exception_on_overflow: bool = False) -> bytes:
+        self.flags.append(exception_on_overflow)
+        if self.reads == self.frames:
+            return b""
+        self.reads += 1
+        return numpy.full(shape=num_frames, fill_value=self.reads, dtype=numpy.int16).tobytes()
+
+
+def test_read_into_buffer():
+    """Frames are copied into the caller's buffer, which isn't changed when the ring slot is overwritten."""
+    stream = LiveStream(frames=3, frame_length=4)
+    frames = FrameSource(stream=stream, frame_length=4, sample_rate=16_000, capacity=1, threaded=False)
+    reader = frames.reader()
+    frames.start()
+    buffer = numpy.empty(shape=4, dtype=numpy.int16)
+    assert reader.read(out=buffer) is buffer
+    assert buffer.tolist() == [1] * 4
+    frames.pull()  # overwrites the only slot in the ring
+    assert buffer.tolist() == [1] * 4
+    assert reader.read(out=buffer).tolist() == [2] * 4
+
+
+def test_overflowed_frames_are_kept():
+    """Frames read while the host's buffer is full are counted as overflowed, and still passed to the readers."""
+    stream = LiveStream(frames=5, frame_length=4)
+    frames = FrameSource(stream=stream, frame_length=4, sample_rate=16_000, threaded=False)
+    reader = frames.reader()
+    frames.start()
+    received = []
+    while (frame := reader.read()) is not None:
+        received.append(int(frame[0]))
+    assert received == [1, 2, 3, 4, 5]
+    assert not any(stream.flags)
+    assert frames.stats()["overflowed"] == 6  # including the read that found the end of the stream
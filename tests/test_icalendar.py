@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+
+from modules.meetings.icalendar import parse_events
+
+FEED = """BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//Jarvis//Tests//EN
+BEGIN:VEVENT
+UID:standup@jarvis
+DTSTAMP:20220301T080000Z
+DTSTART:20220301T170000Z
+DTEND:20220301T173000Z
+SUMMARY:Standup
+END:VEVENT
+BEGIN:VEVENT
+UID:review@jarvis
+DTSTAMP:20220301T080000Z
+DTSTART:20220301T090000Z
+DTEND:20220301T100000Z
+SUMMARY:Review
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def test_parse_events():
+    """Parses a small ICS feed into events sorted by their start time, with epoch start and end times."""
+    events = parse_events(text=FEED.replace("\n", "\r\n"))
+    assert [event["name"] for event in events] == ["Review", "Standup"]
+    review = events[0]
+    assert review["start"] == datetime(2022, 3, 1, 9, tzinfo=timezone.utc).timestamp()
+    assert review["end"] - review["start"] == 3_600
+    assert datetime.fromisoformat(review["begin"]).timestamp() == review["start"]
+    assert review["all_day"] is False
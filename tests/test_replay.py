@@ -0,0 +1,54 @@
+import io
+import wave
+
+import numpy
+import pytest
+
+from modules.audio.frames import FrameSource
+from modules.audio.replay import WavStream
+
+
+def make_wav(seconds: float, sample_rate: int = 16_000) -> io.BytesIO:
+    """Creates a WAV file in memory with a quiet tone."""
+    samples = numpy.arange(int(seconds * sample_rate)) / sample_rate
+    tone = (numpy.sin(2 * numpy.pi * 440 * samples) * 1_000).astype(numpy.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+        writer.writeframes(tone.tobytes())
+    buffer.seek(0)
+    return buffer
+
+
+def test_replay_frames():
+    """Replays a short WAV file through the frame source without dropping or reordering frames."""
+    stream = WavStream(make_wav(seconds=1), silence=0.5)
+    frames = FrameSource(stream=stream, frame_length=512, sample_rate=16_000, capacity=4, threaded=False)
+    reader = frames.reader()
+    frames.start()
+    received = []
+    while (frame := reader.read()) is not None:
+        received.append(frame)
+    assert stream.samples == 24_000
+    assert len(received) == frames.stats()["frames"] == 48  # short frames at the end of the file and silence
+    assert frames.stats()["dropped"] == 0
+    assert not received[-1].any()  # trailing silence
+
+
+def test_replay_activator(monkeypatch):
+    """Replays a short WAV file through the ``Activator`` without touching the background processes."""
+    pytest.importorskip("pvporcupine")
+    import jarvis
+    from modules.audio import replay
+
+    def fail(*args, **kwargs):
+        raise AssertionError("live instance was torn down by a replay")
+
+    monkeypatch.setattr(jarvis, "repeated_tasks", fail)
+    monkeypatch.setattr(jarvis, "stop_processes", fail)
+    monkeypatch.setattr(jarvis, "clear_db", fail)
+    result = replay.benchmark(filenames=[make_wav(seconds=1)], silence=0)
+    assert result["audio_seconds"] == 1
+    assert result["detections"] == []
@@ -0,0 +1,139 @@
+import time
+from threading import Event, RLock, Thread
+
+from modules.timer.executor import TimerService
+from modules.timer.scheduler import Scheduler
+
+
+def test_failed_job_is_retried():
+    """A job that raises once is rescheduled and runs again after the retry interval."""
+    scheduler = Scheduler(retry=0.05)
+    calls = []
+
+    def job():
+        calls.append(time.time())
+        if len(calls) == 1:
+            raise RuntimeError("first run fails")
+
+    scheduler.schedule(key="flaky", deadline=time.time(), job=job)
+    assert scheduler.run_pending() == 1
+    assert scheduler.next_deadline() is not None
+    assert scheduler.run_pending() == 0  # not due until the retry interval has passed
+    time.sleep(0.06)
+    assert scheduler.run_pending() == 1
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.05
+    assert scheduler.next_deadline() is None  # job returned None after succeeding
+    assert not scheduler.failures
+
+
+def test_retry_backs_off():
+    """Consecutive failures double the retry interval up to the maximum."""
+    scheduler = Scheduler(retry=10, max_retry=30)
+
+    def job():
+        raise RuntimeError("always fails")
+
+    for expected in (10, 20, 30, 30):
+        scheduler.schedule(key="broken", deadline=time.time(), job=job)
+        start = time.time()
+        scheduler.run_pending()
+        assert round(scheduler.next_deadline() - start) == expected
+
+
+def run_blocked(scheduler: Scheduler, started: Event, release: Event, key: str, upcoming: float) -> Thread:
+    """Schedules a job that blocks until released, and runs it in a second thread."""
+
+    def job():
+        started.set()
+        release.wait(timeout=5)
+        return upcoming
+
+    scheduler.schedule(key=key, deadline=time.time(), job=job)
+    thread = Thread(target=scheduler.run_pending)
+    thread.start()
+    assert started.wait(timeout=5)
+    return thread
+
+
+def test_cancel_while_running():
+    """A job that is cancelled from another thread while it runs is not rescheduled."""
+    scheduler = Scheduler()
+    started, release = Event(), Event()
+    thread = run_blocked(scheduler=scheduler, started=started, release=release, key="slow", upcoming=time.time())
+    scheduler.cancel(key="slow")
+    release.set()
+    thread.join(timeout=5)
+    assert scheduler.next_deadline() is None
+    assert "slow" not in scheduler.jobs
+
+
+def test_reschedule_while_running():
+    """A job that is rescheduled from another thread while it runs keeps the new deadline."""
+    scheduler = Scheduler()
+    started, release = Event(), Event()
+    thread = run_blocked(scheduler=scheduler, started=started, release=release, key="slow", upcoming=time.time())
+    later = time.time() + 3_600
+    scheduler.schedule(key="slow", deadline=later, job=lambda: None)
+    release.set()
+    thread.join(timeout=5)
+    assert scheduler.next_deadline() == later
+
+
+class InterleavedLock:
+    """Re-entrant lock that runs an action in a second thread, the first time it is fully released."""
+
+    def __init__(self, action):
+        self.lock = RLock()
+        self.action = action
+        self.depth = 0
+
+    def __enter__(self):
+        self.lock.acquire()
+        self.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.depth -= 1
+        released = not self.depth
+        self.lock.release()
+        if released and self.action:
+            action, self.action = self.action, None
+            thread = Thread(target=action)
+            thread.start()
+            thread.join(timeout=5)
+
+
+def test_cancel_between_checks():
+    """A job that is cancelled from another thread right after it was found due, doesn't break the run loop."""
+    scheduler = Scheduler()
+    runs = []
+    scheduler.schedule(key="job", deadline=time.time(), job=lambda: runs.append(time.time()) or time.time())
+    scheduler.lock = InterleavedLock(action=lambda: scheduler.cancel(key="job"))
+    scheduler.run_pending()
+    assert len(runs) <= 1
+    assert scheduler.next_deadline() is None
+
+
+def test_reschedule_between_checks():
+    """A job that is rescheduled from another thread right after it was found due, doesn't run early."""
+    scheduler = Scheduler()
+    runs = []
+    later = time.time() + 3_600
+    scheduler.schedule(key="job", deadline=time.time(), job=lambda: runs.append("old"))
+    scheduler.lock = InterleavedLock(
+        action=lambda: scheduler.schedule(key="job", deadline=later, job=lambda: runs.append("new"))
+    )
+    scheduler.run_pending()
+    assert "new" not in runs
+    assert scheduler.next_deadline() == later
+
+
+def test_removed_timer_task_is_not_rescheduled():
+    """A task that is removed from the timer service, while its run is being dispatched, stops repeating."""
+    service = TimerService()
+    task = service.add("task", 0.01, lambda: None)
+    service.remove(task)
+    assert service._dispatch(task=task) is None  # noqa
+    assert service.scheduler.next_deadline() is None
+    service.stop()